@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class GestionappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'gestionApp'
+    
+    def ready(self):
+        """
+        Conecta las señales que mantienen los contadores de dashboards
+        """
+        from gestionApp.signals import conectar_senales
+        conectar_senales()
@@ -0,0 +1,193 @@
+"""
+Servicio de búsqueda de pacientes por RUT o nombre
+
+Todas las búsquedas de pacientes (Matrona, TENS, Médico, Partos y las
+APIs JSON) pasan por este módulo.
+
+- Las consultas con forma de RUT (solo dígitos, con o sin puntos, guion
+  y DV) se resuelven sobre Persona.rut_busqueda, que está indexado:
+  igualdad exacta si se escribió el RUT completo con DV, o prefijo
+  (LIKE '123%') si solo se escribió el comienzo.
+- El resto se busca en la tabla PersonaToken: cada palabra de la consulta
+  (en minúsculas y sin tildes) debe ser el comienzo de algún token de la
+  persona. "munoz ana" encuentra a "Ana Muñoz". Los resultados se ordenan
+  por cantidad de palabras que coinciden completas.
+"""
+import re
+import unicodedata
+
+from django.db.models import IntegerField, OuterRef, Q, Subquery, Value, Count
+from django.db.models.functions import Coalesce
+
+from utilidad.rut_validator import RutValidator
+
+
+# Cuerpo de RUT (al menos 3 dígitos) con DV opcional
+RUT_PATRON = re.compile(r'^\d{3,9}K?$')
+
+# RUT escrito completo: termina en guion + DV
+RUT_CON_DV_PATRON = re.compile(r'-\s*[\dkK]$')
+
+# Palabras de un nombre: letras y dígitos, sin separadores
+PALABRA_PATRON = re.compile(r'[a-z0-9ñ]+')
+
+CAMPOS_NOMBRE = ('Nombre', 'Apellido_Paterno', 'Apellido_Materno')
+
+# Máximo de palabras de una consulta que se convierten en filtros
+MAX_TOKENS_CONSULTA = 5
+
+
+# ============================================
+# NORMALIZACIÓN
+# ============================================
+
+def plegar(texto):
+    """Minúsculas y sin tildes: 'Muñoz Pérez' -> 'munoz perez'"""
+    descompuesto = unicodedata.normalize('NFKD', texto or '')
+    sin_tildes = ''.join(c for c in descompuesto if not unicodedata.combining(c))
+    return sin_tildes.lower()
+
+
+def tokens_de_texto(texto):
+    """Palabras plegadas de un texto libre"""
+    return PALABRA_PATRON.findall(plegar(texto))
+
+
+def tokens_de_persona(persona):
+    """Conjunto de tokens de búsqueda de una persona (nombres y RUT)"""
+    tokens = set()
+    for campo in CAMPOS_NOMBRE:
+        tokens.update(tokens_de_texto(getattr(persona, campo)))
+    rut = RutValidator.limpiar(persona.Rut).lower()
+    if rut:
+        tokens.add(rut)
+    return tokens
+
+
+def es_consulta_rut(query):
+    """True si la consulta parece un RUT completo o el comienzo de uno"""
+    return bool(RUT_PATRON.match(RutValidator.limpiar(query)))
+
+
+def tokens_de_consulta(query):
+    """
+    Palabras de la consulta en el mismo formato que PersonaToken.
+    Las palabras con forma de RUT se limpian ('16.293' -> '16293').
+    """
+    tokens = []
+    for parte in (query or '').split():
+        if es_consulta_rut(parte):
+            tokens.append(RutValidator.limpiar(parte).lower())
+        else:
+            tokens.extend(tokens_de_texto(parte))
+    # sin repetidos, respetando el orden
+    return list(dict.fromkeys(tokens))[:MAX_TOKENS_CONSULTA]
+
+
+# ============================================
+# ÍNDICE DE TOKENS
+# ============================================
+
+def indexar_personas(personas):
+    """Regenera los tokens de las personas indicadas"""
+    from gestionApp.models import PersonaToken
+
+    personas = [p for p in personas if p.pk]
+    if not personas:
+        return
+    PersonaToken.objects.filter(persona__in=personas).delete()
+    PersonaToken.objects.bulk_create([
+        PersonaToken(persona_id=persona.pk, token=token)
+        for persona in personas
+        for token in sorted(tokens_de_persona(persona))
+    ])
+
+
+def indexar_persona(persona):
+    """Regenera los tokens de una persona"""
+    indexar_personas([persona])
+
+
+# ============================================
+# FILTROS
+# ============================================
+
+def filtro_rut(query, prefijo='persona__'):
+    """
+    Q sobre rut_busqueda para una consulta con forma de RUT.
+    Con guion y DV, o DV 'K', se busca el RUT exacto; si no, por prefijo.
+    """
+    limpio = RutValidator.limpiar(query)
+    if RUT_CON_DV_PATRON.search(query.strip()) or limpio.endswith('K'):
+        return Q(**{f'{prefijo}rut_busqueda': limpio})
+    return Q(**{f'{prefijo}rut_busqueda__startswith': limpio})
+
+
+def filtro_tokens(tokens, prefijo='persona__'):
+    """Q que exige que cada token sea el comienzo de algún token de la persona"""
+    from gestionApp.models import PersonaToken
+
+    filtro = Q()
+    for token in tokens:
+        filtro &= Q(**{
+            f'{prefijo}pk__in': PersonaToken.objects.filter(
+                token__startswith=token
+            ).values('persona_id')
+        })
+    return filtro
+
+
+def filtro_persona(query, prefijo='persona__'):
+    """
+    Q de búsqueda de persona: por RUT indexado si la consulta tiene forma
+    de RUT, por tokens de nombre en caso contrario.
+    `prefijo` es la ruta hasta Persona desde el modelo consultado
+    (p. ej. 'paciente__persona__' para FichaObstetrica, '' para Persona).
+    """
+    if es_consulta_rut(query):
+        return filtro_rut(query, prefijo)
+    tokens = tokens_de_consulta(query)
+    if not tokens:
+        return Q(pk__in=[])
+    return filtro_tokens(tokens, prefijo)
+
+
+def relevancia(query, prefijo='persona__'):
+    """Expresión con la cantidad de palabras de la consulta que coinciden completas"""
+    from gestionApp.models import PersonaToken
+
+    tokens = tokens_de_consulta(query)
+    if not tokens:
+        return Value(0, output_field=IntegerField())
+    coincidencias = PersonaToken.objects.filter(
+        persona_id=OuterRef(f'{prefijo}pk'),
+        token__in=tokens,
+    ).order_by().values('persona_id').annotate(total=Count('*')).values('total')
+    return Coalesce(Subquery(coincidencias, output_field=IntegerField()), 0)
+
+
+def ordenar_por_relevancia(queryset, query, prefijo='persona__'):
+    """Ordena por relevancia y luego por apellido y nombre"""
+    return queryset.annotate(
+        relevancia=relevancia(query, prefijo)
+    ).order_by(
+        '-relevancia',
+        f'{prefijo}Apellido_Paterno',
+        f'{prefijo}Nombre',
+    )
+
+
+# ============================================
+# SERVICIO
+# ============================================
+
+def buscar_pacientes(query, queryset=None):
+    """Pacientes activos que coinciden con la consulta, los más relevantes primero"""
+    from gestionApp.models import Paciente
+
+    if queryset is None:
+        queryset = Paciente.objects.all()
+    pacientes = queryset.filter(activo=True).filter(
+        filtro_persona(query)
+    ).select_related('persona')
+    return ordenar_por_relevancia(pacientes, query)
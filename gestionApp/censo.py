@@ -0,0 +1,212 @@
+"""
+Lectura de censos de pacientes (CSV / XLSX) de los consultorios
+
+Los archivos se leen en streaming: csv.DictReader para CSV y openpyxl en
+modo read_only (iter_rows con values_only) para XLSX, de modo que nunca
+se carga el archivo completo en memoria.
+
+Cada fila se convierte en un diccionario con los nombres de campo de
+Persona y Paciente, listo para gestionApp.ingesta.ingresar_pacientes():
+
+- Los encabezados se reconocen por nombre de campo o verbose_name, sin
+  importar mayúsculas, tildes ni espacios ("Fecha de nacimiento",
+  "PREVISIÓN", "rut").
+- Las celdas vacías se omiten (se usa el valor por defecto del modelo o,
+  al actualizar, se conserva el valor registrado).
+- Fechas en dd/mm/aaaa o dd-mm-aaaa, booleanos "Sí"/"No", y opciones por
+  valor o por etiqueta ("CESFAM Los Volcanes (Chillán)").
+
+Los valores que no se pueden convertir se dejan tal cual para que la
+validación del modelo los rechace con su mensaje de error.
+"""
+import csv
+import datetime
+import re
+from pathlib import Path
+
+from django.db import models
+
+from gestionApp.busqueda import plegar
+from gestionApp.ingesta import CAMPOS_PACIENTE, CAMPOS_PERSONA
+from gestionApp.models import Paciente, Persona
+
+
+FORMATOS_FECHA = ('%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d', '%d.%m.%Y')
+
+VERDADEROS = {'si', 's', 'true', 'verdadero', '1', 'x'}
+FALSOS = {'no', 'n', 'false', 'falso', '0', ''}
+
+
+class ErrorCenso(Exception):
+    """El archivo no se puede importar (formato o encabezados)"""
+
+
+def _clave(texto):
+    """'Fecha de Nacimiento ' -> 'fecha_de_nacimiento'"""
+    return re.sub(r'[^a-z0-9]+', '_', plegar(str(texto)).strip()).strip('_')
+
+
+def _campos_importables():
+    """{nombre de campo: campo} de Persona y de Paciente"""
+    campos = {}
+    for modelo, nombres in ((Persona, CAMPOS_PERSONA), (Paciente, CAMPOS_PACIENTE)):
+        for campo in modelo._meta.concrete_fields:
+            if campo.name in nombres:
+                campos[campo.name] = campo
+    return campos
+
+
+CAMPOS = _campos_importables()
+
+# Encabezado normalizado -> nombre de campo. Los nombres exactos tienen
+# prioridad, luego los nombres y verbose_name normalizados.
+ALIAS = {}
+for _nombre, _campo in CAMPOS.items():
+    ALIAS.setdefault(_clave(_nombre), _nombre)
+    ALIAS.setdefault(_clave(_campo.verbose_name), _nombre)
+
+
+def mapear_encabezados(encabezados):
+    """
+    Retorna [nombre de campo o None] por columna.
+    Lanza ErrorCenso si hay columnas desconocidas o falta el RUT.
+    """
+    mapeo = []
+    desconocidas = []
+    for encabezado in encabezados:
+        if encabezado is None or str(encabezado).strip() == '':
+            mapeo.append(None)
+            continue
+        nombre = encabezado if encabezado in CAMPOS else ALIAS.get(_clave(encabezado))
+        if nombre is None:
+            desconocidas.append(str(encabezado))
+        mapeo.append(nombre)
+
+    if desconocidas:
+        raise ErrorCenso(f"Columnas desconocidas: {', '.join(desconocidas)}")
+    if 'Rut' not in mapeo:
+        raise ErrorCenso("El archivo no tiene una columna de RUT")
+    return mapeo
+
+
+def _fecha(valor):
+    if isinstance(valor, datetime.datetime):
+        return valor.date()
+    if isinstance(valor, datetime.date):
+        return valor
+    for formato in FORMATOS_FECHA:
+        try:
+            return datetime.datetime.strptime(valor, formato).date()
+        except ValueError:
+            pass
+    return valor
+
+
+def _booleano(valor):
+    if isinstance(valor, bool):
+        return valor
+    clave = _clave(valor)
+    if clave in VERDADEROS:
+        return True
+    if clave in FALSOS:
+        return False
+    return valor
+
+
+def _opcion(campo, valor):
+    buscado = _clave(valor)
+    for clave, etiqueta in campo.choices:
+        if buscado in (_clave(clave), _clave(etiqueta)):
+            return clave
+    return valor
+
+
+def convertir_valor(campo, valor):
+    """Valor de una celda al tipo del campo (o el valor original si no se puede)"""
+    if isinstance(valor, str):
+        valor = valor.strip()
+    if isinstance(campo, models.DateTimeField):
+        return valor
+    if isinstance(campo, models.DateField):
+        return _fecha(valor)
+    if isinstance(campo, models.BooleanField):
+        return _booleano(valor)
+    if isinstance(valor, float) and valor.is_integer():
+        # Excel entrega los números enteros como float (RUT, teléfono)
+        valor = int(valor)
+    if campo.choices:
+        return _opcion(campo, valor)
+    if isinstance(campo, models.CharField):
+        return str(valor)
+    return valor
+
+
+def normalizar_fila(mapeo, valores, fijos=None):
+    """Diccionario de campos a partir de los valores de una fila"""
+    datos = {}
+    for nombre, valor in zip(mapeo, valores):
+        if nombre is None or valor is None or (isinstance(valor, str) and not valor.strip()):
+            continue
+        datos[nombre] = convertir_valor(CAMPOS[nombre], valor)
+    if fijos:
+        datos.update(fijos)
+    return datos
+
+
+# ============================================
+# LECTURA EN STREAMING
+# ============================================
+
+def _filas_csv(ruta, separador):
+    # utf-8-sig descarta el BOM que agrega Excel al guardar como CSV
+    with open(ruta, newline='', encoding='utf-8-sig') as archivo:
+        if separador is None:
+            muestra = archivo.read(4096)
+            archivo.seek(0)
+            try:
+                separador = csv.Sniffer().sniff(muestra, delimiters=',;\t').delimiter
+            except csv.Error:
+                separador = ','
+        yield from csv.reader(archivo, delimiter=separador)
+
+
+def _filas_xlsx(ruta, hoja):
+    from openpyxl import load_workbook
+
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        if hoja is None:
+            hoja_activa = libro.worksheets[0]
+        elif hoja in libro.sheetnames:
+            hoja_activa = libro[hoja]
+        else:
+            raise ErrorCenso(f"El archivo no tiene la hoja '{hoja}'")
+        yield from hoja_activa.iter_rows(values_only=True)
+    finally:
+        libro.close()
+
+
+def leer_censo(ruta, separador=None, hoja=None, fijos=None):
+    """
+    Genera (número de fila en el archivo, datos) por cada fila con datos.
+    La primera fila son los encabezados. `fijos` se agrega a cada fila
+    (p. ej. {'Consultorio': 'CESFAM_LOS_VOLCANES'}).
+    """
+    extension = Path(ruta).suffix.lower()
+    if extension in ('.xlsx', '.xlsm'):
+        filas = _filas_xlsx(ruta, hoja)
+    elif extension in ('.csv', '.txt'):
+        filas = _filas_csv(ruta, separador)
+    else:
+        raise ErrorCenso(f"Formato no soportado: {extension or ruta} (use .csv o .xlsx)")
+
+    try:
+        encabezados = next(filas)
+    except StopIteration:
+        return
+    mapeo = mapear_encabezados(encabezados)
+
+    for numero, valores in enumerate(filas, start=2):
+        if not any(valor is not None and str(valor).strip() for valor in valores):
+            continue
+        yield numero, normalizar_fila(mapeo, valores, fijos)
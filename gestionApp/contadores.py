@@ -0,0 +1,128 @@
+"""
+Contadores de dashboards mantenidos incrementalmente
+
+Cada contador se define por un modelo y un filtro simple. Las señales de
+gestionApp.signals suman o restan 1 cuando una fila entra o sale del
+filtro (creación, activación, desactivación o eliminación), de modo que
+los dashboards leen filas de Contador en vez de ejecutar COUNT(*).
+
+Las escrituras masivas (bulk_create, queryset.update) no disparan
+señales: después de usarlas se debe llamar a recalcular_contadores()
+o ejecutar `manage.py recalcular_contadores`.
+"""
+from django.apps import apps
+from django.db.models import F
+from django.utils import timezone
+
+from gestionApp.models import Contador
+
+
+# nombre -> (modelo, filtro)
+# Los filtros solo admiten igualdad y '__in' para poder evaluarlos
+# tanto en SQL (recálculo) como sobre una instancia (señales).
+CONTADORES = {
+    'personas_activas': ('gestionApp.Persona', {'Activo': True}),
+    'pacientes_activos': ('gestionApp.Paciente', {'activo': True}),
+    'medicos_activos': ('gestionApp.Medico', {'Activo': True}),
+    'matronas_activas': ('gestionApp.Matrona', {'Activo': True}),
+    'tens_activos': ('gestionApp.Tens', {'Activo': True}),
+    'fichas_activas': ('matronaApp.FichaObstetrica', {'activa': True}),
+    'patologias_total': ('medicoApp.Patologias', {}),
+    'patologias_activas': ('medicoApp.Patologias', {'estado': 'Activo'}),
+    'patologias_inactivas': ('medicoApp.Patologias', {'estado': 'Inactivo'}),
+    'patologias_alto_riesgo': ('medicoApp.Patologias', {
+        'nivel_de_riesgo__in': ['Alto', 'Crítico'],
+        'estado': 'Activo',
+    }),
+}
+
+
+def _campo(lookup):
+    return lookup[:-len('__in')] if lookup.endswith('__in') else lookup
+
+
+def contadores_de_modelo(model):
+    """Retorna {nombre: filtro} de los contadores definidos sobre el modelo"""
+    etiqueta = model._meta.label
+    return {
+        nombre: filtro
+        for nombre, (modelo, filtro) in CONTADORES.items()
+        if modelo == etiqueta
+    }
+
+
+def campos_de_modelo(model):
+    """Campos de los que dependen los contadores del modelo"""
+    return {
+        _campo(lookup)
+        for filtro in contadores_de_modelo(model).values()
+        for lookup in filtro
+    }
+
+
+def cumple_filtro(instance, filtro):
+    """Evalúa un filtro de CONTADORES sobre una instancia en memoria"""
+    for lookup, esperado in filtro.items():
+        valor = getattr(instance, _campo(lookup))
+        if lookup.endswith('__in'):
+            if valor not in esperado:
+                return False
+        elif valor != esperado:
+            return False
+    return True
+
+
+def contadores_que_cumple(instance):
+    """Conjunto de contadores en los que cuenta la instancia"""
+    return frozenset(
+        nombre
+        for nombre, filtro in contadores_de_modelo(type(instance)).items()
+        if cumple_filtro(instance, filtro)
+    )
+
+
+def contar(nombre):
+    """Cuenta el valor real de un contador con COUNT(*)"""
+    modelo, filtro = CONTADORES[nombre]
+    return apps.get_model(modelo).objects.filter(**filtro).count()
+
+
+def recalcular_contador(nombre):
+    """Recalcula un contador desde la tabla y guarda el resultado"""
+    valor = contar(nombre)
+    Contador.objects.update_or_create(nombre=nombre, defaults={'valor': valor})
+    return valor
+
+
+def recalcular_contadores(nombres=None):
+    """Recalcula los contadores indicados (todos por defecto)"""
+    return {nombre: recalcular_contador(nombre) for nombre in (nombres or CONTADORES)}
+
+
+def ajustar_contador(nombre, delta):
+    """
+    Suma delta al contador de forma atómica (UPDATE ... SET valor = valor + delta).
+    Si el contador aún no existe, lo crea recalculándolo desde la tabla.
+    """
+    if not delta:
+        return
+    actualizados = Contador.objects.filter(nombre=nombre).update(
+        valor=F('valor') + delta,
+        fecha_actualizacion=timezone.now(),
+    )
+    if not actualizados:
+        recalcular_contador(nombre)
+
+
+def obtener_contadores(*nombres):
+    """
+    Lee los contadores indicados con una sola consulta.
+    Los que no existen todavía se recalculan y se guardan.
+    """
+    valores = dict(
+        Contador.objects.filter(nombre__in=nombres).values_list('nombre', 'valor')
+    )
+    for nombre in nombres:
+        if nombre not in valores:
+            valores[nombre] = recalcular_contador(nombre)
+    return valores
@@ -0,0 +1,473 @@
+"""
+Dataset sintético a gran escala para pruebas de carga
+
+Genera personas y pacientes con RUT válidos y, para cada paciente, fichas
+obstétricas con patologías, medicamentos y sus administraciones, registros
+de signos vitales (TENS), partos, recién nacidos y documentos del parto,
+con integridad referencial completa.
+
+- Todo se inserta con bulk_create, por lotes de pacientes: cada lote es
+  una transacción con un INSERT por tabla (más los bloques de
+  batch_size), sin señales ni full_clean().
+- Los números de ficha y de registro se reservan en bloque con
+  gestionApp.secuencias.reservar_numeros().
+- Todos los valores salen de un random.Random con semilla: la misma
+  semilla sobre la misma base de datos genera los mismos datos (las
+  fechas son relativas al momento de la generación).
+- Como bulk_create no dispara señales, cada lote indexa los tokens de
+  búsqueda de sus personas; los contadores de dashboards se recalculan al
+  final (ver generar()).
+
+En MySQL bulk_create no retorna los id; se leen después del INSERT como
+las filas con id mayor al máximo anterior. Por eso el generador debe
+usarse sobre una base de datos dedicada a pruebas, sin otras escrituras
+concurrentes en las mismas tablas.
+"""
+import datetime
+import random
+from collections import Counter
+from decimal import Decimal
+from functools import lru_cache
+
+from django.db import connections, router, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from gestionApp import busqueda, contadores
+from gestionApp.models import Matrona, Paciente, Persona, Tens
+from gestionApp.secuencias import reservar_numeros
+from matronaApp.models import AdministracionMedicamento, FichaObstetrica, MedicamentoFicha
+from medicoApp.models import Patologias
+from partosApp.models import RegistroParto
+from recienNacidoApp.models import DocumentosParto, RegistroRecienNacido
+from tensApp.models import RegistroTens
+from utilidad.rut_validator import RutValidator, generar_rut_aleatorio
+
+
+TAMANO_LOTE = 1000
+
+# ============================================
+# PROPORCIONES
+# ============================================
+
+# Cantidad -> peso relativo
+PATOLOGIAS_POR_FICHA = {0: 50, 1: 30, 2: 15, 3: 5}
+MEDICAMENTOS_POR_FICHA = {0: 30, 1: 30, 2: 25, 3: 10, 4: 5}
+ADMINISTRACIONES_POR_MEDICAMENTO = {0: 10, 1: 15, 2: 20, 3: 20, 4: 15, 5: 10, 6: 10}
+REGISTROS_TENS_POR_FICHA = {1: 10, 2: 20, 3: 20, 4: 15, 5: 10, 6: 10, 7: 5, 8: 5, 9: 5}
+
+PROPORCION_SEGUNDA_FICHA = 0.15   # embarazo anterior (ficha inactiva)
+PROPORCION_PARTOS = 0.6           # fichas activas con parto registrado
+PROPORCION_GEMELARES = 0.02
+PROPORCION_CONDICION_CRITICA = 0.02
+
+# ============================================
+# VALORES DE MUESTRA
+# ============================================
+
+NOMBRES_FEMENINOS = [
+    'Ana', 'Camila', 'Carolina', 'Catalina', 'Constanza', 'Daniela', 'Fernanda', 'Francisca',
+    'Isidora', 'Javiera', 'Josefa', 'María', 'Martina', 'Paula', 'Sofía', 'Valentina',
+    'Antonia', 'Florencia', 'Macarena', 'Trinidad', 'Bárbara', 'Rocío', 'Ignacia', 'Belén',
+]
+NOMBRES_MASCULINOS = [
+    'Benjamín', 'Carlos', 'Cristóbal', 'Diego', 'Felipe', 'Ignacio', 'José', 'Juan',
+    'Matías', 'Nicolás', 'Pedro', 'Sebastián', 'Tomás', 'Vicente',
+]
+APELLIDOS = [
+    'González', 'Muñoz', 'Rojas', 'Díaz', 'Pérez', 'Soto', 'Contreras', 'Silva', 'Martínez',
+    'Sepúlveda', 'Morales', 'Rodríguez', 'López', 'Fuentes', 'Hernández', 'Torres', 'Araya',
+    'Flores', 'Espinoza', 'Valenzuela', 'Castillo', 'Tapia', 'Reyes', 'Gutiérrez', 'Castro',
+    'Pizarro', 'Álvarez', 'Vásquez', 'Sánchez', 'Fernández', 'Ramírez', 'Carrasco', 'Cortés',
+]
+CALLES = [
+    'Av. Libertad', 'Calle Arauco', 'Av. Collín', 'Calle El Roble', 'Av. Brasil', 'Calle Maipón',
+    'Av. O\'Higgins', 'Calle Constitución', 'Av. Ecuador', 'Pasaje Los Aromos',
+]
+COMUNAS = ['Chillán', 'Chillán Viejo', 'San Carlos', 'Bulnes', 'Quillón', 'Coihueco', 'Yungay']
+MEDICAMENTOS = [
+    ('Paracetamol', '1 g'), ('Sulfato ferroso', '200 mg'), ('Ácido fólico', '1 mg'),
+    ('Ampicilina', '2 g'), ('Nifedipino', '20 mg'), ('Labetalol', '100 mg'),
+    ('Betametasona', '12 mg'), ('Sulfato de magnesio', '4 g'), ('Oxitocina', '10 UI'),
+    ('Insulina NPH', '10 UI'), ('Carbonato de calcio', '500 mg'), ('Ketoprofeno', '100 mg'),
+]
+
+
+@lru_cache(maxsize=None)
+def _claves(modelo, campo):
+    return [clave for clave, _etiqueta in modelo._meta.get_field(campo).choices]
+
+
+def _insertar(modelo, objetos, tamano_lote=TAMANO_LOTE):
+    """
+    bulk_create que deja el pk asignado en cada objeto, también en las
+    bases de datos que no lo retornan (MySQL). Retorna los objetos.
+    """
+    if not objetos:
+        return objetos
+    conexion = connections[router.db_for_write(modelo)]
+    if conexion.features.can_return_rows_from_bulk_insert:
+        return modelo.objects.bulk_create(objetos, batch_size=tamano_lote)
+
+    anterior = modelo.objects.aggregate(ultimo=Max('pk'))['ultimo'] or 0
+    modelo.objects.bulk_create(objetos, batch_size=tamano_lote)
+    ids = list(modelo.objects.filter(pk__gt=anterior).order_by('pk').values_list('pk', flat=True))
+    if len(ids) != len(objetos):
+        raise RuntimeError(
+            f"{modelo.__name__}: se insertaron {len(objetos)} filas pero hay {len(ids)} nuevas; "
+            "el generador requiere una base de datos sin escrituras concurrentes"
+        )
+    for objeto, pk in zip(objetos, ids):
+        objeto.pk = pk
+        objeto._state.adding = False
+    return objetos
+
+
+class GeneradorDataset:
+    """Genera el dataset por lotes de pacientes con un random.Random(semilla)"""
+
+    def __init__(self, semilla=None, tamano_lote=TAMANO_LOTE, anios=3):
+        self.rng = random.Random(semilla)
+        self.tamano_lote = tamano_lote
+        self.hasta = timezone.now().replace(microsecond=0)
+        self.desde = self.hasta - datetime.timedelta(days=365 * anios)
+        self.totales = Counter()
+        self.matronas = []
+        self.tens = []
+        self.patologias = []
+
+    # ============================================
+    # AUXILIARES
+    # ============================================
+
+    def _opcion(self, modelo, campo):
+        return self.rng.choice(_claves(modelo, campo))
+
+    def _cantidad(self, distribucion):
+        return self.rng.choices(list(distribucion), weights=list(distribucion.values()))[0]
+
+    def _probable(self, proporcion):
+        return self.rng.random() < proporcion
+
+    def _fecha_hora(self, desde=None, hasta=None):
+        desde = desde or self.desde
+        hasta = hasta or self.hasta
+        segundos = int((hasta - desde).total_seconds())
+        return desde + datetime.timedelta(seconds=self.rng.randint(0, max(segundos, 0)))
+
+    def _nombre_completo(self):
+        return f"{self.rng.choice(NOMBRES_FEMENINOS)} {self.rng.choice(APELLIDOS)}"
+
+    def _insertar(self, modelo, objetos):
+        self.totales[modelo.__name__] += len(objetos)
+        return _insertar(modelo, objetos, self.tamano_lote)
+
+    def _ruts_nuevos(self, cantidad):
+        """RUT válidos, distintos entre sí y que no existen en la base de datos"""
+        ruts = {}
+        while len(ruts) < cantidad:
+            candidatos = dict.fromkeys(
+                RutValidator.normalizar(generar_rut_aleatorio(self.rng))
+                for _ in range(cantidad - len(ruts))
+            )
+            existentes = set(Persona.objects.filter(Rut__in=list(candidatos)).values_list('Rut', flat=True))
+            ruts.update((rut, None) for rut in candidatos if rut not in existentes)
+        return list(ruts)[:cantidad]
+
+    def _personas(self, cantidad, sexo=None):
+        personas = []
+        for rut in self._ruts_nuevos(cantidad):
+            sexo_persona = sexo or self.rng.choice(['Femenino', 'Masculino'])
+            nombres = NOMBRES_FEMENINOS if sexo_persona == 'Femenino' else NOMBRES_MASCULINOS
+            nombre = self.rng.choice(nombres)
+            apellido = self.rng.choice(APELLIDOS)
+            extranjera = self._probable(0.08)
+            personas.append(Persona(
+                Rut=rut,
+                rut_busqueda=RutValidator.limpiar(rut),
+                Nombre=nombre,
+                Apellido_Paterno=apellido,
+                Apellido_Materno=self.rng.choice(APELLIDOS),
+                Fecha_nacimiento=datetime.date(self.rng.randint(1978, 2007), self.rng.randint(1, 12), self.rng.randint(1, 28)),
+                Sexo=sexo_persona,
+                Inmigrante='Si' if extranjera else 'No',
+                Nacionalidad=self._opcion(Persona, 'Nacionalidad') if extranjera else 'Chile',
+                Pueblos_originarios=self._opcion(Persona, 'Pueblos_originarios') if self._probable(0.1) else 'No pertenece',
+                Telefono=f"+569{self.rng.randint(10000000, 99999999)}",
+                Direccion=f"{self.rng.choice(CALLES)} {self.rng.randint(1, 2999)}, {self.rng.choice(COMUNAS)}",
+                Email=f"{busqueda.plegar(nombre)}.{busqueda.plegar(apellido)}{self.rng.randint(1, 999)}@correo.cl",
+            ))
+        self._insertar(Persona, personas)
+        busqueda.indexar_personas(personas)
+        return personas
+
+    # ============================================
+    # PERSONAL Y CATÁLOGOS
+    # ============================================
+
+    def preparar_personal(self, matronas, tens):
+        """Crea `matronas` y `tens`; si son 0 se usan los ya registrados"""
+        with transaction.atomic():
+            if matronas:
+                self._insertar(Matrona, [
+                    Matrona(
+                        persona=persona,
+                        Especialidad=self._opcion(Matrona, 'Especialidad'),
+                        Registro_medico=f"RM-{persona.rut_busqueda}",
+                        Años_experiencia=self.rng.randint(0, 30),
+                        Turno=self._opcion(Matrona, 'Turno'),
+                    )
+                    for persona in self._personas(matronas, sexo='Femenino')
+                ])
+            if tens:
+                self._insertar(Tens, [
+                    Tens(
+                        persona=persona,
+                        Nivel=self._opcion(Tens, 'Nivel'),
+                        Años_experiencia=self.rng.randint(0, 25),
+                        Turno=self._opcion(Tens, 'Turno'),
+                        Certificaciones=self._opcion(Tens, 'Certificaciones'),
+                    )
+                    for persona in self._personas(tens)
+                ])
+
+        self.matronas = list(Matrona.objects.filter(Activo=True).order_by('pk').values_list('pk', flat=True))
+        self.tens = list(Tens.objects.filter(Activo=True).order_by('pk').values_list('pk', flat=True))
+        self.patologias = list(Patologias.objects.order_by('pk').values_list('pk', flat=True))
+        if not self.matronas or not self.tens:
+            raise ValueError("Se necesita al menos una matrona y un TENS activos")
+
+    # ============================================
+    # PACIENTES Y REGISTROS CLÍNICOS
+    # ============================================
+
+    def _pacientes(self, personas):
+        return self._insertar(Paciente, [
+            Paciente(
+                persona=persona,
+                Estado_civil=self._opcion(Paciente, 'Estado_civil'),
+                Previcion=self._opcion(Paciente, 'Previcion'),
+                Consultorio=self._opcion(Paciente, 'Consultorio'),
+                control_prenatal=self._probable(0.9),
+                IMC=Decimal(self.rng.randint(1800, 3800)) / 100,
+                Preeclampsia_Severa=self._probable(PROPORCION_CONDICION_CRITICA),
+                Eclampsia=self._probable(PROPORCION_CONDICION_CRITICA / 4),
+                Sepsis_o_Infeccion_SiST=self._probable(PROPORCION_CONDICION_CRITICA / 4),
+                Infeccion_Ovular_o_Corioamnionitis=self._probable(PROPORCION_CONDICION_CRITICA / 2),
+                Acompañante=self._nombre_completo() if self._probable(0.7) else '',
+                Contacto_emergencia=f"+569{self.rng.randint(10000000, 99999999)}",
+                Fecha_y_Hora_Ingreso=self._fecha_hora(),
+            )
+            for persona in personas
+        ])
+
+    def _ficha(self, paciente, activa):
+        partos = self.rng.choice([0, 0, 1, 1, 2, 3])
+        cesareas = self.rng.randint(0, partos)
+        abortos = self.rng.choice([0, 0, 0, 1])
+        semanas = self.rng.randint(8, 41)
+        dias = self.rng.randint(0, 6)
+        fur = (self.hasta - datetime.timedelta(weeks=semanas, days=dias)).date()
+        vih_tomado = self._probable(0.9)
+        sgb = self._probable(0.6)
+        return FichaObstetrica(
+            paciente=paciente,
+            matrona_responsable_id=self.rng.choice(self.matronas),
+            nombre_acompanante=paciente.Acompañante,
+            numero_gestas=partos + abortos + 1,
+            numero_partos=partos,
+            partos_vaginales=partos - cesareas,
+            partos_cesareas=cesareas,
+            numero_abortos=abortos,
+            nacidos_vivos=partos,
+            fecha_ultima_regla=fur,
+            fecha_probable_parto=fur + datetime.timedelta(days=280),
+            edad_gestacional_semanas=semanas,
+            edad_gestacional_dias=dias,
+            peso_actual=Decimal(self.rng.randint(500, 1100)) / 10,
+            talla=Decimal(self.rng.randint(1450, 1800)) / 10,
+            vih_tomado=vih_tomado,
+            vih_resultado=self._opcion(FichaObstetrica, 'vih_resultado') if vih_tomado else 'PENDIENTE',
+            sgb_pesquisa=sgb,
+            sgb_resultado=self._opcion(FichaObstetrica, 'sgb_resultado') if sgb else 'PENDIENTE',
+            vdrl_resultado=self._opcion(FichaObstetrica, 'vdrl_resultado'),
+            hepatitis_b_tomado=self._probable(0.8),
+            activa=activa,
+        )
+
+    def _fichas(self, pacientes):
+        fichas = []
+        for paciente in pacientes:
+            if self._probable(PROPORCION_SEGUNDA_FICHA):
+                fichas.append(self._ficha(paciente, activa=False))
+            fichas.append(self._ficha(paciente, activa=True))
+        for ficha, numero in zip(fichas, reservar_numeros('ficha_obstetrica', len(fichas))):
+            ficha.numero_ficha = numero
+        self._insertar(FichaObstetrica, fichas)
+
+        relacion = FichaObstetrica.patologias
+        Intermedia = relacion.through
+        origen = f"{relacion.field.m2m_field_name()}_id"
+        destino = f"{relacion.field.m2m_reverse_field_name()}_id"
+        enlaces = []
+        for ficha in fichas:
+            cantidad = min(self._cantidad(PATOLOGIAS_POR_FICHA), len(self.patologias))
+            for patologia in self.rng.sample(self.patologias, cantidad):
+                enlaces.append(Intermedia(**{origen: ficha.pk, destino: patologia}))
+        Intermedia.objects.bulk_create(enlaces, batch_size=self.tamano_lote)
+        self.totales[Intermedia.__name__] += len(enlaces)
+        return fichas
+
+    def _medicamentos(self, fichas):
+        medicamentos = []
+        for ficha in fichas:
+            inicio_embarazo = ficha.fecha_ultima_regla
+            for _ in range(self._cantidad(MEDICAMENTOS_POR_FICHA)):
+                nombre, dosis = self.rng.choice(MEDICAMENTOS)
+                inicio = inicio_embarazo + datetime.timedelta(days=self.rng.randint(0, 250))
+                medicamentos.append(MedicamentoFicha(
+                    ficha_id=ficha.pk,
+                    nombre_medicamento=nombre,
+                    dosis=dosis,
+                    via_administracion=self._opcion(MedicamentoFicha, 'via_administracion'),
+                    frecuencia=self._opcion(MedicamentoFicha, 'frecuencia'),
+                    fecha_inicio=inicio,
+                    fecha_termino=inicio + datetime.timedelta(days=self.rng.randint(1, 30)),
+                    activo=ficha.activa,
+                ))
+        self._insertar(MedicamentoFicha, medicamentos)
+
+        administraciones = []
+        for medicamento in medicamentos:
+            inicio = timezone.make_aware(datetime.datetime.combine(medicamento.fecha_inicio, datetime.time(8)))
+            fin = inicio + datetime.timedelta(days=(medicamento.fecha_termino - medicamento.fecha_inicio).days)
+            for _ in range(self._cantidad(ADMINISTRACIONES_POR_MEDICAMENTO)):
+                exitosa = self._probable(0.95)
+                administraciones.append(AdministracionMedicamento(
+                    medicamento_ficha_id=medicamento.pk,
+                    tens_id=self.rng.choice(self.tens),
+                    fecha_hora_administracion=self._fecha_hora(inicio, fin),
+                    se_realizo_lavado=self._probable(0.97),
+                    administrado_exitosamente=exitosa,
+                    motivo_no_administracion='' if exitosa else 'Paciente rechaza medicamento',
+                ))
+        self._insertar(AdministracionMedicamento, administraciones)
+
+    def _registros_tens(self, fichas):
+        registros = []
+        for ficha in fichas:
+            for _ in range(self._cantidad(REGISTROS_TENS_POR_FICHA)):
+                registros.append(RegistroTens(
+                    ficha_id=ficha.pk,
+                    tens_responsable_id=self.rng.choice(self.tens),
+                    fecha=self._fecha_hora().date(),
+                    turno=self._opcion(RegistroTens, 'turno'),
+                    temperatura=Decimal(self.rng.randint(358, 382)) / 10,
+                    frecuencia_cardiaca=self.rng.randint(60, 110),
+                    presion_arterial_sistolica=self.rng.randint(95, 150),
+                    presion_arterial_diastolica=self.rng.randint(55, 95),
+                    frecuencia_respiratoria=self.rng.randint(12, 22),
+                    saturacion_oxigeno=self.rng.randint(94, 100),
+                ))
+        self._insertar(RegistroTens, registros)
+
+    def _partos(self, fichas):
+        partos = []
+        for ficha in fichas:
+            if not ficha.activa or not self._probable(PROPORCION_PARTOS):
+                continue
+            admision = self._fecha_hora()
+            tipo = self._opcion(RegistroParto, 'tipo_parto')
+            cesarea = tipo.startswith('CESAREA')
+            dilatacion = None if cesarea else self.rng.randint(60, 720)
+            expulsivo = None if cesarea else self.rng.randint(5, 90)
+            partos.append(RegistroParto(
+                ficha_id=ficha.pk,
+                fecha_hora_admision=admision,
+                fecha_hora_parto=admision + datetime.timedelta(minutes=self.rng.randint(30, 1440)),
+                edad_gestacional_semanas=self.rng.randint(34, 41),
+                edad_gestacional_dias=self.rng.randint(0, 6),
+                monitor_ttc=self._probable(0.8),
+                induccion=self._probable(0.25),
+                numero_tactos_vaginales=self.rng.randint(1, 8),
+                rotura_membrana=self._opcion(RegistroParto, 'rotura_membrana'),
+                tiempo_dilatacion=dilatacion,
+                tiempo_expulsivo=expulsivo,
+                tipo_parto=tipo,
+                clasificacion_robson=self._opcion(RegistroParto, 'clasificacion_robson'),
+                posicion_materna_parto=self._opcion(RegistroParto, 'posicion_materna_parto'),
+                estado_perine=self._opcion(RegistroParto, 'estado_perine'),
+                inercia_uterina=self._probable(0.03),
+                restos_placentarios=self._probable(0.02),
+                transfusion_sanguinea=self._probable(0.01),
+                anestesia_neuroaxial=self._probable(0.5),
+                oxido_nitroso=self._probable(0.2),
+                analgesia_endovenosa=self._probable(0.15),
+                anestesia_local=self._probable(0.3),
+                analgesia_no_farmacologica=self._probable(0.4),
+                profesional_responsable=self._nombre_completo(),
+                causa_cesarea='Indicación obstétrica' if cesarea else '',
+            ))
+        for parto, numero in zip(partos, reservar_numeros('registro_parto', len(partos))):
+            parto.numero_registro = numero
+        self._insertar(RegistroParto, partos)
+        return partos
+
+    def _recien_nacidos(self, partos):
+        recien_nacidos = []
+        for parto in partos:
+            for _ in range(2 if self._probable(PROPORCION_GEMELARES) else 1):
+                acompanado = self._probable(0.9)
+                apgar_5 = min(10, max(0, round(self.rng.gauss(9, 1))))
+                recien_nacidos.append(RegistroRecienNacido(
+                    registro_parto_id=parto.pk,
+                    sexo=self._opcion(RegistroRecienNacido, 'sexo'),
+                    peso=min(8000, max(500, round(self.rng.gauss(3350, 480)))),
+                    talla=min(70, max(30, round(self.rng.gauss(50, 2)))),
+                    ligadura_tardia_cordon=self._probable(0.6),
+                    apgar_1_minuto=max(0, apgar_5 - self.rng.randint(0, 2)),
+                    apgar_5_minutos=apgar_5,
+                    fecha_nacimiento=parto.fecha_hora_parto,
+                    tiempo_apego=self.rng.randint(0, 120),
+                    apego_canguro=self._probable(0.7),
+                    acompanamiento_parto=acompanado,
+                    motivo_no_acompanado='' if acompanado else self._opcion(RegistroRecienNacido, 'motivo_no_acompanado'),
+                    persona_acompanante=self._opcion(RegistroRecienNacido, 'persona_acompanante') if acompanado else '',
+                ))
+        self._insertar(RegistroRecienNacido, recien_nacidos)
+
+        self._insertar(DocumentosParto, [
+            DocumentosParto(
+                registro_recien_nacido_id=recien_nacido.pk,
+                retira_placenta=self._probable(0.3),
+                estampado_placenta=self._probable(0.2),
+                folio_valido=str(self.rng.randint(100000, 999999)),
+            )
+            for recien_nacido in recien_nacidos
+        ])
+
+    def generar_lote(self, cantidad):
+        """Genera `cantidad` pacientes con todos sus registros en una transacción"""
+        with transaction.atomic():
+            pacientes = self._pacientes(self._personas(cantidad, sexo='Femenino'))
+            fichas = self._fichas(pacientes)
+            self._medicamentos(fichas)
+            self._registros_tens(fichas)
+            self._recien_nacidos(self._partos(fichas))
+
+    def generar(self, pacientes, matronas=0, tens=0, progreso=None):
+        """
+        Genera el dataset completo y recalcula los contadores de dashboards.
+        `progreso(pacientes_generadas)` se llama después de cada lote.
+        Retorna los totales por tabla.
+        """
+        self.preparar_personal(matronas, tens)
+        generadas = 0
+        while generadas < pacientes:
+            cantidad = min(self.tamano_lote, pacientes - generadas)
+            self.generar_lote(cantidad)
+            generadas += cantidad
+            if progreso:
+                progreso(generadas)
+        contadores.recalcular_contadores()
+        return self.totales
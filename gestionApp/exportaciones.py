@@ -0,0 +1,178 @@
+"""
+Exportaciones CSV de las tablas clínicas
+
+Cada entrada define las columnas y los select_related de una tabla; la
+vista gestionApp.views.exportar_csv las sirve con el exportador genérico
+de utilidad.exportacion_csv (?desde=AAAA-MM-DD&hasta=AAAA-MM-DD filtra
+por campo_fecha).
+"""
+from utilidad.exportacion_csv import ExportacionCSV
+
+
+_PACIENTE = [
+    ('RUT Paciente', 'paciente__persona__Rut'),
+    ('Nombre Paciente', 'paciente__persona__Nombre'),
+    ('Apellido Paterno', 'paciente__persona__Apellido_Paterno'),
+    ('Apellido Materno', 'paciente__persona__Apellido_Materno'),
+]
+
+
+def _desde(prefijo, columnas):
+    """Columnas de paciente vistas desde otra relación ('ficha__' + ...)"""
+    return [(titulo, f'{prefijo}{ruta}') for titulo, ruta in columnas]
+
+
+EXPORTACIONES = {
+    'fichas_obstetricas': ExportacionCSV(
+        modelo='matronaApp.FichaObstetrica',
+        nombre_archivo='fichas_obstetricas',
+        campo_fecha='fecha_creacion',
+        select_related=['paciente__persona', 'matrona_responsable__persona'],
+        columnas=[
+            ('N° Ficha', 'numero_ficha'),
+            *_PACIENTE,
+            ('Matrona', 'matrona_responsable__persona__Rut'),
+            ('Gestas', 'numero_gestas'),
+            ('Partos', 'numero_partos'),
+            ('Partos Vaginales', 'partos_vaginales'),
+            ('Cesáreas', 'partos_cesareas'),
+            ('Abortos', 'numero_abortos'),
+            ('Nacidos Vivos', 'nacidos_vivos'),
+            ('FUR', 'fecha_ultima_regla'),
+            ('FPP', 'fecha_probable_parto'),
+            ('EG Semanas', 'edad_gestacional_semanas'),
+            ('EG Días', 'edad_gestacional_dias'),
+            ('Peso Actual', 'peso_actual'),
+            ('Talla', 'talla'),
+            ('VIH Tomado', 'vih_tomado'),
+            ('VIH Resultado', 'vih_resultado'),
+            ('SGB Pesquisa', 'sgb_pesquisa'),
+            ('SGB Resultado', 'sgb_resultado'),
+            ('VDRL Resultado', 'vdrl_resultado'),
+            ('Hepatitis B Tomado', 'hepatitis_b_tomado'),
+            ('Hepatitis B Resultado', 'hepatitis_b_resultado'),
+            ('Fecha Creación', 'fecha_creacion'),
+            ('Activa', 'activa'),
+        ],
+    ),
+    'medicamentos_ficha': ExportacionCSV(
+        modelo='matronaApp.MedicamentoFicha',
+        nombre_archivo='medicamentos_ficha',
+        campo_fecha='fecha_inicio',
+        select_related=['ficha__paciente__persona'],
+        columnas=[
+            ('N° Ficha', 'ficha__numero_ficha'),
+            *_desde('ficha__', _PACIENTE),
+            ('Medicamento', 'nombre_medicamento'),
+            ('Dosis', 'dosis'),
+            ('Vía', 'get_via_administracion_display'),
+            ('Frecuencia', 'frecuencia'),
+            ('Fecha Inicio', 'fecha_inicio'),
+            ('Fecha Término', 'fecha_termino'),
+            ('Observaciones', 'observaciones'),
+            ('Activo', 'activo'),
+        ],
+    ),
+    'administraciones_medicamento': ExportacionCSV(
+        modelo='matronaApp.AdministracionMedicamento',
+        nombre_archivo='administraciones_medicamento',
+        campo_fecha='fecha_hora_administracion',
+        select_related=['medicamento_ficha__ficha__paciente__persona', 'tens__persona'],
+        columnas=[
+            ('N° Ficha', 'medicamento_ficha__ficha__numero_ficha'),
+            *_desde('medicamento_ficha__ficha__', _PACIENTE),
+            ('Medicamento', 'medicamento_ficha__nombre_medicamento'),
+            ('Fecha y Hora', 'fecha_hora_administracion'),
+            ('TENS', 'tens__persona__Rut'),
+            ('Lavado de Manos', 'se_realizo_lavado'),
+            ('Administrado', 'administrado_exitosamente'),
+            ('Motivo No Administración', 'motivo_no_administracion'),
+            ('Reacciones Adversas', 'reacciones_adversas'),
+            ('Observaciones', 'observaciones'),
+        ],
+    ),
+    'registros_tens': ExportacionCSV(
+        modelo='tensApp.RegistroTens',
+        nombre_archivo='registros_tens',
+        campo_fecha='fecha',
+        select_related=['ficha__paciente__persona', 'tens_responsable__persona'],
+        columnas=[
+            ('N° Ficha', 'ficha__numero_ficha'),
+            *_desde('ficha__', _PACIENTE),
+            ('Fecha', 'fecha'),
+            ('Turno', 'turno'),
+            ('TENS', 'tens_responsable__persona__Rut'),
+            ('Temperatura', 'temperatura'),
+            ('Frecuencia Cardíaca', 'frecuencia_cardiaca'),
+            ('PA Sistólica', 'presion_arterial_sistolica'),
+            ('PA Diastólica', 'presion_arterial_diastolica'),
+            ('Frecuencia Respiratoria', 'frecuencia_respiratoria'),
+            ('Saturación O2', 'saturacion_oxigeno'),
+            ('Observaciones', 'observaciones'),
+        ],
+    ),
+    'tratamientos_aplicados': ExportacionCSV(
+        modelo='tensApp.Tratamiento_aplicado',
+        nombre_archivo='tratamientos_aplicados',
+        campo_fecha='fecha_aplicacion',
+        select_related=['ficha', 'paciente__persona', 'tens__persona'],
+        columnas=[
+            ('N° Ficha', 'ficha__numero_ficha'),
+            *_PACIENTE,
+            ('Medicamento', 'nombre_medicamento'),
+            ('Dosis', 'dosis'),
+            ('Vía', 'get_via_administracion_display'),
+            ('Fecha', 'fecha_aplicacion'),
+            ('Hora', 'hora_aplicacion'),
+            ('TENS', 'tens__persona__Rut'),
+            ('Lavado de Manos', 'se_realizo_lavado_manos'),
+            ('Aplicado', 'aplicado_exitosamente'),
+            ('Motivo No Aplicación', 'motivo_no_aplicacion'),
+            ('Reacciones Adversas', 'reacciones_adversas'),
+            ('Activo', 'activo'),
+        ],
+    ),
+    'recien_nacidos': ExportacionCSV(
+        modelo='recienNacidoApp.RegistroRecienNacido',
+        nombre_archivo='recien_nacidos',
+        campo_fecha='fecha_nacimiento',
+        select_related=['registro_parto__ficha__paciente__persona'],
+        columnas=[
+            ('N° Registro Parto', 'registro_parto__numero_registro'),
+            *_desde('registro_parto__ficha__', _PACIENTE),
+            ('Sexo', 'get_sexo_display'),
+            ('Peso (g)', 'peso'),
+            ('Talla (cm)', 'talla'),
+            ('Apgar 1', 'apgar_1_minuto'),
+            ('Apgar 5', 'apgar_5_minutos'),
+            ('Fecha Nacimiento', 'fecha_nacimiento'),
+            ('Ligadura Tardía', 'ligadura_tardia_cordon'),
+            ('Tiempo Apego', 'tiempo_apego'),
+            ('Apego Canguro', 'apego_canguro'),
+            ('Acompañamiento Parto', 'acompanamiento_parto'),
+        ],
+    ),
+    'fichas_parto': ExportacionCSV(
+        modelo='ingresoPartoApp.FichaParto',
+        nombre_archivo='fichas_parto',
+        campo_fecha='fecha_ingreso',
+        select_related=['ficha_obstetrica__paciente__persona'],
+        columnas=[
+            ('N° Ficha Parto', 'numero_ficha_parto'),
+            ('N° Ficha Obstétrica', 'ficha_obstetrica__numero_ficha'),
+            *_desde('ficha_obstetrica__', _PACIENTE),
+            ('Tipo Paciente', 'get_tipo_paciente_display'),
+            ('Origen Ingreso', 'get_origen_ingreso_display'),
+            ('Fecha Ingreso', 'fecha_ingreso'),
+            ('Hora Ingreso', 'hora_ingreso'),
+            ('Plan de Parto', 'plan_de_parto'),
+            ('Control Prenatal', 'control_prenatal'),
+            ('Preeclampsia Severa', 'preeclampsia_severa'),
+            ('Eclampsia', 'eclampsia'),
+            ('Sepsis', 'sepsis_infeccion_grave'),
+            ('Infección Ovular', 'infeccion_ovular'),
+            ('VDRL Resultado', 'vdrl_resultado'),
+            ('Activa', 'activa'),
+        ],
+    ),
+}
@@ -0,0 +1,246 @@
+"""
+Ingesta masiva de pacientes (Persona + Paciente)
+
+Persona.save() y Paciente.save() llaman a full_clean(), que hace un
+SELECT por la unicidad del RUT en cada inserción; cargar 100.000
+pacientes fila a fila son cientos de miles de consultas. Aquí cada lote:
+
+1. Busca los RUT ya registrados con un solo SELECT ... WHERE Rut IN (...).
+2. Valida en memoria: RUT con RutValidator (formato y DV), campos con
+   clean_fields()/clean() sin validate_unique (ninguna consulta). Al
+   actualizar una persona ya registrada se validan solo los campos que
+   trae el registro; los demás conservan el valor guardado.
+3. Inserta con bulk_create las personas y luego sus pacientes (o, si se
+   pide actualizar, escribe con bulk_update los campos recibidos de las
+   que ya existían).
+4. Recupera los id de las personas por RUT (MySQL no los devuelve en
+   bulk_create), regenera sus tokens de búsqueda y ajusta los contadores
+   de dashboards, ya que bulk_create no dispara señales.
+
+Cada lote es una transacción; si otro proceso insertó uno de los RUT
+entre la verificación y el INSERT, el lote se verifica y reintenta.
+"""
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from gestionApp import busqueda, contadores
+from gestionApp.models import Paciente, Persona
+from utilidad.rut_validator import RutValidator, validar_rut_chileno
+
+
+TAMANO_LOTE = 1000
+
+
+def _nombres_campos(modelo):
+    return {campo.name for campo in modelo._meta.concrete_fields}
+
+
+CAMPOS_PERSONA = _nombres_campos(Persona) - {'id', 'rut_busqueda'}
+CAMPOS_PACIENTE = _nombres_campos(Paciente) - {'persona'}
+
+
+@dataclass
+class ResultadoIngesta:
+    """Resumen de una ingesta: rechazados es una lista de (posición, RUT, motivo)"""
+    creados: int = 0
+    actualizados: int = 0
+    existentes: list = field(default_factory=list)
+    rechazados: list = field(default_factory=list)
+
+
+def _mensaje(error):
+    if hasattr(error, 'message_dict'):
+        return '; '.join(f"{campo}: {' '.join(mensajes)}" for campo, mensajes in error.message_dict.items())
+    return ' '.join(error.messages)
+
+
+def preparar_paciente(datos, parcial=False):
+    """
+    Construye (persona, paciente) sin guardar a partir de un diccionario
+    con campos de Persona y de Paciente. Con `parcial` (persona ya
+    registrada que se actualiza) solo se validan los campos presentes.
+    Lanza ValidationError si los datos no son válidos y ValueError si hay
+    campos desconocidos.
+    """
+    desconocidos = set(datos) - CAMPOS_PERSONA - CAMPOS_PACIENTE
+    if desconocidos:
+        raise ValueError(f"Campos desconocidos: {', '.join(sorted(desconocidos))}")
+
+    no_recibidos = sorted((CAMPOS_PERSONA | CAMPOS_PACIENTE) - set(datos)) if parcial else []
+
+    rut = validar_rut_chileno(datos.get('Rut') or '')
+    persona = Persona(**{k: v for k, v in datos.items() if k in CAMPOS_PERSONA})
+    persona.Rut = rut
+    persona.rut_busqueda = RutValidator.limpiar(rut)
+    persona.clean_fields(exclude=['Rut', *no_recibidos])
+    persona.clean()
+
+    paciente = Paciente(persona=persona, **{k: v for k, v in datos.items() if k in CAMPOS_PACIENTE})
+    paciente.clean_fields(exclude=['persona', *no_recibidos])
+    paciente.clean()
+    return persona, paciente
+
+
+def _ajustar_contadores(instancias):
+    suma = {}
+    for instancia in instancias:
+        for nombre in contadores.contadores_que_cumple(instancia):
+            suma[nombre] = suma.get(nombre, 0) + 1
+    for nombre, delta in suma.items():
+        contadores.ajustar_contador(nombre, delta)
+
+
+def _actualizar_existentes(items, ids):
+    """
+    Actualiza con bulk_update las personas ya registradas (solo los campos
+    que traía cada registro) y crea el Paciente si la persona no lo tenía.
+    """
+    con_paciente = set(
+        Paciente.objects.filter(persona_id__in=ids.values()).values_list('persona_id', flat=True)
+    )
+    grupos = {}
+    pacientes_nuevos = []
+    for _pos, persona, paciente, campos in items:
+        persona.pk = ids[persona.Rut]
+        persona._state.adding = False
+        paciente.persona = persona
+        if persona.pk in con_paciente:
+            grupos.setdefault(frozenset(campos), []).append((persona, paciente))
+        else:
+            pacientes_nuevos.append(paciente)
+
+    # Los registros con las mismas columnas se actualizan juntos
+    for campos, pares in grupos.items():
+        campos_persona = sorted((campos & CAMPOS_PERSONA) | {'rut_busqueda'})
+        campos_paciente = sorted(campos & CAMPOS_PACIENTE)
+        Persona.objects.bulk_update([persona for persona, _pac in pares], campos_persona)
+        if campos_paciente:
+            Paciente.objects.bulk_update([paciente for _per, paciente in pares], campos_paciente)
+    Paciente.objects.bulk_create(pacientes_nuevos)
+    _ajustar_contadores(pacientes_nuevos)
+
+    actualizadas = [persona for _pos, persona, _pac, _campos in items]
+    busqueda.indexar_personas(actualizadas)
+    campos_actualizados = set().union(*grupos) if grupos else set()
+    modelos = [modelo for modelo in (Persona, Paciente) if campos_actualizados & contadores.campos_de_modelo(modelo)]
+    if modelos:
+        # No se conoce el estado anterior: se recuentan los contadores afectados
+        contadores.recalcular_contadores([
+            nombre for modelo in modelos for nombre in contadores.contadores_de_modelo(modelo)
+        ])
+
+
+def _insertar_lote(validos, resultado, actualizar=False):
+    """Inserta (y con `actualizar`, actualiza) un lote de [(posición, persona, paciente, campos)]"""
+    existentes = dict(
+        Persona.objects.filter(Rut__in=[persona.Rut for _pos, persona, _pac, _c in validos])
+        .values_list('Rut', 'pk')
+    )
+    nuevos = [item for item in validos if item[1].Rut not in existentes]
+    repetidos = [item for item in validos if item[1].Rut in existentes]
+
+    with transaction.atomic():
+        if nuevos:
+            personas = [persona for _pos, persona, _pac, _c in nuevos]
+            Persona.objects.bulk_create(personas)
+            ids = dict(
+                Persona.objects.filter(Rut__in=[persona.Rut for persona in personas])
+                .values_list('Rut', 'pk')
+            )
+            pacientes = []
+            for _pos, persona, paciente, _c in nuevos:
+                persona.pk = ids[persona.Rut]
+                persona._state.adding = False
+                paciente.persona = persona
+                pacientes.append(paciente)
+            Paciente.objects.bulk_create(pacientes)
+            busqueda.indexar_personas(personas)
+            _ajustar_contadores(personas)
+            _ajustar_contadores(pacientes)
+
+        if actualizar and repetidos:
+            _actualizar_existentes(repetidos, existentes)
+
+    resultado.creados += len(nuevos)
+    if actualizar:
+        resultado.actualizados += len(repetidos)
+    else:
+        resultado.existentes.extend(sorted(existentes))
+
+
+def ingresar_pacientes(registros, tamano_lote=TAMANO_LOTE, progreso=None, actualizar=False):
+    """
+    Crea pacientes de forma masiva a partir de diccionarios con campos de
+    Persona y Paciente ('Rut', 'Nombre', ..., 'Previcion', ...).
+
+    Los RUT inválidos o repetidos en la entrada se rechazan. Los que ya
+    existen en la base de datos se omiten, o con `actualizar` se les
+    escriben los campos que trae el registro (upsert).
+    `progreso(procesados)` se llama después de cada lote. Retorna un
+    ResultadoIngesta.
+    """
+    resultado = ResultadoIngesta()
+    vistos = set()
+    pendientes = []
+    procesados = 0
+
+    def _vaciar():
+        # Pacientes ya registradas: se validan solo los campos recibidos
+        registrados = set()
+        if actualizar:
+            registrados = set(
+                Paciente.objects.filter(persona__Rut__in=[rut for _pos, rut, _datos in pendientes])
+                .values_list('persona__Rut', flat=True)
+            )
+        lote = []
+        for posicion, rut, datos in pendientes:
+            try:
+                persona, paciente = preparar_paciente(datos, parcial=rut in registrados)
+            except ValidationError as error:
+                resultado.rechazados.append((posicion, datos.get('Rut') or '', _mensaje(error)))
+                continue
+            lote.append((posicion, persona, paciente, set(datos)))
+        pendientes.clear()
+
+        for intento in range(2):
+            if not lote:
+                break
+            try:
+                _insertar_lote(lote, resultado, actualizar)
+                break
+            except IntegrityError:
+                # Otro proceso insertó alguno de los RUT: se vuelve a verificar
+                if intento:
+                    raise
+                for _pos, persona, _pac, _campos in lote:
+                    persona.pk = None
+                    persona._state.adding = True
+        if progreso:
+            progreso(procesados)
+
+    for posicion, datos in enumerate(registros, start=1):
+        procesados += 1
+        rut_original = datos.get('Rut') or ''
+        desconocidos = set(datos) - CAMPOS_PERSONA - CAMPOS_PACIENTE
+        if desconocidos:
+            raise ValueError(f"Campos desconocidos: {', '.join(sorted(desconocidos))}")
+        try:
+            rut = validar_rut_chileno(rut_original)
+        except ValidationError as error:
+            resultado.rechazados.append((posicion, rut_original, _mensaje(error)))
+            continue
+        if rut in vistos:
+            resultado.rechazados.append((posicion, rut_original, 'RUT repetido en la carga'))
+            continue
+        vistos.add(rut)
+        pendientes.append((posicion, rut, datos))
+        if len(pendientes) >= tamano_lote:
+            _vaciar()
+
+    if pendientes:
+        _vaciar()
+    # Los rechazos de validación se detectan al vaciar cada lote
+    resultado.rechazados.sort(key=lambda rechazo: rechazo[0])
+    return resultado
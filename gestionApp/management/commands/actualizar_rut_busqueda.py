@@ -0,0 +1,49 @@
+# ============================================
+# UBICACIÓN: gestionApp/management/commands/actualizar_rut_busqueda.py
+# ============================================
+
+from django.core.management.base import BaseCommand
+from gestionApp.models import Persona
+from utilidad.rut_validator import RutValidator
+
+
+class Command(BaseCommand):
+    help = 'Completa Persona.rut_busqueda en registros creados antes de existir el campo'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=1000,
+            help='Personas actualizadas por lote (por defecto 1000)'
+        )
+
+    def handle(self, *args, **options):
+        lote = options['lote']
+        ultimo_id = 0
+        actualizadas = 0
+
+        self.stdout.write(self.style.WARNING('\n📋 Actualizando RUT de búsqueda...'))
+
+        while True:
+            personas = list(
+                Persona.objects.filter(pk__gt=ultimo_id)
+                .order_by('pk')
+                .only('pk', 'Rut', 'rut_busqueda')[:lote]
+            )
+            if not personas:
+                break
+            ultimo_id = personas[-1].pk
+
+            cambiadas = []
+            for persona in personas:
+                rut_busqueda = RutValidator.limpiar(persona.Rut)
+                if persona.rut_busqueda != rut_busqueda:
+                    persona.rut_busqueda = rut_busqueda
+                    cambiadas.append(persona)
+
+            # bulk_update no llama a save(): no se re-valida cada persona
+            Persona.objects.bulk_update(cambiadas, ['rut_busqueda'])
+            actualizadas += len(cambiadas)
+
+        self.stdout.write(self.style.SUCCESS(f'\n✅ COMPLETADO: {actualizadas} personas actualizadas'))
@@ -0,0 +1,85 @@
+# ============================================
+# UBICACIÓN: gestionApp/management/commands/generar_dataset.py
+# ============================================
+
+import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from gestionApp.dataset import TAMANO_LOTE, GeneradorDataset
+from medicoApp.models import Patologias
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera un dataset sintético a gran escala (pacientes, fichas, medicamentos, '
+        'signos vitales, partos, recién nacidos) para pruebas de carga. '
+        'Usar solo en una base de datos de pruebas.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pacientes',
+            type=int,
+            default=10000,
+            help='Cantidad de pacientes a generar (por defecto 10000)'
+        )
+        parser.add_argument('--matronas', type=int, default=50, help='Matronas a crear (por defecto 50)')
+        parser.add_argument('--tens', type=int, default=80, help='TENS a crear (por defecto 80)')
+        parser.add_argument(
+            '--semilla',
+            type=int,
+            default=None,
+            help='Semilla del generador aleatorio, para reproducir el mismo dataset'
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=TAMANO_LOTE,
+            help=f'Pacientes por lote, cada lote en una transacción (por defecto {TAMANO_LOTE})'
+        )
+        parser.add_argument(
+            '--anios',
+            type=int,
+            default=3,
+            help='Años hacia atrás en que se reparten las fechas de admisión (por defecto 3)'
+        )
+
+    def handle(self, *args, **options):
+        if options['pacientes'] < 0 or options['lote'] < 1:
+            raise CommandError('--pacientes no puede ser negativo y --lote debe ser mayor que 0')
+
+        if not Patologias.objects.exists():
+            self.stdout.write(self.style.WARNING('\n📋 Cargando catálogo de patologías...'))
+            call_command('cargar_patologias', stdout=StringIO())
+
+        generador = GeneradorDataset(
+            semilla=options['semilla'],
+            tamano_lote=options['lote'],
+            anios=options['anios'],
+        )
+        inicio = time.monotonic()
+
+        def progreso(generadas):
+            segundos = max(time.monotonic() - inicio, 1e-6)
+            self.stdout.write(f'   {generadas} pacientes generadas ({generadas / segundos:.0f} pacientes/s)')
+
+        self.stdout.write(self.style.WARNING(
+            f"\n📋 Generando {options['pacientes']} pacientes (semilla: {options['semilla']})..."
+        ))
+        try:
+            totales = generador.generar(
+                options['pacientes'],
+                matronas=options['matronas'],
+                tens=options['tens'],
+                progreso=progreso,
+            )
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ COMPLETADO en {time.monotonic() - inicio:.1f} s'
+        ))
+        for tabla, cantidad in totales.items():
+            self.stdout.write(f'  📊 {tabla}: {cantidad}')
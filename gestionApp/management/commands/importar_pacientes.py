@@ -0,0 +1,102 @@
+# ============================================
+# UBICACIÓN: gestionApp/management/commands/importar_pacientes.py
+# ============================================
+
+import csv
+import time
+from array import array
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from gestionApp.censo import ErrorCenso, leer_censo
+from gestionApp.ingesta import TAMANO_LOTE, ingresar_pacientes
+from gestionApp.models import Paciente
+
+
+class Command(BaseCommand):
+    help = (
+        'Importa un censo de pacientes desde CSV o XLSX: crea las pacientes nuevas y '
+        'actualiza las ya registradas (por RUT). Las filas con errores se escriben en un '
+        'archivo de rechazos.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help='Ruta del archivo .csv o .xlsx')
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=TAMANO_LOTE,
+            help=f'Filas por lote, cada lote en una transacción (por defecto {TAMANO_LOTE})'
+        )
+        parser.add_argument(
+            '--rechazos',
+            help='Archivo CSV de rechazos (por defecto <archivo>.rechazos.csv)'
+        )
+        parser.add_argument(
+            '--consultorio',
+            choices=[clave for clave, _etiqueta in Paciente.CONSULTORIO_CHOICES],
+            help='Consultorio de origen para todas las filas del archivo'
+        )
+        parser.add_argument('--separador', help='Separador del CSV (por defecto se detecta)')
+        parser.add_argument('--hoja', help='Hoja del XLSX (por defecto la primera)')
+        parser.add_argument(
+            '--sin-actualizar',
+            action='store_true',
+            help='No modifica las pacientes ya registradas, solo crea las nuevas'
+        )
+
+    def handle(self, *args, **options):
+        ruta = Path(options['archivo'])
+        if not ruta.is_file():
+            raise CommandError(f'No existe el archivo {ruta}')
+        if options['lote'] < 1:
+            raise CommandError('--lote debe ser mayor que 0')
+
+        fijos = {'Consultorio': options['consultorio']} if options['consultorio'] else None
+        filas = array('L')
+        inicio = time.monotonic()
+
+        def registros():
+            for numero, datos in leer_censo(ruta, options['separador'], options['hoja'], fijos):
+                filas.append(numero)
+                yield datos
+
+        def progreso(procesadas):
+            segundos = time.monotonic() - inicio
+            self.stdout.write(f'   {procesadas} filas procesadas ({procesadas / max(segundos, 1e-6):.0f} filas/s)')
+
+        self.stdout.write(self.style.WARNING(f'\n📋 Importando censo {ruta.name}...'))
+        try:
+            resultado = ingresar_pacientes(
+                registros(),
+                tamano_lote=options['lote'],
+                progreso=progreso,
+                actualizar=not options['sin_actualizar'],
+            )
+        except ErrorCenso as error:
+            raise CommandError(str(error))
+
+        segundos = time.monotonic() - inicio
+        total = len(filas)
+
+        for rut in resultado.existentes:
+            self.stdout.write(self.style.WARNING(f'  ⚠️  Paciente {rut} ya existe (no se modificó)'))
+
+        if resultado.rechazados:
+            ruta_rechazos = Path(options['rechazos'] or f'{ruta}.rechazos.csv')
+            with open(ruta_rechazos, 'w', newline='', encoding='utf-8') as archivo:
+                escritor = csv.writer(archivo)
+                escritor.writerow(['fila', 'rut', 'motivo'])
+                for posicion, rut, motivo in resultado.rechazados:
+                    escritor.writerow([filas[posicion - 1], rut, motivo])
+            self.stdout.write(self.style.ERROR(
+                f'  ❌ {len(resultado.rechazados)} filas rechazadas, detalle en {ruta_rechazos}'
+            ))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ COMPLETADO: {total} filas en {segundos:.1f} s '
+            f'({total / segundos if segundos else total:.0f} filas/s)'
+        ))
+        self.stdout.write(f'  🆕 Creadas: {resultado.creados}')
+        self.stdout.write(f'  🔄 Actualizadas: {resultado.actualizados}')
+        self.stdout.write(f'  ⛔ Rechazadas: {len(resultado.rechazados)}')
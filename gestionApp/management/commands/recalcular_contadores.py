@@ -0,0 +1,58 @@
+# ============================================
+# UBICACIÓN: gestionApp/management/commands/recalcular_contadores.py
+# ============================================
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from gestionApp.contadores import CONTADORES, contar, recalcular_contadores
+from gestionApp.models import Contador
+
+
+class Command(BaseCommand):
+    help = 'Recalcula desde cero los contadores de dashboards para corregir desvíos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'nombres',
+            nargs='*',
+            help='Contadores a recalcular (todos si no se indica ninguno)'
+        )
+        parser.add_argument(
+            '--verificar',
+            action='store_true',
+            help='Solo informa los desvíos, sin modificar los contadores'
+        )
+
+    def handle(self, *args, **options):
+        nombres = options['nombres'] or list(CONTADORES)
+        desconocidos = [n for n in nombres if n not in CONTADORES]
+        if desconocidos:
+            raise CommandError(f"Contadores desconocidos: {', '.join(desconocidos)}")
+
+        guardados = dict(
+            Contador.objects.filter(nombre__in=nombres).values_list('nombre', 'valor')
+        )
+
+        if options['verificar']:
+            reales = {nombre: contar(nombre) for nombre in nombres}
+        else:
+            self.stdout.write(self.style.WARNING('\n📋 Recalculando contadores...'))
+            with transaction.atomic():
+                reales = recalcular_contadores(nombres)
+
+        desvios = 0
+        for nombre in nombres:
+            anterior = guardados.get(nombre)
+            if anterior != reales[nombre]:
+                desvios += 1
+                self.stdout.write(
+                    self.style.WARNING(f"  ⚠️  {nombre}: {anterior} → {reales[nombre]}")
+                )
+            else:
+                self.stdout.write(f"  ✓ {nombre}: {reales[nombre]}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n✅ COMPLETADO: {len(nombres)} contadores revisados, {desvios} con desvío'
+            )
+        )
@@ -0,0 +1,44 @@
+# ============================================
+# UBICACIÓN: gestionApp/management/commands/reconstruir_tokens_busqueda.py
+# ============================================
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from gestionApp.busqueda import indexar_personas
+from gestionApp.models import Persona
+
+
+class Command(BaseCommand):
+    help = 'Regenera la tabla de tokens de búsqueda de personas (nombres sin tildes y RUT)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=1000,
+            help='Personas procesadas por lote (por defecto 1000)'
+        )
+
+    def handle(self, *args, **options):
+        lote = options['lote']
+        ultimo_id = 0
+        total = 0
+
+        self.stdout.write(self.style.WARNING('\n📋 Regenerando tokens de búsqueda...'))
+
+        while True:
+            personas = list(
+                Persona.objects.filter(pk__gt=ultimo_id)
+                .order_by('pk')
+                .only('pk', 'Rut', 'Nombre', 'Apellido_Paterno', 'Apellido_Materno')[:lote]
+            )
+            if not personas:
+                break
+            ultimo_id = personas[-1].pk
+
+            with transaction.atomic():
+                indexar_personas(personas)
+            total += len(personas)
+            self.stdout.write(f'   {total} personas indexadas')
+
+        self.stdout.write(self.style.SUCCESS(f'\n✅ COMPLETADO: {total} personas indexadas'))
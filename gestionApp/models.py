@@ -1,7 +1,9 @@
 from django.db import models
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
-from utilidad.rut_validator import validar_rut, normalizar_rut, validar_rut_chileno
+from utilidad.rut_validator import RutValidator, validar_rut, normalizar_rut, validar_rut_chileno
+from utilidad.expresiones import alguno_verdadero, como_booleano
+from utilidad.cambios import SeguimientoCambiosMixin
 from datetime import date
 from django.utils import timezone
 
@@ -9,7 +11,7 @@ from django.utils import timezone
 # ============================================
 # MODELO BASE: PERSONA
 # ============================================
-class Persona(models.Model):
+class Persona(SeguimientoCambiosMixin, models.Model):
     SEXO_CHOICES = [
         ('Masculino', 'Masculino'),
         ('Femenino', 'Femenino'),
@@ -71,6 +73,8 @@ class Persona(models.Model):
     Direccion = models.CharField(max_length=100, verbose_name="Direccion", blank=True)
     Email = models.CharField(max_length=100, verbose_name="Email", blank=True)
     Activo = models.BooleanField(default=True, verbose_name="Activo")
+    # RUT sin puntos ni guion (123456785), indexado para búsquedas exactas y por prefijo
+    rut_busqueda = models.CharField(max_length=12, db_index=True, editable=False, blank=True, default='', verbose_name="RUT de búsqueda")
     
     def calcular_edad(self):
         """Calcula la edad actual basada en la fecha de nacimiento"""
@@ -96,7 +100,12 @@ class Persona(models.Model):
         if self.Rut:
             self.Rut = normalizar_rut(self.Rut)
             validar_rut_chileno(self.Rut)
-        self.full_clean()
+        self.rut_busqueda = RutValidator.limpiar(self.Rut)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'Rut' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'rut_busqueda'}
+        # Con update_fields solo se validan (y se buscan duplicados de) los campos que se guardan
+        self.full_clean(exclude=self.campos_sin_validar(kwargs.get('update_fields')))
         super().save(*args, **kwargs)
     
     def __str__(self):
@@ -106,7 +115,29 @@ class Persona(models.Model):
 # ============================================
 # MODELO PACIENTE
 # ============================================
-class Paciente(models.Model):
+CONDICIONES_CRITICAS = [
+    'Preeclampsia_Severa',
+    'Eclampsia',
+    'Sepsis_o_Infeccion_SiST',
+    'Infeccion_Ovular_o_Corioamnionitis',
+]
+
+
+class PacienteQuerySet(models.QuerySet):
+    """Banderas clínicas de Paciente calculadas en la base de datos"""
+
+    def with_flags(self):
+        """Anota tiene_condiciones_criticas_db"""
+        return self.annotate(
+            tiene_condiciones_criticas_db=como_booleano(alguno_verdadero(CONDICIONES_CRITICAS)),
+        )
+
+    def criticas(self):
+        """Pacientes con alguna condición crítica (ver tiene_condiciones_criticas)"""
+        return self.filter(alguno_verdadero(CONDICIONES_CRITICAS))
+
+
+class Paciente(SeguimientoCambiosMixin, models.Model):
     """Rol de Paciente vinculado a Persona"""
     ESTADO_CIVIL_CHOICES = [
         ('SOLTERA', 'Soltera'),
@@ -160,6 +191,8 @@ class Paciente(models.Model):
     Fecha_y_Hora_Ingreso = models.DateTimeField(default=timezone.now, verbose_name="Fecha y Hora de Ingreso")
     activo = models.BooleanField(default=True, verbose_name="Activo")
     
+    objects = PacienteQuerySet.as_manager()
+    
     @property
     def edad(self):
         """Property para obtener la edad de la persona"""
@@ -175,19 +208,19 @@ class Paciente(models.Model):
     
     def tiene_condiciones_criticas(self):
         """Verifica si tiene alguna condición crítica"""
-        return (self.Preeclampsia_Severa or self.Eclampsia or self.Sepsis_o_Infeccion_SiST or self.Infeccion_Ovular_o_Corioamnionitis)
+        return any(getattr(self, campo) for campo in CONDICIONES_CRITICAS)
     
     def clean(self):
         super().clean()
         edad_actual = self.edad
         if edad_actual and (edad_actual < 12 or edad_actual > 60):
             raise ValidationError({'persona': f'La edad de la paciente ({edad_actual} años) debe estar entre 12 y 60 años.'})
-        if self.imc:
-            if self.imc < 10 or self.imc > 60:
-                raise ValidationError({'imc': 'El IMC debe estar entre 10 y 60.'})
+        if self.IMC:
+            if self.IMC < 10 or self.IMC > 60:
+                raise ValidationError({'IMC': 'El IMC debe estar entre 10 y 60.'})
     
     def save(self, *args, **kwargs):
-        self.full_clean()
+        self.full_clean(exclude=self.campos_sin_validar(kwargs.get('update_fields')))
         super().save(*args, **kwargs)
     
     def __str__(self):
@@ -278,4 +311,65 @@ class Tens(models.Model):
     Activo = models.BooleanField(default=True)
     
     def __str__(self):
-        return f"TENS: {self.persona.Nombre} {self.persona.Apellido_Paterno} {self.persona.Apellido_Materno} - {self.Nivel}"
\ No newline at end of file
+        return f"TENS: {self.persona.Nombre} {self.persona.Apellido_Paterno} {self.persona.Apellido_Materno} - {self.Nivel}"
+
+# ============================================
+# MODELO CONTADOR (DASHBOARDS)
+# ============================================
+class Contador(models.Model):
+    """
+    Contador con nombre mantenido incrementalmente por señales.
+    Los dashboards leen estas filas en vez de contar las tablas completas.
+    Ver gestionApp.contadores para la definición de cada contador.
+    """
+    nombre = models.CharField(max_length=50, unique=True, verbose_name="Nombre")
+    valor = models.BigIntegerField(default=0, verbose_name="Valor")
+    fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name="Última Actualización")
+    
+    def __str__(self):
+        return f"{self.nombre}: {self.valor}"
+    
+    class Meta:
+        verbose_name = "Contador"
+        verbose_name_plural = "Contadores"
+
+
+# ============================================
+# MODELO SECUENCIA (NUMERACIÓN AUTOMÁTICA)
+# ============================================
+class Secuencia(models.Model):
+    """
+    Último número entregado por cada secuencia de numeración automática
+    (PARTO-000001, FP-000001, FO-000001, ...).
+    Se incrementa de forma atómica en gestionApp.secuencias.
+    """
+    nombre = models.CharField(max_length=50, unique=True, verbose_name="Nombre")
+    ultimo_valor = models.BigIntegerField(default=0, verbose_name="Último Valor Entregado")
+    
+    def __str__(self):
+        return f"{self.nombre}: {self.ultimo_valor}"
+    
+    class Meta:
+        verbose_name = "Secuencia"
+        verbose_name_plural = "Secuencias"
+
+
+# ============================================
+# MODELO TOKEN DE BÚSQUEDA DE PERSONAS
+# ============================================
+class PersonaToken(models.Model):
+    """
+    Palabras de búsqueda de una persona: cada nombre y apellido en
+    minúsculas y sin tildes, y el RUT sin puntos ni guion.
+    Se regenera al guardar la persona (ver gestionApp.busqueda).
+    """
+    persona = models.ForeignKey(Persona, on_delete=models.CASCADE, related_name='tokens_busqueda', verbose_name="Persona")
+    token = models.CharField(max_length=100, db_index=True, verbose_name="Token")
+    
+    def __str__(self):
+        return f"{self.token} ({self.persona_id})"
+    
+    class Meta:
+        verbose_name = "Token de Búsqueda"
+        verbose_name_plural = "Tokens de Búsqueda"
+        unique_together = [('persona', 'token')]
@@ -0,0 +1,137 @@
+"""
+Asignación de números correlativos (PARTO-000001, FP-000001, ...)
+
+Cada secuencia guarda su último valor en la tabla Secuencia y se avanza
+con un UPDATE atómico (valor = valor + n), por lo que dos inserciones
+simultáneas nunca reciben el mismo número y no es necesario leer el
+último registro del modelo.
+
+Con SECUENCIAS_TAMANO_BLOQUE > 1 cada proceso reserva bloques de números
+y los entrega desde memoria sin consultar la base de datos. Los números
+de un bloque no usado se pierden al reiniciar el proceso (la numeración
+puede tener saltos, pero nunca duplicados).
+"""
+import re
+import threading
+
+from django.apps import apps
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Max
+
+from gestionApp.models import Secuencia
+
+
+# nombre -> (prefijo, modelo, campo)
+SECUENCIAS = {
+    'registro_parto': ('PARTO', 'partosApp.RegistroParto', 'numero_registro'),
+    'ficha_parto': ('FP', 'ingresoPartoApp.FichaParto', 'numero_ficha_parto'),
+    'ficha_obstetrica': ('FO', 'matronaApp.FichaObstetrica', 'numero_ficha'),
+    'ingreso_paciente': ('ING', 'matronaApp.IngresoPaciente', 'numero_ficha'),
+}
+
+DIGITOS = 6
+
+# Consulta con forma de número correlativo: prefijo, guion y dígitos opcionales
+NUMERO_PATRON = re.compile(r'^[A-Za-z]+-\d*$')
+
+TAMANO_BLOQUE = getattr(settings, 'SECUENCIAS_TAMANO_BLOQUE', 1)
+
+# Bloques reservados por este proceso: nombre -> [siguiente, ultimo]
+_bloques = {}
+_bloques_lock = threading.Lock()
+
+
+def formatear(nombre, numero):
+    """Formatea un número de la secuencia: formatear('registro_parto', 7) -> 'PARTO-000007'"""
+    prefijo = SECUENCIAS[nombre][0]
+    return f"{prefijo}-{numero:0{DIGITOS}d}"
+
+
+def es_consulta_numero(query):
+    """True si la consulta parece un número correlativo o su comienzo ('FO-0001', 'parto-')"""
+    return bool(NUMERO_PATRON.match((query or '').strip()))
+
+
+def _valor_inicial(nombre):
+    """
+    Último número ya usado en la tabla del modelo.
+    Solo se consulta una vez, al crear la fila de la secuencia.
+    """
+    prefijo, modelo, campo = SECUENCIAS[nombre]
+    ultimo = apps.get_model(modelo).objects.filter(
+        **{f'{campo}__startswith': f'{prefijo}-'}
+    ).aggregate(ultimo=Max(campo))['ultimo']
+    if not ultimo:
+        return 0
+    try:
+        return int(ultimo.split('-')[1])
+    except (IndexError, ValueError):
+        return 0
+
+
+def _avanzar(nombre, cantidad):
+    """
+    Avanza la secuencia en `cantidad` y retorna el primer número reservado.
+    El UPDATE bloquea la fila hasta el fin de la transacción, así la
+    lectura posterior ve exactamente el valor escrito por esta llamada.
+    """
+    with transaction.atomic():
+        actualizadas = Secuencia.objects.filter(nombre=nombre).update(
+            ultimo_valor=F('ultimo_valor') + cantidad
+        )
+        if not actualizadas:
+            try:
+                with transaction.atomic():
+                    Secuencia.objects.create(
+                        nombre=nombre,
+                        ultimo_valor=_valor_inicial(nombre) + cantidad,
+                    )
+            except IntegrityError:
+                # Otro proceso creó la secuencia al mismo tiempo
+                Secuencia.objects.filter(nombre=nombre).update(
+                    ultimo_valor=F('ultimo_valor') + cantidad
+                )
+        ultimo = Secuencia.objects.filter(nombre=nombre).values_list(
+            'ultimo_valor', flat=True
+        ).get()
+    return ultimo - cantidad + 1
+
+
+def reservar_numeros(nombre, cantidad):
+    """
+    Reserva `cantidad` números consecutivos en una sola operación.
+    Pensado para cargas masivas: retorna la lista de números formateados.
+    """
+    if nombre not in SECUENCIAS:
+        raise KeyError(f"Secuencia desconocida: {nombre}")
+    if cantidad <= 0:
+        return []
+    primero = _avanzar(nombre, cantidad)
+    return [formatear(nombre, n) for n in range(primero, primero + cantidad)]
+
+
+def generar_numero(nombre):
+    """
+    Retorna el siguiente número formateado de la secuencia.
+
+    Si hay bloques activados (SECUENCIAS_TAMANO_BLOQUE > 1) y no hay una
+    transacción abierta, se entrega desde el bloque en memoria del proceso.
+    Dentro de una transacción se reserva directamente en ella, para que un
+    rollback no deje en memoria números que la base de datos ya olvidó.
+    """
+    if nombre not in SECUENCIAS:
+        raise KeyError(f"Secuencia desconocida: {nombre}")
+
+    if TAMANO_BLOQUE <= 1 or transaction.get_connection().in_atomic_block:
+        return formatear(nombre, _avanzar(nombre, 1))
+
+    with _bloques_lock:
+        bloque = _bloques.get(nombre)
+        if bloque is None or bloque[0] > bloque[1]:
+            primero = _avanzar(nombre, TAMANO_BLOQUE)
+            bloque = [primero, primero + TAMANO_BLOQUE - 1]
+            _bloques[nombre] = bloque
+        numero = bloque[0]
+        bloque[0] += 1
+    return formatear(nombre, numero)
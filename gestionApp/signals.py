@@ -0,0 +1,110 @@
+"""
+Señales de gestionApp
+
+Mantienen los contadores de dashboards (ver gestionApp.contadores).
+Al cargar una instancia se guarda en qué contadores cuenta; al guardarla
+o eliminarla se aplica la diferencia con un UPDATE atómico.
+
+También regeneran los tokens de búsqueda de cada Persona guardada
+(ver gestionApp.busqueda).
+"""
+from django.apps import apps
+from django.db.models.signals import post_init, post_save, post_delete
+
+from gestionApp import busqueda, contadores
+
+
+ESTADO_ATTR = '_contadores_estado'
+
+# modelo -> ({nombre: filtro}, campos del filtro); se llena en conectar_senales
+# para que post_init, que corre por cada fila cargada, no recorra CONTADORES.
+_CONTADORES_POR_MODELO = {}
+
+
+def _modelos_con_contadores():
+    etiquetas = {modelo for modelo, _filtro in contadores.CONTADORES.values()}
+    return [apps.get_model(etiqueta) for etiqueta in etiquetas]
+
+
+def _contadores_del_modelo(model):
+    if model not in _CONTADORES_POR_MODELO:
+        _CONTADORES_POR_MODELO[model] = (
+            contadores.contadores_de_modelo(model),
+            frozenset(contadores.campos_de_modelo(model)),
+        )
+    return _CONTADORES_POR_MODELO[model]
+
+
+def _estado(instance, filtros):
+    return frozenset(
+        nombre
+        for nombre, filtro in filtros.items()
+        if contadores.cumple_filtro(instance, filtro)
+    )
+
+
+def registrar_estado_inicial(sender, instance, **kwargs):
+    filtros, campos = _contadores_del_modelo(sender)
+    # Si algún campo del filtro está diferido (.only()/.defer()) no se lee
+    # para no disparar una consulta extra; el estado queda desconocido.
+    if campos and not campos.isdisjoint(instance.get_deferred_fields()):
+        estado = None
+    else:
+        estado = _estado(instance, filtros)
+    setattr(instance, ESTADO_ATTR, estado)
+
+
+def actualizar_contadores_al_guardar(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    filtros, campos = _contadores_del_modelo(sender)
+    if update_fields is not None and campos.isdisjoint(update_fields):
+        return
+
+    anterior = frozenset() if created else getattr(instance, ESTADO_ATTR, None)
+    actual = _estado(instance, filtros)
+
+    if anterior is None:
+        # Estado previo desconocido: recontar los contadores del modelo
+        contadores.recalcular_contadores(filtros)
+    else:
+        for nombre in actual - anterior:
+            contadores.ajustar_contador(nombre, 1)
+        for nombre in anterior - actual:
+            contadores.ajustar_contador(nombre, -1)
+
+    setattr(instance, ESTADO_ATTR, actual)
+
+
+def actualizar_contadores_al_eliminar(sender, instance, **kwargs):
+    anterior = getattr(instance, ESTADO_ATTR, None)
+    if anterior is None:
+        filtros, _campos = _contadores_del_modelo(sender)
+        contadores.recalcular_contadores(filtros)
+        return
+    for nombre in anterior:
+        contadores.ajustar_contador(nombre, -1)
+
+
+def actualizar_tokens_busqueda(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    campos = {*busqueda.CAMPOS_NOMBRE, 'Rut'}
+    if update_fields is not None and not (set(update_fields) & campos):
+        return
+    busqueda.indexar_persona(instance)
+
+
+def conectar_senales():
+    """Conecta las señales de contadores y de tokens de búsqueda"""
+    post_save.connect(
+        actualizar_tokens_busqueda,
+        sender=apps.get_model('gestionApp.Persona'),
+        dispatch_uid='tokens_busqueda_persona',
+    )
+    for modelo in _modelos_con_contadores():
+        _contadores_del_modelo(modelo)
+        uid = f"contadores_{modelo._meta.label_lower}"
+        post_init.connect(registrar_estado_inicial, sender=modelo, dispatch_uid=uid)
+        post_save.connect(actualizar_contadores_al_guardar, sender=modelo, dispatch_uid=uid)
+        post_delete.connect(actualizar_contadores_al_eliminar, sender=modelo, dispatch_uid=uid)
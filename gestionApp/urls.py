@@ -34,6 +34,11 @@ urlpatterns = [
     path('matrona/registrar/', views.agregar_matrona, name='registrar_matrona'),
     path('tens/registrar/', views.agregar_tens, name='registrar_tens'),
     
+    # ============================================
+    # EXPORTACIONES CSV
+    # ============================================
+    path('exportar/<slug:tabla>.csv', views.exportar_csv, name='exportar_csv'),
+    
     # ============================================
     # API REST (AJAX)
     # ============================================
@@ -2,9 +2,15 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.views.generic import ListView, DetailView
-from django.http import JsonResponse
+from django.apps import apps
+from django.db.models import DateTimeField
+from django.http import JsonResponse, Http404, HttpResponseBadRequest
 from .forms.Gestion_form import PersonaForm, PacienteForm, MedicoForm, MatronaForm, TensForm
 from .models import Persona, Medico, Matrona, Tens
+from .contadores import obtener_contadores
+from .exportaciones import EXPORTACIONES
+from utilidad.exportacion_csv import respuesta_csv
+from utilidad.fechas import FechaInvalida, leer_fecha
 from matronaApp.models import Paciente
 from datetime import datetime
 
@@ -292,17 +298,21 @@ def dashboard_admin(request):
     Muestra estadísticas generales y accesos rápidos.
     """
     
-    # Contar todos los roles activos
-    total_medicos = Medico.objects.filter(Activo=True).count()
-    total_matronas = Matrona.objects.filter(Activo=True).count()
-    total_tens = Tens.objects.filter(Activo=True).count()
-    total_pacientes = Paciente.objects.filter(activo=True).count()
+    # Contar todos los roles activos (contadores mantenidos por señales)
+    contadores = obtener_contadores(
+        'medicos_activos', 'matronas_activas', 'tens_activos',
+        'pacientes_activos', 'personas_activas',
+    )
+    total_medicos = contadores['medicos_activos']
+    total_matronas = contadores['matronas_activas']
+    total_tens = contadores['tens_activos']
+    total_pacientes = contadores['pacientes_activos']
     
     # Total de usuarios en el sistema
     total_usuarios = total_medicos + total_matronas + total_tens + total_pacientes
     
     # Total de personas registradas
-    total_personas = Persona.objects.filter(Activo=True).count()
+    total_personas = contadores['personas_activas']
     
     # Contexto para el template
     context = {
@@ -315,4 +325,41 @@ def dashboard_admin(request):
         'fecha_actual': datetime.now().strftime('%d/%m/%Y'),
     }
     
-    return render(request, 'Gestion/dashboard_admin.html', context)
\ No newline at end of file
+    return render(request, 'Gestion/dashboard_admin.html', context)
+
+# ============================================
+# EXPORTACIONES CSV
+# ============================================
+
+def exportar_csv(request, tabla):
+    """
+    Descarga una tabla clínica en CSV (ver gestionApp.exportaciones)
+    Filtros opcionales: ?desde=AAAA-MM-DD&hasta=AAAA-MM-DD sobre la fecha de la tabla
+    """
+    exportacion = EXPORTACIONES.get(tabla)
+    if exportacion is None:
+        raise Http404(f"Exportación desconocida: {tabla}")
+    
+    modelo = apps.get_model(exportacion.modelo)
+    registros = modelo.objects.all()
+    
+    if exportacion.campo_fecha:
+        # En campos DateTime se compara solo la fecha
+        es_fecha_hora = isinstance(modelo._meta.get_field(exportacion.campo_fecha), DateTimeField)
+        campo = f"{exportacion.campo_fecha}__date" if es_fecha_hora else exportacion.campo_fecha
+        try:
+            desde = leer_fecha(request.GET.get('desde'))
+            hasta = leer_fecha(request.GET.get('hasta'))
+        except FechaInvalida as error:
+            return HttpResponseBadRequest(str(error))
+        if desde:
+            registros = registros.filter(**{f"{campo}__gte": desde})
+        if hasta:
+            registros = registros.filter(**{f"{campo}__lte": hasta})
+    
+    return respuesta_csv(
+        registros,
+        exportacion.columnas,
+        exportacion.nombre_archivo,
+        select_related=exportacion.select_related,
+    )
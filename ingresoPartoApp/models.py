@@ -1,6 +1,30 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
+from gestionApp.secuencias import generar_numero
+from utilidad.expresiones import alguno_verdadero, como_booleano
+
+
+PATOLOGIAS_GRAVES = [
+    'preeclampsia_severa',
+    'eclampsia',
+    'sepsis_infeccion_grave',
+    'infeccion_ovular',
+]
+
+
+class FichaPartoQuerySet(models.QuerySet):
+    """Banderas clínicas de FichaParto calculadas en la base de datos"""
+
+    def with_flags(self):
+        """Anota tiene_patologias_graves_db"""
+        return self.annotate(
+            tiene_patologias_graves_db=como_booleano(alguno_verdadero(PATOLOGIAS_GRAVES)),
+        )
+
+    def criticas(self):
+        """Fichas con alguna patología grave (ver tiene_patologias_graves)"""
+        return self.filter(alguno_verdadero(PATOLOGIAS_GRAVES))
 
 
 class FichaParto(models.Model):
@@ -249,6 +273,8 @@ class FichaParto(models.Model):
         verbose_name='Ficha Activa'
     )
     
+    objects = FichaPartoQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-fecha_creacion']
         verbose_name = 'Ficha de Parto (Ingreso)'
@@ -264,15 +290,7 @@ class FichaParto(models.Model):
     def save(self, *args, **kwargs):
         """Generar número automático si no existe"""
         if not self.numero_ficha_parto:
-            ultima = FichaParto.objects.order_by('-id').first()
-            if ultima:
-                try:
-                    numero = int(ultima.numero_ficha_parto.split('-')[1]) + 1
-                except (IndexError, ValueError):
-                    numero = 1
-            else:
-                numero = 1
-            self.numero_ficha_parto = f"FP-{numero:06d}"
+            self.numero_ficha_parto = generar_numero('ficha_parto')
         super().save(*args, **kwargs)
     
     def tiene_tamizajes_completos(self):
@@ -286,12 +304,7 @@ class FichaParto(models.Model):
     
     def tiene_patologias_graves(self):
         """Verifica si tiene patologías que requieren atención especial"""
-        return any([
-            self.preeclampsia_severa,
-            self.eclampsia,
-            self.sepsis_infeccion_grave,
-            self.infeccion_ovular,
-        ])
+        return any(getattr(self, campo) for campo in PATOLOGIAS_GRAVES)
     
     def resumen_tamizajes(self):
         """Retorna un resumen de los tamizajes realizados"""
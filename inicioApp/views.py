@@ -1,18 +1,22 @@
 # inicioApp/views.py
 from django.shortcuts import render
-from gestionApp.models import Persona, Medico, Matrona, Tens, Paciente
+from gestionApp.contadores import obtener_contadores
 
 
 def home(request):
     """Vista principal del sistema"""
     
-    # Estadísticas básicas
+    # Estadísticas básicas (contadores mantenidos por señales)
+    contadores = obtener_contadores(
+        'personas_activas', 'pacientes_activos', 'medicos_activos',
+        'matronas_activas', 'tens_activos',
+    )
     context = {
-        'total_personas': Persona.objects.filter(Activo=True).count(),
-        'total_pacientes': Paciente.objects.filter(activo=True).count(),
-        'total_medicos': Medico.objects.filter(Activo=True).count(),
-        'total_matronas': Matrona.objects.filter(Activo=True).count(),
-        'total_tens': Tens.objects.filter(Activo=True).count(),
+        'total_personas': contadores['personas_activas'],
+        'total_pacientes': contadores['pacientes_activos'],
+        'total_medicos': contadores['medicos_activos'],
+        'total_matronas': contadores['matronas_activas'],
+        'total_tens': contadores['tens_activos'],
     }
     
     return render(request, 'inicio/home.html', context)
\ No newline at end of file
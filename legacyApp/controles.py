@@ -0,0 +1,159 @@
+"""
+Controles previos de la base LEGACY
+
+Las vistas leen la copia local ControlPrevioSnapshot (base principal),
+que se actualiza con `manage.py sincronizar_legacy`; el servidor legacy
+no se consulta durante una petición. El historial de cada paciente se
+guarda además en caché por RUT normalizado y la sincronización invalida
+esa caché al terminar.
+
+La caché usada es CACHES[LEGACY_CACHE_ALIAS] (compartida entre procesos
+para que `manage.py invalidar_cache_legacy` afecte a todos los workers).
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router, transaction
+from django.db.models import Max
+
+from legacyApp.models import ControlesPrevios, ControlPrevioSnapshot
+from utilidad.rut_validator import RutValidator
+
+
+LEGACY_CACHE_ALIAS = getattr(settings, 'LEGACY_CACHE_ALIAS', 'default')
+LEGACY_CACHE_TTL = getattr(settings, 'LEGACY_CACHE_TTL', 60 * 60 * 8)
+
+# Al invalidar todo se incrementa la generación: las claves anteriores
+# quedan huérfanas y expiran solas.
+CLAVE_GENERACION = 'legacy:controles:generacion'
+
+
+def _cache():
+    return caches[LEGACY_CACHE_ALIAS]
+
+
+def _generacion():
+    return _cache().get_or_set(CLAVE_GENERACION, 1, None)
+
+
+def normalizar_rut(rut):
+    """RUT en el formato guardado en controles_previos (12345678-K)"""
+    return RutValidator.normalizar((rut or '').strip())
+
+
+def _clave(rut_normalizado):
+    return f"legacy:controles:{_generacion()}:{rut_normalizado}"
+
+
+def consultar_controles_previos(rut_normalizado):
+    """
+    Consulta la copia local con igualdad exacta sobre paciente_rut para
+    usar el índice (paciente_rut, -fecha_control).
+    """
+    return list(
+        ControlPrevioSnapshot.objects
+        .filter(paciente_rut=rut_normalizado)
+        .order_by('-fecha_control')
+    )
+
+
+# ============================================
+# SINCRONIZACIÓN LEGACY -> BASE PRINCIPAL
+# ============================================
+
+CAMPOS_CONTROL = [
+    'id', 'paciente_rut', 'fecha_control', 'semanas_gestacion',
+    'presion_sistolica', 'presion_diastolica', 'peso_kg',
+    'altura_uterina_cm', 'fcf_lpm', 'glucosa_mg_dl', 'proteinuria',
+    'observaciones',
+]
+
+LOTE_SINCRONIZACION = 2000
+
+
+def ultima_marca_sincronizada():
+    """Mayor id legacy ya copiado al snapshot (0 si está vacío)"""
+    return ControlPrevioSnapshot.objects.aggregate(ultimo=Max('id'))['ultimo'] or 0
+
+
+def _copiar_desde(ultimo_id, lote, progreso):
+    """Copia los controles legacy con id > ultimo_id. Retorna las filas copiadas."""
+    copiadas = 0
+    while True:
+        filas = list(
+            ControlesPrevios.objects
+            .using('legacy')
+            .filter(id__gt=ultimo_id)
+            .order_by('id')
+            .values(*CAMPOS_CONTROL)[:lote]
+        )
+        if not filas:
+            break
+
+        for fila in filas:
+            fila['paciente_rut'] = normalizar_rut(fila['paciente_rut']) or fila['paciente_rut']
+        ControlPrevioSnapshot.objects.bulk_create(
+            [ControlPrevioSnapshot(**fila) for fila in filas],
+            ignore_conflicts=True,
+        )
+
+        ultimo_id = filas[-1]['id']
+        copiadas += len(filas)
+        if progreso:
+            progreso(copiadas, ultimo_id)
+    return copiadas
+
+
+def sincronizar_controles_previos(lote=LOTE_SINCRONIZACION, completo=False, progreso=None):
+    """
+    Copia a ControlPrevioSnapshot los controles legacy con id mayor a la
+    marca de agua, leyendo por rangos de id (WHERE id > x ORDER BY id
+    LIMIT lote) e insertando cada lote con bulk_create.
+
+    Con completo=True se vacía el snapshot y se copia todo de nuevo (para
+    recoger filas modificadas o eliminadas en legacy), en una sola
+    transacción: mientras dura, las vistas siguen leyendo el snapshot
+    anterior completo. Retorna la cantidad de filas copiadas.
+    """
+    if completo:
+        with transaction.atomic(using=router.db_for_write(ControlPrevioSnapshot)):
+            ControlPrevioSnapshot.objects.all().delete()
+            copiadas = _copiar_desde(0, lote, progreso)
+    else:
+        copiadas = _copiar_desde(ultima_marca_sincronizada(), lote, progreso)
+
+    if copiadas or completo:
+        invalidar_controles_previos()
+    return copiadas
+
+
+def obtener_controles_previos(rut):
+    """
+    Retorna la lista de controles previos de la paciente, ordenados del
+    más reciente al más antiguo, leyendo primero desde la caché.
+    Los errores de conexión se propagan y no se guardan en caché.
+    """
+    rut_normalizado = normalizar_rut(rut)
+    if not rut_normalizado:
+        return []
+
+    cache = _cache()
+    clave = _clave(rut_normalizado)
+    controles = cache.get(clave)
+    if controles is None:
+        controles = consultar_controles_previos(rut_normalizado)
+        cache.set(clave, controles, LEGACY_CACHE_TTL)
+    return controles
+
+
+def invalidar_controles_previos(rut=None):
+    """
+    Invalida la caché de una paciente, o de todas si no se indica RUT.
+    """
+    cache = _cache()
+    if rut:
+        cache.delete(_clave(normalizar_rut(rut)))
+        return
+    try:
+        cache.incr(CLAVE_GENERACION)
+    except ValueError:
+        cache.set(CLAVE_GENERACION, 2, None)
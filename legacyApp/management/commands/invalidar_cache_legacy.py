@@ -0,0 +1,27 @@
+# ============================================
+# UBICACIÓN: legacyApp/management/commands/invalidar_cache_legacy.py
+# ============================================
+
+from django.core.management.base import BaseCommand
+from legacyApp.controles import invalidar_controles_previos, normalizar_rut
+
+
+class Command(BaseCommand):
+    help = 'Invalida la caché de controles previos LEGACY (de una paciente o de todas)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rut',
+            help='RUT de la paciente (si se omite se invalida la caché completa)'
+        )
+
+    def handle(self, *args, **options):
+        rut = options.get('rut')
+        invalidar_controles_previos(rut)
+
+        if rut:
+            self.stdout.write(
+                self.style.SUCCESS(f'✅ Caché LEGACY invalidada para RUT {normalizar_rut(rut)}')
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS('✅ Caché LEGACY invalidada para todas las pacientes'))
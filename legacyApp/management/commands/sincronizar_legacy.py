@@ -0,0 +1,45 @@
+# ============================================
+# UBICACIÓN: legacyApp/management/commands/sincronizar_legacy.py
+# ============================================
+
+from django.core.management.base import BaseCommand
+from legacyApp.controles import (
+    LOTE_SINCRONIZACION,
+    sincronizar_controles_previos,
+    ultima_marca_sincronizada,
+)
+
+
+class Command(BaseCommand):
+    help = 'Copia los controles previos LEGACY a la tabla local (solo los nuevos desde la última ejecución)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=LOTE_SINCRONIZACION,
+            help=f'Filas leídas e insertadas por lote (por defecto {LOTE_SINCRONIZACION})'
+        )
+        parser.add_argument(
+            '--completo',
+            action='store_true',
+            help='Vacía la copia local y vuelve a copiar todos los controles'
+        )
+
+    def handle(self, *args, **options):
+        lote = options['lote']
+        completo = options['completo']
+
+        if completo:
+            self.stdout.write('🔄 Sincronización completa: se vaciará la copia local')
+        else:
+            self.stdout.write(f'🔄 Sincronizando controles con id > {ultima_marca_sincronizada()}')
+
+        def progreso(copiadas, ultimo_id):
+            self.stdout.write(f'   {copiadas} controles copiados (último id {ultimo_id})')
+
+        copiadas = sincronizar_controles_previos(lote=lote, completo=completo, progreso=progreso)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {copiadas} controles copiados. Marca de agua: {ultima_marca_sincronizada()}'
+        ))
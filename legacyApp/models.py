@@ -21,3 +21,36 @@ class ControlesPrevios(models.Model):
 
     def __str__(self):
         return f"Control {self.fecha_control} ({self.paciente_rut})"
+
+
+class ControlPrevioSnapshot(models.Model):
+    """
+    Copia local de controles_previos en la base principal.
+    Se llena con `manage.py sincronizar_legacy`; el id es el mismo de la
+    tabla legacy y sirve como marca de agua para la carga incremental.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    paciente_rut = models.CharField(max_length=12)
+    fecha_control = models.DateField()
+    semanas_gestacion = models.IntegerField(null=True, blank=True)
+    presion_sistolica = models.IntegerField(null=True, blank=True)
+    presion_diastolica = models.IntegerField(null=True, blank=True)
+    peso_kg = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    altura_uterina_cm = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    fcf_lpm = models.IntegerField(null=True, blank=True)
+    glucosa_mg_dl = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)
+    proteinuria = models.CharField(max_length=10, null=True, blank=True)
+    observaciones = models.TextField(null=True, blank=True)
+    sincronizado_en = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'controles_previos_snapshot'
+        ordering = ['-fecha_control']
+        indexes = [
+            models.Index(fields=['paciente_rut', '-fecha_control'], name='ctrl_snap_rut_fecha_idx'),
+        ]
+        verbose_name = 'Control Previo (snapshot)'
+        verbose_name_plural = 'Controles Previos (snapshot)'
+
+    def __str__(self):
+        return f"Control {self.fecha_control} ({self.paciente_rut})"
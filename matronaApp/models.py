@@ -3,6 +3,8 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 from gestionApp.models import Paciente, Matrona, Tens
 from medicoApp.models import Patologias
+from gestionApp.secuencias import generar_numero
+from utilidad.cambios import SeguimientoCambiosMixin
 
 
 # ============================================
@@ -73,13 +75,19 @@ class IngresoPaciente(models.Model):
     
     def __str__(self):
         return f"Ingreso {self.numero_ficha} - {self.paciente.persona.Nombre} {self.paciente.persona.Apellido_Paterno}"
+    
+    def save(self, *args, **kwargs):
+        """Generar número automático si no existe"""
+        if not self.numero_ficha:
+            self.numero_ficha = generar_numero('ingreso_paciente')
+        super().save(*args, **kwargs)
 
 
 # ============================================
 # MODELO: FICHA OBSTÉTRICA
 # ============================================
 
-class FichaObstetrica(models.Model):
+class FichaObstetrica(SeguimientoCambiosMixin, models.Model):
     """
     Ficha clínica obstétrica completa de una paciente
     Contiene todos los antecedentes y datos del embarazo
@@ -421,6 +429,12 @@ class FichaObstetrica(models.Model):
     def __str__(self):
         return f"Ficha {self.numero_ficha} - {self.paciente.persona.Nombre} {self.paciente.persona.Apellido_Paterno}"
     
+    def save(self, *args, **kwargs):
+        """Generar número automático si no existe"""
+        if not self.numero_ficha:
+            self.numero_ficha = generar_numero('ficha_obstetrica')
+        super().save(*args, **kwargs)
+    
     @property
     def edad_gestacional_completa(self):
         """Retorna la edad gestacional en formato 'XX semanas + X días'"""
@@ -435,7 +449,7 @@ class FichaObstetrica(models.Model):
 # MODELO: MEDICAMENTO FICHA
 # ============================================
 
-class MedicamentoFicha(models.Model):
+class MedicamentoFicha(SeguimientoCambiosMixin, models.Model):
     """
     Medicamentos asignados a una ficha obstétrica
     Registrados por la matrona para administración por TENS
@@ -63,6 +63,10 @@ urlpatterns = [
     path('fichas/', 
         views.lista_todas_fichas, 
         name='todas_fichas'),
+    
+    path('api/fichas/', 
+        views.api_todas_fichas, 
+        name='api_todas_fichas'),
 
     # ============================================
     # RUTAS DE PATOLOGÍAS (Placeholder - Futuro)
@@ -2,13 +2,18 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.views.generic import ListView, DetailView
 from django.http import JsonResponse
+from django.template.loader import render_to_string
 from django.db.models import Q, Count, Prefetch
 
 from matronaApp.models import IngresoPaciente, FichaObstetrica, MedicamentoFicha
 from gestionApp.models import Persona, Paciente, Matrona
 from gestionApp.forms.Gestion_form import PacienteForm
 from matronaApp.forms import IngresoPacienteForm, FichaObstetricaForm  # <-- ESTA LÍNEA ES LA IMPORTANTE
-from legacyApp.models import ControlesPrevios
+from legacyApp.controles import obtener_controles_previos
+from gestionApp.busqueda import buscar_pacientes
+from utilidad.paginacion import paginar_keyset
+from utilidad.cambios import guardar_formulario
+from obstetric_care.metricas import FICHAS_CREADAS
 
 
 
@@ -53,13 +58,8 @@ class PacienteDetailView(DetailView):
         rut = (paciente.persona.Rut or "").strip()
 
         try:
-            # Consulta SIEMPRE contra la BD legacy
-            controles = (ControlesPrevios.objects
-                         .using("legacy")
-                         .filter(paciente_rut__iexact=rut)
-                         .order_by("-fecha_control"))
-
-            controles = list(controles)   # materializa para el template
+            # Historial LEGACY (copia local sincronizada, con caché por RUT)
+            controles = obtener_controles_previos(rut)
 
             # seleccionar control por ?ctrl=<id> (o el más reciente)
             sel_id = self.request.GET.get("ctrl")
@@ -115,14 +115,7 @@ def buscar_paciente(request):
     pacientes = []
     
     if query:
-        pacientes = Paciente.objects.filter(
-            Q(activo=True)
-        ).filter(
-            Q(persona__Rut__icontains=query) |
-            Q(persona__Nombre__icontains=query) |
-            Q(persona__Apellido_Paterno__icontains=query) |
-            Q(persona__Apellido_Materno__icontains=query)
-        ).select_related('persona')
+        pacientes = buscar_pacientes(query)
     
     return render(request, 'Matrona/Data/buscar_paciente.html', {
         'pacientes': pacientes,
@@ -174,14 +167,7 @@ def seleccionar_paciente_ficha(request):
     pacientes = []
     
     if query:
-        pacientes = Paciente.objects.filter(
-            Q(activo=True)
-        ).filter(
-            Q(persona__Rut__icontains=query) |
-            Q(persona__Nombre__icontains=query) |
-            Q(persona__Apellido_Paterno__icontains=query) |
-            Q(persona__Apellido_Materno__icontains=query)
-        ).select_related('persona').annotate(
+        pacientes = buscar_pacientes(query).annotate(
             num_fichas=Count('fichas_obstetricas')
         )
     
@@ -209,6 +195,7 @@ def crear_ficha_obstetrica(request, paciente_pk):
             ficha.paciente = paciente
             ficha.save()
             form.save_m2m()  # Guardar las patologías (ManyToMany)
+            FICHAS_CREADAS.inc()
             
             messages.success(
                 request,
@@ -313,7 +300,7 @@ def editar_ficha(request, pk):
             # Guardar sin commit para asegurar el paciente
             ficha_actualizada = form.save(commit=False)
             ficha_actualizada.paciente = paciente  # Mantener el mismo paciente
-            ficha_actualizada.save()
+            ficha_actualizada.guardar_cambios()
             
             # Guardar relaciones ManyToMany (patologías)
             form.save_m2m()
@@ -355,7 +342,7 @@ def desactivar_ficha(request, pk):
     
     if request.method == 'POST':
         ficha.activa = not ficha.activa
-        ficha.save()
+        ficha.guardar_cambios()
         
         estado = "activada" if ficha.activa else "cerrada"
         messages.success(request, f"✅ Ficha {ficha.numero_ficha} {estado} exitosamente.")
@@ -367,14 +354,21 @@ def desactivar_ficha(request, pk):
     })
 
 
-def lista_todas_fichas(request):
+# Orden del listado general: usa el índice de -fecha_creacion y el id
+# desempata fichas creadas en el mismo instante
+ORDEN_TODAS_FICHAS = ['-fecha_creacion', 'id']
+FICHAS_POR_PAGINA = 25
+
+
+def _pagina_todas_fichas(request):
     """
-    Listado general de todas las fichas obstétricas del sistema
+    Página de fichas para el listado general, según ?activa= y ?cursor=.
+    Lanza ValueError si el cursor no es válido.
     """
     fichas = FichaObstetrica.objects.select_related(
         'paciente__persona',
         'matrona_responsable__persona'
-    ).order_by('-fecha_creacion')
+    ).prefetch_related('patologias')
     
     # Filtros opcionales
     activa = request.GET.get('activa')
@@ -383,8 +377,58 @@ def lista_todas_fichas(request):
     elif activa == '0':
         fichas = fichas.filter(activa=False)
     
+    return paginar_keyset(
+        fichas,
+        ORDEN_TODAS_FICHAS,
+        cursor=request.GET.get('cursor'),
+        tamano=FICHAS_POR_PAGINA,
+    )
+
+
+def lista_todas_fichas(request):
+    """
+    Listado general de todas las fichas obstétricas del sistema
+    Paginado por cursor: cada página continúa desde la última ficha mostrada
+    """
+    try:
+        pagina = _pagina_todas_fichas(request)
+    except ValueError:
+        messages.warning(request, "⚠️ El enlace de paginación no es válido. Mostrando las fichas más recientes.")
+        return redirect('matrona:todas_fichas')
+    
     return render(request, 'Matrona/Data/todas_fichas.html', {
-        'fichas': fichas
+        'fichas': pagina.items,
+        'siguiente_cursor': pagina.siguiente_cursor,
+        'activa': request.GET.get('activa', ''),
+    })
+
+
+def api_todas_fichas(request):
+    """
+    API JSON del listado general de fichas (scroll infinito)
+    Retorna la página siguiente al ?cursor= recibido y el HTML de sus tarjetas
+    """
+    try:
+        pagina = _pagina_todas_fichas(request)
+    except ValueError:
+        return JsonResponse({'error': 'Cursor inválido'}, status=400)
+    
+    html = ''.join(
+        render_to_string('Matrona/Data/ficha_card.html', {'ficha': ficha}, request=request)
+        for ficha in pagina
+    )
+    
+    return JsonResponse({
+        'fichas': [{
+            'id': ficha.pk,
+            'numero_ficha': ficha.numero_ficha,
+            'paciente_rut': ficha.paciente.persona.Rut,
+            'paciente_nombre': f"{ficha.paciente.persona.Nombre} {ficha.paciente.persona.Apellido_Paterno}",
+            'fecha_creacion': ficha.fecha_creacion.isoformat(),
+            'activa': ficha.activa,
+        } for ficha in pagina],
+        'html': html,
+        'siguiente_cursor': pagina.siguiente_cursor,
     })
 
 
@@ -562,7 +606,7 @@ def editar_medicamento_ficha(request, medicamento_pk):
         form = MatronaAsignarMedicamento(request.POST, instance=medicamento)
         
         if form.is_valid():
-            form.save()
+            guardar_formulario(form)
             messages.success(request, "✅ Medicamento actualizado exitosamente.")
             return redirect('matrona:detalle_ficha', pk=ficha.pk)
         else:
@@ -586,7 +630,7 @@ def desactivar_medicamento_ficha(request, medicamento_pk):
     
     if request.method == 'POST':
         medicamento.activo = False
-        medicamento.save()
+        medicamento.guardar_cambios()
         
         messages.success(
             request,
@@ -7,6 +7,9 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.db.models import Q, Count
 from medicoApp.models import Patologias
+from gestionApp.contadores import obtener_contadores
+from legacyApp.controles import obtener_controles_previos
+from gestionApp.busqueda import buscar_pacientes
 
 
 # ============================================
@@ -15,14 +18,15 @@ from medicoApp.models import Patologias
 
 def menu_medico(request):
     """Vista principal del módulo Médico"""
+    contadores = obtener_contadores(
+        'patologias_total', 'patologias_activas',
+        'patologias_inactivas', 'patologias_alto_riesgo',
+    )
     context = {
-        'total_patologias': Patologias.objects.count(),
-        'patologias_activas': Patologias.objects.filter(estado='Activo').count(),
-        'patologias_inactivas': Patologias.objects.filter(estado='Inactivo').count(),
-        'patologias_alto_riesgo': Patologias.objects.filter(
-            nivel_de_riesgo__in=['Alto', 'Crítico'],
-            estado='Activo'
-        ).count(),
+        'total_patologias': contadores['patologias_total'],
+        'patologias_activas': contadores['patologias_activas'],
+        'patologias_inactivas': contadores['patologias_inactivas'],
+        'patologias_alto_riesgo': contadores['patologias_alto_riesgo'],
     }
     return render(request, 'Medico/menu_medico.html', context)
 
@@ -154,17 +158,7 @@ def buscar_paciente_medico(request):
     pacientes = []
     
     if query:
-        from gestionApp.models import Paciente
-        from django.db.models import Q, Count
-        
-        pacientes = Paciente.objects.filter(
-            Q(activo=True)
-        ).filter(
-            Q(persona__Rut__icontains=query) |
-            Q(persona__Nombre__icontains=query) |
-            Q(persona__Apellido_Paterno__icontains=query) |
-            Q(persona__Apellido_Materno__icontains=query)
-        ).select_related('persona').annotate(
+        pacientes = buscar_pacientes(query).annotate(
             num_fichas=Count('fichas_obstetricas')
         )
     
@@ -202,8 +196,13 @@ def ver_historial_clinico(request, paciente_pk):
         num_patologias=Count('patologias')
     ).order_by('-fecha_creacion')
     
+    # Controles previos LEGACY (copia local, sin consultar el servidor legacy)
+    controles_legacy = obtener_controles_previos(paciente.persona.Rut)
+    
     return render(request, 'Medico/Data/historial_clinico.html', {
         'paciente': paciente,
         'fichas': fichas,
-        'total_fichas': fichas.count()
+        'total_fichas': fichas.count(),
+        'controles_legacy': controles_legacy,
+        'total_controles_legacy': len(controles_legacy),
     })
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""
+Backend MySQL de Django sobre PyMySQL, con pool de conexiones opcional
+
+PyMySQL se instala como MySQLdb recién cuando Django carga este backend,
+es decir, con la primera conexión a una base MySQL. Los procesos que no
+usan MySQL (tests con SQLite, comandos sin base de datos) no lo importan.
+
+El pool (ver pool.py) se activa por alias con OPTIONS['pool'], con las
+mismas claves que el pool de PostgreSQL de Django:
+
+    'OPTIONS': {'pool': {'max_size': 8, 'timeout': 10, 'max_idle': 300}}
+
+y requiere CONN_MAX_AGE = 0: la conexión vuelve al pool al final de cada
+request en lugar de quedar retenida por el hilo.
+"""
+import pymysql
+
+pymysql.install_as_MySQLdb()
+
+from django.core.exceptions import ImproperlyConfigured  # noqa: E402
+from django.db.backends.mysql import base as mysql  # noqa: E402
+from django.utils.functional import cached_property  # noqa: E402
+
+from .pool import obtener_pool  # noqa: E402
+
+
+class DatabaseWrapper(mysql.DatabaseWrapper):
+
+    @cached_property
+    def pool(self):
+        opciones = self.settings_dict['OPTIONS'].get('pool')
+        if not opciones:
+            return None
+        if self.settings_dict['CONN_MAX_AGE'] != 0:
+            raise ImproperlyConfigured(
+                f"El pool de '{self.alias}' no admite conexiones persistentes: use CONN_MAX_AGE = 0"
+            )
+        return obtener_pool(self.alias, opciones)
+
+    def get_connection_params(self):
+        parametros = super().get_connection_params()
+        parametros.pop('pool', None)
+        return parametros
+
+    def get_new_connection(self, conn_params):
+        if self.pool is None:
+            return super().get_new_connection(conn_params)
+        return self.pool.obtener(
+            lambda: super(DatabaseWrapper, self).get_new_connection(conn_params)
+        )
+
+    def _close(self):
+        if self.pool is None or self.connection is None:
+            return super()._close()
+        # Solo vuelve al pool una conexión sin transacción abierta ni errores
+        reutilizable = (
+            not self.in_atomic_block
+            and not self.errors_occurred
+            and self.autocommit == self.settings_dict['AUTOCOMMIT']
+        )
+        with self.wrap_database_errors:
+            self.pool.devolver(self.connection, reutilizable)
@@ -0,0 +1,143 @@
+"""
+Pool acotado de conexiones PyMySQL, uno por alias y por proceso
+
+Con workers de varios hilos (gunicorn gthread) cada hilo toma una conexión
+del pool al comenzar a consultar y la devuelve al terminar el request
+(CONN_MAX_AGE = 0). max_size acota las conexiones abiertas por worker; si
+están todas en uso, el hilo espera hasta `timeout` segundos y luego falla
+con PoolAgotado (un OperationalError), en vez de quedar bloqueado.
+
+Las conexiones que pasan más de `max_idle` segundos libres se cierran, y
+las que llevan más de REVISAR_DESPUES segundos libres se verifican con
+ping antes de entregarse (equivalente a CONN_HEALTH_CHECKS).
+
+Métricas (obstetric_care.metricas): conexiones en uso y libres, tamaño
+máximo, tiempo de espera y veces que el pool se agotó, por alias.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+from pymysql.err import OperationalError
+
+from obstetric_care.metricas import (
+    DB_POOL_AGOTADO, DB_POOL_CONEXIONES, DB_POOL_ESPERA, DB_POOL_MAXIMO,
+)
+
+
+# Segundos libre tras los cuales una conexión se verifica antes de entregarla
+REVISAR_DESPUES = 30
+
+
+class PoolAgotado(OperationalError):
+    """No se obtuvo una conexión del pool dentro del timeout"""
+
+
+def _cerrar(conexion):
+    try:
+        conexion.close()
+    except Exception:
+        # Ya cerrada o caída: no hay nada más que hacer
+        pass
+
+
+class Pool:
+    def __init__(self, alias, max_size=5, timeout=10, max_idle=300):
+        self.alias = alias
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.candado = threading.Lock()
+        self._reiniciar()
+        DB_POOL_MAXIMO.set(max_size, alias=alias)
+
+    def _reiniciar(self):
+        self.pid = os.getpid()
+        self.cupos = threading.BoundedSemaphore(self.max_size)
+        self.libres = deque()   # (conexión, momento en que se devolvió)
+        self.en_uso = 0
+
+    def _verificar_proceso(self):
+        # Un worker creado con fork no comparte los sockets del proceso padre
+        if os.getpid() != self.pid:
+            self._reiniciar()
+
+    def _medir(self):
+        DB_POOL_CONEXIONES.set(self.en_uso, alias=self.alias, estado='en_uso')
+        DB_POOL_CONEXIONES.set(len(self.libres), alias=self.alias, estado='libre')
+
+    def _tomar_libre(self):
+        """Conexión libre más reciente que sigue sirviendo, o None"""
+        while True:
+            with self.candado:
+                if not self.libres:
+                    return None
+                conexion, devuelta = self.libres.pop()
+            libre = time.monotonic() - devuelta
+            if libre > self.max_idle:
+                _cerrar(conexion)
+                continue
+            if libre > REVISAR_DESPUES:
+                try:
+                    conexion.ping(reconnect=False)
+                except Exception:
+                    _cerrar(conexion)
+                    continue
+            return conexion
+
+    def obtener(self, conectar):
+        """Conexión libre del pool o una nueva creada con conectar()"""
+        self._verificar_proceso()
+        inicio = time.monotonic()
+        if not self.cupos.acquire(timeout=self.timeout):
+            DB_POOL_AGOTADO.inc(alias=self.alias)
+            raise PoolAgotado(
+                f"Pool de conexiones '{self.alias}' agotado: "
+                f"{self.max_size} en uso por más de {self.timeout} s"
+            )
+        DB_POOL_ESPERA.observar(time.monotonic() - inicio, alias=self.alias)
+        try:
+            conexion = self._tomar_libre() or conectar()
+        except BaseException:
+            self.cupos.release()
+            raise
+        with self.candado:
+            self.en_uso += 1
+            self._medir()
+        return conexion
+
+    def devolver(self, conexion, reutilizable=True):
+        """Devuelve la conexión al pool, o la cierra si no es reutilizable"""
+        if os.getpid() != self.pid:
+            _cerrar(conexion)
+            return
+        with self.candado:
+            self.en_uso -= 1
+            if reutilizable:
+                self.libres.append((conexion, time.monotonic()))
+            self._medir()
+        if not reutilizable:
+            _cerrar(conexion)
+        self.cupos.release()
+
+    def cerrar(self):
+        """Cierra las conexiones libres (las que están en uso se cierran al devolverse)"""
+        with self.candado:
+            libres, self.libres = self.libres, deque()
+            self._medir()
+        for conexion, _devuelta in libres:
+            _cerrar(conexion)
+
+
+_pools = {}
+_candado_pools = threading.Lock()
+
+
+def obtener_pool(alias, opciones):
+    """Pool del alias en este proceso (se crea la primera vez)"""
+    with _candado_pools:
+        pool = _pools.get(alias)
+        if pool is None:
+            pool = _pools[alias] = Pool(alias, **opciones)
+        return pool
@@ -1,14 +1,24 @@
 class LegacyRouter:
     app_label = "legacyApp"
 
+    # Modelos de legacyApp que viven en la BD legacy (no administrados).
+    # El resto (ControlPrevioSnapshot) se guarda en la base principal.
+    legacy_models = {"controlesprevios"}
+
+    def _es_legacy(self, model):
+        return (
+            model._meta.app_label == self.app_label
+            and model._meta.model_name in self.legacy_models
+        )
+
     def db_for_read(self, model, **hints):
-        if model._meta.app_label == self.app_label:
+        if self._es_legacy(model):
             return "legacy"
         return None
 
     def db_for_write(self, model, **hints):
         # Nunca escribir en la BD legacy
-        if model._meta.app_label == self.app_label:
+        if self._es_legacy(model):
             return None
         return None
 
@@ -18,5 +28,5 @@ class LegacyRouter:
     def allow_migrate(self, db, app_label, model_name=None, **hints):
         # Prohibir migraciones en legacy
         if app_label == self.app_label:
-            return False
+            return db != "legacy" and model_name not in self.legacy_models
         return None
@@ -0,0 +1,375 @@
+"""
+Métricas de la aplicación en formato de texto de Prometheus
+
+Registro en memoria de contadores, medidores e histogramas con etiquetas,
+sin dependencias externas:
+
+    PARTOS_REGISTRADOS.inc(origen='asistente')
+    DURACION_VISTAS.observar(0.12, vista='partos:listar_partos', metodo='GET')
+
+Las vistas de escritura (partos, recién nacidos, fichas, administraciones,
+registros TENS y tratamientos) incrementan sus contadores después de
+guardar, y PerfilSQLMiddleware observa la duración de cada request. El
+endpoint /metricas/ entrega todo en el formato de exposición de texto
+0.0.4.
+
+Acceso
+------
+/metricas/ responde 404 salvo a usuarios staff o a requests con
+'Authorization: Bearer <METRICAS_TOKEN>' (en prod, variable de entorno
+OBSTETRIC_CARE_METRICAS_TOKEN). No se filtra por REMOTE_ADDR: detrás de
+nginx -> gunicorn todos los requests llegan desde 127.0.0.1. En
+Prometheus:
+
+    scrape_configs:
+      - job_name: obstetric_care
+        metrics_path: /metricas/
+        authorization:
+          credentials_file: /etc/prometheus/obstetric_care_token
+
+Varios procesos (gunicorn)
+--------------------------
+Cada worker tiene su propio registro en memoria. Con METRICAS_DIR
+configurado, cada proceso guarda una instantánea de sus valores en
+METRICAS_DIR/metricas_<pid>.json (a lo más una vez por
+INTERVALO_ESCRITURA segundos, con reemplazo atómico, y al terminar el
+proceso), y la exposición suma los archivos de todos los procesos. Los
+archivos de workers que ya terminaron se mantienen para que los
+contadores no retrocedan (los medidores, en cambio, solo suman procesos
+vivos); el directorio se limpia al iniciar el servidor, p. ej. en
+gunicorn.conf.py:
+
+    def on_starting(server):
+        from obstetric_care import metricas
+        metricas.limpiar(METRICAS_DIR)
+
+Sin METRICAS_DIR (runserver, tests) solo se exponen los valores del
+proceso que atiende el request.
+"""
+import atexit
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+
+PREFIJO = 'obstetric_care_'
+
+# Límites por defecto de los histogramas (segundos)
+LIMITES = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Segundos mínimos entre escrituras de la instantánea de un proceso
+INTERVALO_ESCRITURA = 1.0
+
+PATRON_ARCHIVO = 'metricas_*.json'
+
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _formatear(numero):
+    if numero == math.inf:
+        return '+Inf'
+    if float(numero).is_integer():
+        return str(int(numero))
+    return repr(float(numero))
+
+
+def _serie(nombre, etiquetas, valores, extra=()):
+    pares = list(zip(etiquetas, valores)) + list(extra)
+    if not pares:
+        return nombre
+    return nombre + '{' + ','.join(f'{clave}="{_escapar(valor)}"' for clave, valor in pares) + '}'
+
+
+# ============================================
+# MÉTRICAS
+# ============================================
+
+class Metrica:
+    tipo = None
+    # Si los valores de procesos que ya terminaron dejan de sumarse
+    solo_vivos = False
+
+    def __init__(self, registro, nombre, ayuda, etiquetas=()):
+        self.registro = registro
+        self.nombre = PREFIJO + nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self.valores = {}
+
+    def _clave(self, etiquetas):
+        if set(etiquetas) != set(self.etiquetas):
+            raise ValueError(f'{self.nombre} requiere las etiquetas {self.etiquetas}')
+        return tuple(str(etiquetas[nombre]) for nombre in self.etiquetas)
+
+    def exportar(self):
+        return [[list(clave), valor] for clave, valor in self.valores.items()]
+
+    def encabezado(self):
+        return [f'# HELP {self.nombre} {self.ayuda}', f'# TYPE {self.nombre} {self.tipo}']
+
+    def _ajustar(self, etiquetas, cantidad=None, valor=None):
+        clave = self._clave(etiquetas)
+        with self.registro.candado:
+            self.registro.verificar_proceso()
+            self.valores[clave] = valor if cantidad is None else self.valores.get(clave, 0) + cantidad
+        self.registro.guardar()
+
+    @staticmethod
+    def sumar(acumulado, valor):
+        return (acumulado or 0) + valor
+
+    def lineas(self, valores):
+        for clave, valor in sorted(valores.items()):
+            yield f'{_serie(self.nombre, self.etiquetas, clave)} {_formatear(valor)}'
+
+
+class Contador(Metrica):
+    """Valor que solo aumenta (eventos registrados)"""
+    tipo = 'counter'
+
+    def inc(self, cantidad=1, **etiquetas):
+        if cantidad < 0:
+            raise ValueError('Un contador no puede disminuir')
+        self._ajustar(etiquetas, cantidad=cantidad)
+
+
+class Medidor(Metrica):
+    """Valor que sube y baja (conexiones abiertas); solo suma procesos vivos"""
+    tipo = 'gauge'
+    solo_vivos = True
+
+    def inc(self, cantidad=1, **etiquetas):
+        self._ajustar(etiquetas, cantidad=cantidad)
+
+    def dec(self, cantidad=1, **etiquetas):
+        self._ajustar(etiquetas, cantidad=-cantidad)
+
+    def set(self, valor, **etiquetas):
+        self._ajustar(etiquetas, valor=valor)
+
+
+class Histograma(Metrica):
+    """Distribución de observaciones en intervalos acumulativos"""
+    tipo = 'histogram'
+
+    def __init__(self, registro, nombre, ayuda, etiquetas=(), limites=LIMITES):
+        super().__init__(registro, nombre, ayuda, etiquetas)
+        if 'le' in self.etiquetas:
+            raise ValueError("'le' está reservada para los intervalos del histograma")
+        self.limites = tuple(sorted(limites))
+
+    def observar(self, valor, **etiquetas):
+        clave = self._clave(etiquetas)
+        # Primer intervalo cuyo límite es >= valor (el último es +Inf)
+        indice = next((i for i, limite in enumerate(self.limites) if valor <= limite), len(self.limites))
+        with self.registro.candado:
+            self.registro.verificar_proceso()
+            actual = self.valores.get(clave)
+            if actual is None:
+                actual = self.valores[clave] = {'intervalos': [0] * (len(self.limites) + 1), 'suma': 0.0}
+            actual['intervalos'][indice] += 1
+            actual['suma'] += valor
+        self.registro.guardar()
+
+    def sumar(self, acumulado, valor):
+        if acumulado is None:
+            return {'intervalos': list(valor['intervalos']), 'suma': valor['suma']}
+        if len(valor['intervalos']) == len(acumulado['intervalos']):
+            acumulado['intervalos'] = [a + b for a, b in zip(acumulado['intervalos'], valor['intervalos'])]
+            acumulado['suma'] += valor['suma']
+        return acumulado
+
+    def lineas(self, valores):
+        limites = self.limites + (math.inf,)
+        for clave, valor in sorted(valores.items()):
+            acumulado = 0
+            for limite, cantidad in zip(limites, valor['intervalos']):
+                acumulado += cantidad
+                yield f"{_serie(self.nombre + '_bucket', self.etiquetas, clave, [('le', _formatear(limite))])} {acumulado}"
+            yield f"{_serie(self.nombre + '_sum', self.etiquetas, clave)} {_formatear(valor['suma'])}"
+            yield f"{_serie(self.nombre + '_count', self.etiquetas, clave)} {acumulado}"
+
+
+# ============================================
+# REGISTRO
+# ============================================
+
+class Registro:
+    def __init__(self, directorio=None):
+        self.metricas = {}
+        self.candado = threading.Lock()
+        self.pid = os.getpid()
+        self.ultima_escritura = 0.0
+        self.pendiente = False
+        # None: se usa settings.METRICAS_DIR
+        self._directorio = directorio
+
+    @property
+    def directorio(self):
+        directorio = self._directorio or getattr(settings, 'METRICAS_DIR', None)
+        return Path(directorio) if directorio else None
+
+    def _registrar(self, metrica):
+        if metrica.nombre in self.metricas:
+            raise ValueError(f'La métrica {metrica.nombre} ya está registrada')
+        self.metricas[metrica.nombre] = metrica
+        return metrica
+
+    def contador(self, nombre, ayuda, etiquetas=()):
+        return self._registrar(Contador(self, nombre, ayuda, etiquetas))
+
+    def medidor(self, nombre, ayuda, etiquetas=()):
+        return self._registrar(Medidor(self, nombre, ayuda, etiquetas))
+
+    def histograma(self, nombre, ayuda, etiquetas=(), limites=LIMITES):
+        return self._registrar(Histograma(self, nombre, ayuda, etiquetas, limites))
+
+    def verificar_proceso(self):
+        """Un worker creado con fork no hereda los valores del proceso padre"""
+        if os.getpid() != self.pid:
+            self.pid = os.getpid()
+            self.ultima_escritura = 0.0
+            for metrica in self.metricas.values():
+                metrica.valores = {}
+
+    # ---------- archivos por proceso ----------
+
+    def guardar(self, forzar=False):
+        """Escribe la instantánea del proceso si pasó INTERVALO_ESCRITURA"""
+        directorio = self.directorio
+        if directorio is None:
+            return
+        self.pendiente = True
+        ahora = time.monotonic()
+        if not forzar and ahora - self.ultima_escritura < INTERVALO_ESCRITURA:
+            return
+        with self.candado:
+            self.verificar_proceso()
+            datos = {nombre: metrica.exportar() for nombre, metrica in self.metricas.items()}
+            self.ultima_escritura = ahora
+            self.pendiente = False
+        directorio.mkdir(parents=True, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix='.tmp')
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as archivo:
+            json.dump(datos, archivo)
+        os.replace(temporal, directorio / f'metricas_{self.pid}.json')
+
+    def guardar_pendiente(self):
+        if self.pendiente:
+            self.guardar(forzar=True)
+
+    def _instantaneas(self):
+        """Genera (proceso vivo, valores) por cada proceso"""
+        directorio = self.directorio
+        if directorio is None:
+            with self.candado:
+                self.verificar_proceso()
+                yield True, {nombre: metrica.exportar() for nombre, metrica in self.metricas.items()}
+            return
+        self.guardar(forzar=True)
+        for ruta in sorted(directorio.glob(PATRON_ARCHIVO)):
+            try:
+                datos = json.loads(ruta.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                # Archivo eliminado o de otra versión: se omite
+                continue
+            yield _proceso_vivo(ruta.stem.rpartition('_')[2]), datos
+
+    # ---------- exposición ----------
+
+    def agregar(self):
+        """{nombre: {etiquetas: valor}} sumando todos los procesos"""
+        total = {nombre: {} for nombre in self.metricas}
+        for vivo, instantanea in self._instantaneas():
+            for nombre, series in instantanea.items():
+                metrica = self.metricas.get(nombre)
+                if metrica is None or (metrica.solo_vivos and not vivo):
+                    continue
+                for etiquetas, valor in series:
+                    clave = tuple(etiquetas)
+                    total[nombre][clave] = metrica.sumar(total[nombre].get(clave), valor)
+        return total
+
+    def exponer(self):
+        """Texto en formato de exposición de Prometheus"""
+        lineas = []
+        for nombre, valores in self.agregar().items():
+            metrica = self.metricas[nombre]
+            lineas.extend(metrica.encabezado())
+            lineas.extend(metrica.lineas(valores))
+        return '\n'.join(lineas) + '\n'
+
+
+def _proceso_vivo(pid):
+    if not pid.isdigit():
+        return False
+    if os.name == 'nt':
+        # os.kill(pid, 0) termina el proceso en Windows (y gunicorn no corre ahí)
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def limpiar(directorio):
+    """Elimina las instantáneas de una ejecución anterior del servidor"""
+    for ruta in Path(directorio).glob(PATRON_ARCHIVO):
+        ruta.unlink(missing_ok=True)
+
+
+registro = Registro()
+atexit.register(registro.guardar_pendiente)
+
+
+# ============================================
+# MÉTRICAS DE LA APLICACIÓN
+# ============================================
+
+PARTOS_REGISTRADOS = registro.contador(
+    'partos_registrados_total', 'Partos registrados', ['origen']
+)
+RECIEN_NACIDOS_REGISTRADOS = registro.contador(
+    'recien_nacidos_registrados_total', 'Recién nacidos registrados', ['origen']
+)
+FICHAS_CREADAS = registro.contador(
+    'fichas_obstetricas_creadas_total', 'Fichas obstétricas creadas'
+)
+ADMINISTRACIONES_REGISTRADAS = registro.contador(
+    'administraciones_registradas_total', 'Administraciones de medicamentos registradas por TENS'
+)
+REGISTROS_TENS = registro.contador(
+    'registros_tens_total', 'Registros de signos vitales de TENS'
+)
+TRATAMIENTOS_REGISTRADOS = registro.contador(
+    'tratamientos_registrados_total', 'Tratamientos aplicados registrados'
+)
+DURACION_VISTAS = registro.histograma(
+    'vista_duracion_segundos', 'Duración de los requests por vista', ['vista', 'metodo']
+)
+
+# Pool de conexiones MySQL (obstetric_care.db_backends.mysql)
+DB_POOL_CONEXIONES = registro.medidor(
+    'db_pool_conexiones', 'Conexiones abiertas del pool por estado (en_uso, libre)', ['alias', 'estado']
+)
+DB_POOL_MAXIMO = registro.medidor(
+    'db_pool_max_conexiones', 'Tamaño máximo del pool', ['alias']
+)
+DB_POOL_ESPERA = registro.histograma(
+    'db_pool_espera_segundos', 'Espera para obtener una conexión del pool', ['alias'],
+    limites=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_POOL_AGOTADO = registro.contador(
+    'db_pool_agotado_total', 'Conexiones no obtenidas dentro del timeout del pool', ['alias']
+)
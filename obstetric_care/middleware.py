@@ -0,0 +1,151 @@
+"""
+Perfil de SQL por request (apto para producción)
+
+PerfilSQLMiddleware mide la latencia de todos los requests y, en una
+muestra de ellos (PERFIL_SQL_MUESTREO), registra cada consulta con
+connection.execute_wrapper en todas las conexiones (default y legacy):
+
+- cantidad de consultas y milisegundos de SQL por alias,
+- consultas repetidas: la misma sentencia (sin parámetros, con las
+  listas IN (...) colapsadas) ejecutada PERFIL_SQL_REPETIDAS veces o más
+  en un mismo request, la firma típica de un N+1.
+
+Por cada request muestreado se emite una línea JSON en el logger
+'obstetric_care.sql'. Los requests que superan PERFIL_SQL_UMBRAL_MS o
+PERFIL_SQL_UMBRAL_CONSULTAS, o que tienen consultas repetidas, se
+escriben además en 'obstetric_care.vistas_lentas' (archivo rotativo,
+ver LOGGING en settings). Un request lento que no cayó en la muestra se
+reporta igual, solo con su latencia.
+
+La duración de cada request se observa además en el histograma
+DURACION_VISTAS de obstetric_care.metricas (por vista y método).
+
+Sin muestreo el costo es un perf_counter() por request; con muestreo, un
+envoltorio de Python por consulta. En las respuestas en streaming
+(exportaciones) se mide solo hasta que comienza el envío.
+"""
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+from obstetric_care.metricas import DURACION_VISTAS
+
+
+logger = logging.getLogger('obstetric_care.sql')
+logger_lentas = logging.getLogger('obstetric_care.vistas_lentas')
+
+# IN (%s, %s, %s) -> IN (...): misma firma sin importar el largo de la lista
+LISTA_IN = re.compile(r'IN \((?:%s, )*%s\)')
+
+# Largo máximo de la sentencia en el log
+LARGO_SQL = 300
+
+# Consultas repetidas que se incluyen en el log
+MAX_REPETIDAS = 5
+
+
+def firma_sql(sql):
+    """Sentencia normalizada para agrupar ejecuciones repetidas"""
+    return LISTA_IN.sub('IN (...)', sql)
+
+
+class PerfilSQL:
+    """Acumula las consultas de un request (un envoltorio por conexión)"""
+
+    def __init__(self):
+        self.consultas = Counter()
+        self.segundos = defaultdict(float)
+        self.firmas = Counter()
+
+    def envoltorio(self, alias):
+        def medir(execute, sql, params, many, context):
+            inicio = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                self.consultas[alias] += 1
+                self.segundos[alias] += time.perf_counter() - inicio
+                self.firmas[firma_sql(sql)] += 1
+        return medir
+
+    def repetidas(self, minimo):
+        return [
+            {'sql': sql[:LARGO_SQL], 'veces': veces}
+            for sql, veces in self.firmas.most_common(MAX_REPETIDAS)
+            if veces >= minimo
+        ]
+
+    def resumen(self, minimo_repetidas):
+        return {
+            'consultas': sum(self.consultas.values()),
+            'sql_ms': round(sum(self.segundos.values()) * 1000, 1),
+            'por_alias': {
+                alias: {'consultas': self.consultas[alias], 'sql_ms': round(self.segundos[alias] * 1000, 1)}
+                for alias in sorted(self.consultas)
+            },
+            'repetidas': self.repetidas(minimo_repetidas),
+        }
+
+
+def crear_carpetas_de_log():
+    """
+    Crea la carpeta de los archivos de log de vistas lentas.
+    Los handlers usan delay=True: el archivo se abre recién al escribir.
+    """
+    for handler in logger_lentas.handlers:
+        archivo = getattr(handler, 'baseFilename', None)
+        if archivo:
+            Path(archivo).parent.mkdir(parents=True, exist_ok=True)
+
+
+class PerfilSQLMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        crear_carpetas_de_log()
+
+    def __call__(self, request):
+        # Se leen en cada request: se pueden ajustar con override_settings
+        muestreo = getattr(settings, 'PERFIL_SQL_MUESTREO', 0.05)
+        umbral_ms = getattr(settings, 'PERFIL_SQL_UMBRAL_MS', 1000)
+        umbral_consultas = getattr(settings, 'PERFIL_SQL_UMBRAL_CONSULTAS', 100)
+        minimo_repetidas = getattr(settings, 'PERFIL_SQL_REPETIDAS', 10)
+
+        perfil = PerfilSQL() if random.random() < muestreo else None
+        inicio = time.perf_counter()
+        with ExitStack() as pila:
+            if perfil:
+                for alias in connections:
+                    pila.enter_context(connections[alias].execute_wrapper(perfil.envoltorio(alias)))
+            response = self.get_response(request)
+        segundos = time.perf_counter() - inicio
+        milisegundos = segundos * 1000
+        vista = request.resolver_match.view_name if request.resolver_match else None
+        DURACION_VISTAS.observar(segundos, vista=vista or 'sin_ruta', metodo=request.method)
+
+        lento = milisegundos >= umbral_ms
+        if perfil is None and not lento:
+            return response
+
+        registro = {
+            'metodo': request.method,
+            'ruta': request.path,
+            'vista': vista,
+            'estado': response.status_code,
+            'ms': round(milisegundos, 1),
+            'muestreado': perfil is not None,
+        }
+        if perfil:
+            registro.update(perfil.resumen(minimo_repetidas))
+            logger.info(json.dumps(registro, ensure_ascii=False))
+            lento = lento or registro['consultas'] >= umbral_consultas or bool(registro['repetidas'])
+        if lento:
+            logger_lentas.warning(json.dumps(registro, ensure_ascii=False))
+        return response
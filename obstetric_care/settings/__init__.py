@@ -0,0 +1,29 @@
+"""
+Configuración por entorno
+
+El perfil se elige con la variable de entorno OBSTETRIC_CARE_ENTORNO:
+
+- dev (por defecto): DEBUG, debug_toolbar y django_extensions
+- prod: sin apps de depuración, plantillas en caché, conexiones
+  persistentes y archivos estáticos con hash (ManifestStaticFilesStorage)
+- test: base más lo que acelera la suite
+
+DJANGO_SETTINGS_MODULE sigue siendo obstetric_care.settings; también se
+puede apuntar directamente a obstetric_care.settings.<perfil>.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+_entorno = os.environ.get('OBSTETRIC_CARE_ENTORNO', 'dev')
+
+if _entorno == 'dev':
+    from .dev import *  # noqa: F401,F403
+elif _entorno == 'prod':
+    from .prod import *  # noqa: F401,F403
+elif _entorno == 'test':
+    from .test import *  # noqa: F401,F403
+else:
+    raise ImproperlyConfigured(
+        f"OBSTETRIC_CARE_ENTORNO='{_entorno}' no es válido (use dev, prod o test)"
+    )
@@ -1,8 +1,11 @@
 """
-Django settings for obstetric_care project.
+Django settings for obstetric_care project: configuración común.
 
 Generated by 'django-admin startproject' using Django 5.2.7.
 
+Los perfiles dev, prod y test (mismo paquete) parten de esta base; el
+perfil se elige con OBSTETRIC_CARE_ENTORNO (ver __init__.py).
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/topics/settings/
 
@@ -12,9 +15,10 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import tempfile
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
-BASE_DIR = Path(__file__).resolve().parent.parent
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
 
 # Quick-start development settings - unsuitable for production
@@ -24,7 +28,7 @@ TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
 SECRET_KEY = 'django-insecure-$z!&nw@++2f(-u)v7l$jcr%h768&bsnz+k@cd609fe-m7ybpyf'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = False
 
 ALLOWED_HOSTS = []
 
@@ -46,8 +50,7 @@ INSTALLED_APPS = [
     'phonenumber_field',         # Validación de teléfonos
     'django_filters',            # Filtros avanzados
     'rest_framework',            # API REST
-    'debug_toolbar',             # Barra de debug (solo desarrollo)
-    'django_extensions',         # Extensiones de Django    
+    # debug_toolbar y django_extensions: solo en dev.py
 
     # ✅ Apps de Obtetric Care
     'inicioApp',
@@ -62,6 +65,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'obstetric_care.middleware.PerfilSQLMiddleware',  # Perfil de SQL por request (muestreado)
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -69,8 +73,6 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-
-    'debug_toolbar.middleware.DebugToolbarMiddleware',  # Barra de debug (solo desarrollo)
 ]
 
 ROOT_URLCONF = 'obstetric_care.urls'
@@ -95,13 +97,13 @@ WSGI_APPLICATION = 'obstetric_care.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
-import pymysql
-pymysql.install_as_MySQLdb()
+# obstetric_care.db_backends.mysql instala PyMySQL como MySQLdb recién al
+# cargar el backend (primera conexión), no al importar la configuración
 
 DATABASES = {
     # Base principal del sistema (es la que usa Django para migraciones nuevas)
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
+        'ENGINE': 'obstetric_care.db_backends.mysql',
         'NAME': 'obstetric_carebdd',
         'USER': 'root',
         'PASSWORD': '12345678',
@@ -110,21 +112,39 @@ DATABASES = {
         'OPTIONS': {'charset': 'utf8mb4'},
     },
 
-    # Base histórica (solo lectura)
+    # Base histórica (solo lectura). connect_timeout corto: si el servidor
+    # legacy no responde, la vista falla rápido en vez de retener el worker
     'legacy': {
-        'ENGINE': 'django.db.backends.mysql',
+        'ENGINE': 'obstetric_care.db_backends.mysql',
         'NAME': 'legacy_obstetric',
         'USER': 'root',
         'PASSWORD': '12345678',
         'HOST': '127.0.0.1',
         'PORT': '3306',
-        'OPTIONS': {'charset': 'utf8mb4'},
+        'OPTIONS': {'charset': 'utf8mb4', 'connect_timeout': 3},
     },
 }
 
 # Router para impedir migraciones y escrituras en la base legacy
 DATABASE_ROUTERS = ['obstetric_care.dbrouters.LegacyRouter']
 
+# Cachés
+# 'legacy' es compartida entre procesos (archivos) para que la invalidación
+# desde manage.py llegue a todos los workers
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'legacy': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(tempfile.gettempdir(), 'obstetric_care_legacy'),
+    },
+}
+
+# Caché de controles previos LEGACY (legacyApp.controles)
+LEGACY_CACHE_ALIAS = 'legacy'
+LEGACY_CACHE_TTL = 60 * 60 * 8  # un turno
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -166,3 +186,72 @@ MEDIA_ROOT = BASE_DIR / 'media'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Segundos que se mantienen en caché las estadísticas del menú de partos
+PARTOS_ESTADISTICAS_CACHE_TTL = 60
+
+# Partos leídos por consulta al exportar a Excel (partosApp.exportacion)
+PARTOS_EXPORTACION_BLOQUE = 2000
+
+# Epicrisis de parto en PDF: carpeta de caché y hilos que las generan
+PARTOS_EPICRISIS_DIR = MEDIA_ROOT / 'epicrisis'
+PARTOS_EPICRISIS_WORKERS = 2
+
+# Segundos que se mantienen en caché los indicadores de calidad de partos
+PARTOS_ANALITICA_CACHE_TTL = 600
+
+# Segundos que se mantiene en caché el total del reporte de tratamientos TENS
+TENS_REPORTE_TOTAL_TTL = 300
+
+# Números que cada proceso reserva de una vez para PARTO-/FP-/FO-/ING-
+# (1 = numeración sin saltos; valores mayores evitan una consulta por inserción)
+SECUENCIAS_TAMANO_BLOQUE = 1
+
+# Perfil de SQL por request (obstetric_care.middleware)
+PERFIL_SQL_MUESTREO = 0.05          # fracción de requests con detalle de consultas
+PERFIL_SQL_UMBRAL_MS = 1000         # request lento
+PERFIL_SQL_UMBRAL_CONSULTAS = 100   # demasiadas consultas en un request
+PERFIL_SQL_REPETIDAS = 10           # misma consulta repetida (posible N+1)
+
+# Métricas (obstetric_care.metricas), expuestas en /metricas/.
+# Con varios workers (gunicorn) METRICAS_DIR debe ser un directorio local
+# compartido por los procesos; None: solo el proceso que atiende.
+METRICAS_DIR = None
+# Token que Prometheus envía en 'Authorization: Bearer ...'. Sin token
+# solo los usuarios staff pueden leer /metricas/.
+METRICAS_TOKEN = None
+
+# Logs: una línea JSON por request muestreado en consola y reporte
+# rotativo de vistas lentas en logs/vistas_lentas.log. La carpeta la crea
+# PerfilSQLMiddleware al iniciar (el handler abre el archivo con delay).
+LOGS_DIR = BASE_DIR / 'logs'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'consola': {
+            'class': 'logging.StreamHandler',
+        },
+        'vistas_lentas': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': LOGS_DIR / 'vistas_lentas.log',
+            'maxBytes': 5 * 1024 * 1024,
+            'backupCount': 5,
+            'encoding': 'utf-8',
+            'delay': True,
+        },
+    },
+    'loggers': {
+        'obstetric_care.sql': {
+            'handlers': ['consola'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'obstetric_care.vistas_lentas': {
+            'handlers': ['vistas_lentas'],
+            'level': 'WARNING',
+            'propagate': True,
+        },
+    },
+}
@@ -0,0 +1,24 @@
+"""
+Perfil de desarrollo: DEBUG y apps de depuración
+
+debug_toolbar y django_extensions se agregan solo si están instalados.
+"""
+from importlib.util import find_spec
+
+from .base import *  # noqa: F401,F403
+from .base import INSTALLED_APPS, MIDDLEWARE
+
+ENTORNO = 'dev'
+
+DEBUG = True
+
+ALLOWED_HOSTS = []
+
+# Barra de debug
+if find_spec('debug_toolbar'):
+    INSTALLED_APPS = INSTALLED_APPS + ['debug_toolbar']
+    MIDDLEWARE = MIDDLEWARE + ['debug_toolbar.middleware.DebugToolbarMiddleware']
+
+# Extensiones de Django (shell_plus, runserver_plus, ...)
+if find_spec('django_extensions'):
+    INSTALLED_APPS = INSTALLED_APPS + ['django_extensions']
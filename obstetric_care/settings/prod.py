@@ -0,0 +1,85 @@
+"""
+Perfil de producción (gunicorn)
+
+- Sin debug_toolbar ni django_extensions: ningún worker importa esas apps
+  ni ejecuta su middleware.
+- Plantillas compiladas una vez por proceso (cached.Loader).
+- Pool acotado de conexiones MySQL por worker, más pequeño para legacy.
+- Archivos estáticos con hash en el nombre (requiere collectstatic).
+- Métricas agregadas entre workers (METRICAS_DIR).
+
+SECRET_KEY, ALLOWED_HOSTS y el token de /metricas/ se leen del entorno.
+"""
+import os
+import tempfile
+from pathlib import Path
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401,F403
+from .base import DATABASES, TEMPLATES
+
+ENTORNO = 'prod'
+
+DEBUG = False
+
+try:
+    SECRET_KEY = os.environ['OBSTETRIC_CARE_SECRET_KEY']
+except KeyError:
+    raise ImproperlyConfigured('Falta la variable de entorno OBSTETRIC_CARE_SECRET_KEY')
+
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.environ.get('OBSTETRIC_CARE_ALLOWED_HOSTS', '').split(',')
+    if host.strip()
+]
+
+# Plantillas en caché (APP_DIRS no se puede combinar con 'loaders')
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'loaders': [
+            ('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ],
+    },
+}]
+
+# Pool de conexiones por worker (obstetric_care.db_backends.mysql). Las
+# conexiones se reutilizan entre requests a través del pool, por eso
+# CONN_MAX_AGE = 0. max_size debe cubrir los hilos de cada worker; legacy
+# tiene un pool menor y una espera corta para que un servidor lento no
+# deje a todos los hilos esperando conexión.
+POOLS = {
+    'default': {'max_size': 8, 'timeout': 10},
+    'legacy': {'max_size': 2, 'timeout': 2},
+}
+
+DATABASES = {
+    alias: {
+        **configuracion,
+        'CONN_MAX_AGE': 0,
+        'OPTIONS': {**configuracion['OPTIONS'], 'pool': POOLS[alias]},
+    }
+    for alias, configuracion in DATABASES.items()
+}
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage',
+    },
+}
+
+# Instantáneas de métricas de los workers (obstetric_care.metricas)
+METRICAS_DIR = Path(tempfile.gettempdir()) / 'obstetric_care_metricas'
+
+# Detrás de nginx todos los requests llegan desde 127.0.0.1, por lo que
+# /metricas/ se protege con token (o sesión staff), no por IP.
+METRICAS_TOKEN = os.environ.get('OBSTETRIC_CARE_METRICAS_TOKEN') or None
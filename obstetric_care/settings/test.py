@@ -0,0 +1,12 @@
+"""
+Perfil de la suite de tests (pytest.ini)
+"""
+from .base import *  # noqa: F401,F403
+
+ENTORNO = 'test'
+
+# Hash de contraseñas rápido: los tests crean usuarios
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# Sin detalle de consultas salvo en los tests del perfil de SQL
+PERFIL_SQL_MUESTREO = 0
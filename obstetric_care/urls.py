@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.urls import path, include
 from inicioApp import views as inicio_views
+from obstetric_care import views as obstetric_views
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -14,4 +15,7 @@ urlpatterns = [
     path('medico/', include('medicoApp.urls')),
     path('tens/', include('tensApp.urls')),
     path('partos/', include('partosApp.urls')), 
+
+    # Métricas para Prometheus (solo acceso local)
+    path('metricas/', obstetric_views.metricas, name='metricas'),
 ]
\ No newline at end of file
@@ -0,0 +1,28 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from obstetric_care.metricas import registro
+
+
+def _token_valido(request):
+    token = getattr(settings, 'METRICAS_TOKEN', None)
+    if not token:
+        return False
+    esquema, _, recibido = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+    return esquema.lower() == 'bearer' and hmac.compare_digest(recibido.strip(), token)
+
+
+def metricas(request):
+    """
+    Métricas en formato de texto de Prometheus.
+    Requiere 'Authorization: Bearer <METRICAS_TOKEN>' o un usuario staff;
+    REMOTE_ADDR no sirve detrás de un proxy (siempre es 127.0.0.1).
+    """
+    if not (_token_valido(request) or request.user.is_staff):
+        raise Http404
+    return HttpResponse(
+        registro.exponer(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
@@ -0,0 +1,245 @@
+"""
+Indicadores de calidad de partos y recién nacidos (NumPy)
+
+Para el comité de calidad: tasa de cesárea, distribución de Apgar, peso
+al nacer y duración del trabajo de parto, agrupados por mes, grupo de
+Robson o consultorio de origen.
+
+Las columnas necesarias se leen una vez con values_list y se pasan a
+arreglos NumPy; cada indicador se calcula vectorizado sobre todos los
+registros (np.unique + np.bincount para agrupar), sin instanciar modelos
+ni recorrer filas en Python. Los cortes son los mismos de los métodos de
+instancia: RegistroRecienNacido.clasificacion_peso / estado_apgar y
+RegistroParto.duracion_total_parto.
+"""
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+from partosApp.models import RegistroParto
+from recienNacidoApp.models import (
+    APGAR_MODERADO, APGAR_NORMAL, PESO_BAJO, PESO_MACROSOMICO, RegistroRecienNacido,
+)
+
+
+ANALITICA_CACHE_TTL = getattr(settings, 'PARTOS_ANALITICA_CACHE_TTL', 600)
+
+TIPOS_CESAREA = ['CESAREA_URGENCIA', 'CESAREA_ELECTIVA']
+
+# Columna por la que se agrupa en cada criterio
+AGRUPACIONES = {
+    'mes': 'mes',
+    'robson': 'robson',
+    'consultorio': 'consultorio',
+}
+
+PERCENTILES_PESO = [10, 50, 90]
+
+
+# ============================================
+# CARGA DE COLUMNAS
+# ============================================
+
+def _partos(desde, hasta, prefijo=''):
+    """Partos activos con admisión en el rango, vistos desde `prefijo`"""
+    return {
+        f'{prefijo}activo': True,
+        f'{prefijo}fecha_hora_admision__date__gte': desde,
+        f'{prefijo}fecha_hora_admision__date__lte': hasta,
+    }
+
+
+def _columnas(queryset, prefijo, campos):
+    """values_list de mes, Robson, consultorio y `campos`, como dict de columnas"""
+    filas = list(
+        queryset.order_by()
+        .annotate(
+            _anio=ExtractYear(f'{prefijo}fecha_hora_admision'),
+            _mes=ExtractMonth(f'{prefijo}fecha_hora_admision'),
+        )
+        .values_list(
+            '_anio', '_mes',
+            f'{prefijo}clasificacion_robson',
+            f'{prefijo}ficha__paciente__Consultorio',
+            *campos,
+        )
+    )
+    columnas = list(zip(*filas)) if filas else [()] * (4 + len(campos))
+    anio = np.array(columnas[0], dtype=np.int64)
+    mes = np.array(columnas[1], dtype=np.int64)
+    datos = {
+        'mes': anio * 100 + mes,
+        'robson': np.array([valor or '' for valor in columnas[2]], dtype=object),
+        'consultorio': np.array([valor or '' for valor in columnas[3]], dtype=object),
+    }
+    for nombre, columna in zip(campos, columnas[4:]):
+        datos[nombre] = np.array(columna)
+    return datos
+
+
+def cargar_partos(desde, hasta):
+    """Columnas de los partos activos con admisión entre `desde` y `hasta`"""
+    datos = _columnas(
+        RegistroParto.objects.filter(**_partos(desde, hasta)),
+        '',
+        ['tipo_parto', 'tiempo_dilatacion', 'tiempo_expulsivo'],
+    )
+    datos['cesarea'] = np.isin(datos.pop('tipo_parto'), TIPOS_CESAREA)
+
+    # Igual que duracion_total_parto: solo si ambos tiempos están registrados
+    dilatacion = np.array(datos.pop('tiempo_dilatacion'), dtype=float)
+    expulsivo = np.array(datos.pop('tiempo_expulsivo'), dtype=float)
+    registrada = (np.nan_to_num(dilatacion) > 0) & (np.nan_to_num(expulsivo) > 0)
+    datos['duracion'] = np.where(registrada, dilatacion + expulsivo, np.nan)
+    return datos
+
+
+def cargar_recien_nacidos(desde, hasta):
+    """Columnas de los RN de esos partos (agrupados por los datos del parto)"""
+    datos = _columnas(
+        RegistroRecienNacido.objects.filter(**_partos(desde, hasta, 'registro_parto__')),
+        'registro_parto__',
+        ['peso', 'apgar_1_minuto', 'apgar_5_minutos'],
+    )
+    for campo in ('peso', 'apgar_1_minuto', 'apgar_5_minutos'):
+        datos[campo] = np.array(datos[campo], dtype=float)
+    return datos
+
+
+# ============================================
+# INDICADORES VECTORIZADOS
+# ============================================
+
+def _redondear(valor, decimales=1):
+    return None if valor is None or np.isnan(valor) else round(float(valor), decimales)
+
+
+def _porcentaje(parte, total):
+    return round(100.0 * parte / total, 1) if total else None
+
+
+def resumen_cesarea(cesarea):
+    total = int(cesarea.size)
+    cesareas = int(np.count_nonzero(cesarea))
+    return {'partos': total, 'cesareas': cesareas, 'tasa_cesarea': _porcentaje(cesareas, total)}
+
+
+def resumen_duracion(duracion):
+    """Minutos de trabajo de parto (dilatación + expulsivo) de los partos con ambos tiempos"""
+    registradas = duracion[~np.isnan(duracion)]
+    if not registradas.size:
+        return {'registradas': 0, 'promedio': None, 'mediana': None, 'p90': None}
+    p50, p90 = np.percentile(registradas, [50, 90])
+    return {
+        'registradas': int(registradas.size),
+        'promedio': _redondear(registradas.mean()),
+        'mediana': _redondear(p50),
+        'p90': _redondear(p90),
+    }
+
+
+def resumen_apgar(apgar_1, apgar_5):
+    """Histograma 0-10 de Apgar y estados a los 5 minutos (cortes de estado_apgar)"""
+    validos_1 = apgar_1[~np.isnan(apgar_1)].astype(np.int64)
+    validos_5 = apgar_5[~np.isnan(apgar_5)].astype(np.int64)
+    return {
+        'histograma_1_minuto': np.bincount(np.clip(validos_1, 0, 10), minlength=11).tolist(),
+        'histograma_5_minutos': np.bincount(np.clip(validos_5, 0, 10), minlength=11).tolist(),
+        'normal': int(np.count_nonzero(validos_5 >= APGAR_NORMAL)),
+        'asfixia_moderada': int(np.count_nonzero((validos_5 >= APGAR_MODERADO) & (validos_5 < APGAR_NORMAL))),
+        'asfixia_severa': int(np.count_nonzero(validos_5 < APGAR_MODERADO)),
+    }
+
+
+def resumen_peso(peso):
+    """Clasificación OMS (cortes de clasificacion_peso) y percentiles del peso en gramos"""
+    validos = peso[~np.isnan(peso)]
+    total = int(validos.size)
+    bajo = int(np.count_nonzero(validos < PESO_BAJO))
+    macrosomico = int(np.count_nonzero(validos > PESO_MACROSOMICO))
+    percentiles = np.percentile(validos, PERCENTILES_PESO) if total else [None] * len(PERCENTILES_PESO)
+    return {
+        'recien_nacidos': total,
+        'bajo_peso': bajo,
+        'peso_normal': total - bajo - macrosomico,
+        'macrosomico': macrosomico,
+        'porcentaje_bajo_peso': _porcentaje(bajo, total),
+        **{f'p{p}': _redondear(valor, 0) for p, valor in zip(PERCENTILES_PESO, percentiles)},
+    }
+
+
+def _por_grupo(claves, *columnas):
+    """
+    Separa las columnas por el valor de `claves`.
+    Genera (clave, columnas del grupo) en orden de clave.
+    """
+    if not claves.size:
+        return
+    grupos, inverso = np.unique(claves, return_inverse=True)
+    orden = np.argsort(inverso, kind='stable')
+    cortes = np.cumsum(np.bincount(inverso, minlength=grupos.size))[:-1]
+    partes = [np.split(columna[orden], cortes) for columna in columnas]
+    for posicion, grupo in enumerate(grupos):
+        yield grupo, [parte[posicion] for parte in partes]
+
+
+def _clave_json(valor):
+    return int(valor) if isinstance(valor, np.integer) else valor
+
+
+def calcular_indicadores(desde, hasta, agrupar_por='mes'):
+    """
+    Indicadores del rango (inclusive) agrupados por 'mes' (AAAAMM),
+    'robson' o 'consultorio'. El resultado es serializable a JSON.
+    Lanza ValueError si el criterio de agrupación no existe.
+    """
+    if agrupar_por not in AGRUPACIONES:
+        raise ValueError(f"Agrupación desconocida: {agrupar_por}")
+    columna = AGRUPACIONES[agrupar_por]
+    partos = cargar_partos(desde, hasta)
+    rn = cargar_recien_nacidos(desde, hasta)
+
+    grupos = {}
+    for clave, (cesarea, duracion) in _por_grupo(partos[columna], partos['cesarea'], partos['duracion']):
+        grupos[_clave_json(clave)] = {
+            **resumen_cesarea(cesarea),
+            'duracion_parto': resumen_duracion(duracion),
+        }
+    vacio_partos = {**resumen_cesarea(np.array([], dtype=bool)), 'duracion_parto': resumen_duracion(np.array([]))}
+    for clave, (apgar_1, apgar_5, peso) in _por_grupo(
+        rn[columna], rn['apgar_1_minuto'], rn['apgar_5_minutos'], rn['peso']
+    ):
+        grupo = grupos.setdefault(_clave_json(clave), dict(vacio_partos))
+        grupo['apgar'] = resumen_apgar(apgar_1, apgar_5)
+        grupo['peso'] = resumen_peso(peso)
+
+    vacio_rn = np.array([], dtype=float)
+    for grupo in grupos.values():
+        grupo.setdefault('apgar', resumen_apgar(vacio_rn, vacio_rn))
+        grupo.setdefault('peso', resumen_peso(vacio_rn))
+
+    return {
+        'desde': desde.isoformat(),
+        'hasta': hasta.isoformat(),
+        'agrupado_por': agrupar_por,
+        'total': {
+            **resumen_cesarea(partos['cesarea']),
+            'duracion_parto': resumen_duracion(partos['duracion']),
+            'apgar': resumen_apgar(rn['apgar_1_minuto'], rn['apgar_5_minutos']),
+            'peso': resumen_peso(rn['peso']),
+        },
+        'grupos': [{'grupo': clave, **valores} for clave, valores in sorted(grupos.items())],
+    }
+
+
+def obtener_indicadores(desde, hasta, agrupar_por='mes', usar_cache=True):
+    """calcular_indicadores guardado en caché PARTOS_ANALITICA_CACHE_TTL segundos"""
+    clave = f"partos:indicadores:{desde.isoformat()}:{hasta.isoformat()}:{agrupar_por}"
+    if usar_cache:
+        indicadores = cache.get(clave)
+        if indicadores is not None:
+            return indicadores
+    indicadores = calcular_indicadores(desde, hasta, agrupar_por)
+    cache.set(clave, indicadores, ANALITICA_CACHE_TTL)
+    return indicadores
@@ -11,7 +11,7 @@ class PartosappConfig(AppConfig):
     
     def ready(self):
         """
-        Método que se ejecuta cuando la aplicación está lista
-        Aquí se pueden importar signals si es necesario
+        Conecta las señales que invalidan las estadísticas del menú
         """
-        pass
\ No newline at end of file
+        from partosApp.signals import conectar_senales
+        conectar_senales()
\ No newline at end of file
@@ -0,0 +1,178 @@
+"""
+Asistente de registro de parto por pasos (borrador en sesión)
+
+Los pasos 1 a 5 no escriben en RegistroParto: los datos enviados de cada
+paso, una vez validados, se guardan en la sesión del usuario (tabla de
+sesiones de Django, por lo que sobreviven a una recarga del navegador y
+el registro se puede retomar). Se guardan solo los valores del
+formulario del paso, tal como llegaron en el POST.
+
+En el último paso se vuelven a validar todos los formularios sobre una
+misma instancia y el parto se inserta con un único INSERT dentro de una
+transacción, que también reserva el número de registro. La revalidación
+sí consulta la base de datos: además de leer la ficha, el is_valid() de
+cada formulario ejecuta full_clean() y validate_unique() del modelo
+sobre la instancia compartida. Si se abandona el asistente no queda un
+parto a medias.
+"""
+from dataclasses import dataclass
+
+from django.db import transaction
+from django.http import QueryDict
+from django.utils import timezone
+
+from partosApp.forms import (
+    AnestesiaAnalgesiaForm,
+    InformacionPartoForm,
+    ProfesionalesForm,
+    PuerperioForm,
+    RegistroPartoBaseForm,
+    TrabajoDePartoForm,
+)
+from partosApp.models import RegistroParto
+
+
+CLAVE_SESION = 'borrador_parto'
+
+
+@dataclass
+class Paso:
+    numero: int
+    formulario: type
+    plantilla: str
+    mensaje: str
+
+
+PASOS = [
+    Paso(1, RegistroPartoBaseForm, 'Partos/Formularios/paso1_base.html', 'Información básica del parto guardada.'),
+    Paso(2, TrabajoDePartoForm, 'Partos/Formularios/paso2_trabajo.html', 'Información de trabajo de parto guardada.'),
+    Paso(3, InformacionPartoForm, 'Partos/Formularios/paso3_info.html', 'Información del parto guardada.'),
+    Paso(4, PuerperioForm, 'Partos/Formularios/paso4_puerperio.html', 'Información de puerperio guardada.'),
+    Paso(5, AnestesiaAnalgesiaForm, 'Partos/Formularios/paso5_anestesia.html', 'Información de anestesia guardada.'),
+    Paso(6, ProfesionalesForm, 'Partos/Formularios/paso6_profesionales.html', 'Registro de parto completado.'),
+]
+
+TOTAL_PASOS = len(PASOS)
+
+
+class PasoInvalido(Exception):
+    """Un paso guardado en el borrador ya no es válido (p. ej. la ficha se desactivó)"""
+    def __init__(self, numero, formulario):
+        super().__init__(f"El paso {numero} tiene errores")
+        self.numero = numero
+        self.formulario = formulario
+
+
+def obtener_paso(numero):
+    return PASOS[numero - 1]
+
+
+# ============================================
+# BORRADOR EN SESIÓN
+# ============================================
+
+class BorradorParto:
+    """
+    Borrador del asistente guardado en request.session:
+    {'ficha_id': 12, 'pasos': {'1': {campo: valor}, ...}, 'actualizado': iso}
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.datos = session.get(CLAVE_SESION) or {}
+
+    @property
+    def ficha_id(self):
+        return self.datos.get('ficha_id')
+
+    @property
+    def actualizado(self):
+        return self.datos.get('actualizado')
+
+    def iniciar(self, ficha_id):
+        """Comienza un borrador nuevo, salvo que ya exista uno de la misma ficha"""
+        if self.ficha_id != ficha_id:
+            self.datos = {'ficha_id': ficha_id, 'pasos': {}}
+            self._guardar()
+
+    def datos_paso(self, numero):
+        """Valores enviados en el paso como QueryDict, o None si el paso no está guardado"""
+        valores = self.datos.get('pasos', {}).get(str(numero))
+        if valores is None:
+            return None
+        data = QueryDict(mutable=True)
+        for campo, valor in valores.items():
+            data.setlist(campo, valor if isinstance(valor, list) else [valor])
+        return data
+
+    def guardar_paso(self, numero, formulario):
+        """Guarda los valores enviados de un formulario ya validado"""
+        valores = {}
+        for nombre in formulario.fields:
+            clave = formulario.add_prefix(nombre)
+            lista = formulario.data.getlist(clave)
+            if lista:
+                valores[clave] = lista if len(lista) > 1 else lista[0]
+        self.datos.setdefault('pasos', {})[str(numero)] = valores
+        if numero == 1:
+            self.datos['ficha_id'] = formulario.cleaned_data['ficha'].pk
+        self._guardar()
+
+    def valores_iniciales(self, numero):
+        """Valores guardados del paso para precargar el formulario al retomar"""
+        data = self.datos_paso(numero)
+        if data is None:
+            return {}
+        return {campo: lista if len(lista) > 1 else lista[0] for campo, lista in data.lists()}
+
+    def paso_pendiente(self):
+        """Primer paso sin guardar (TOTAL_PASOS + 1 si están todos)"""
+        pasos = self.datos.get('pasos', {})
+        for paso in PASOS:
+            if str(paso.numero) not in pasos:
+                return paso.numero
+        return TOTAL_PASOS + 1
+
+    def descartar(self):
+        self.datos = {}
+        self.session.pop(CLAVE_SESION, None)
+
+    def _guardar(self):
+        self.datos['actualizado'] = timezone.now().isoformat()
+        self.session[CLAVE_SESION] = self.datos
+        self.session.modified = True
+
+
+# ============================================
+# VALIDACIÓN Y GUARDADO FINAL
+# ============================================
+
+def construir_parto(borrador, hasta=TOTAL_PASOS, parto=None):
+    """
+    Valida los pasos 1..`hasta` del borrador sobre una misma instancia sin
+    guardar y la retorna. Lanza PasoInvalido con el primer paso con errores.
+    """
+    parto = parto or RegistroParto()
+    for paso in PASOS[:hasta]:
+        formulario = paso.formulario(borrador.datos_paso(paso.numero) or {}, instance=parto)
+        if not formulario.is_valid():
+            raise PasoInvalido(paso.numero, formulario)
+    return parto
+
+
+def finalizar(borrador, data):
+    """
+    Valida todo el borrador más los datos del último paso y crea el parto
+    con un único INSERT. Descarta el borrador y retorna el parto.
+    Lanza PasoInvalido si algún paso (incluido el último) tiene errores.
+    """
+    parto = construir_parto(borrador, hasta=TOTAL_PASOS - 1)
+    formulario = PASOS[-1].formulario(data, instance=parto)
+    if not formulario.is_valid():
+        raise PasoInvalido(TOTAL_PASOS, formulario)
+
+    with transaction.atomic():
+        # save() reserva el número de registro y luego inserta la fila
+        parto.save(force_insert=True)
+    borrador.descartar()
+    return parto
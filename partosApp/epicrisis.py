@@ -0,0 +1,291 @@
+"""
+Epicrisis de parto en PDF (reportlab)
+
+El PDF se genera en un pool de hilos fuera de la petición y se guarda en
+PARTOS_EPICRISIS_DIR con un nombre que incluye el id del parto y su
+versión (la última fecha_modificacion del parto, sus RN y documentos, y
+los datos de la paciente que se imprimen). Pedir de nuevo un documento
+sin cambios solo lee el archivo; al modificarse el parto o la paciente
+cambia la versión y se genera uno nuevo.
+
+Si la generación falla se deja un archivo .error junto al PDF de esa
+versión: las solicitudes siguientes responden 'error' sin volver a
+encolar el trabajo, hasta que el parto cambie de versión.
+
+Los archivos se escriben primero con un nombre temporal y luego se
+renombran, así ningún proceso ve un PDF a medio escribir.
+"""
+import glob
+import logging
+import os
+import tempfile
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from partosApp.models import RegistroParto
+from recienNacidoApp.models import DocumentosParto, RegistroRecienNacido
+
+
+EPICRISIS_DIR = str(getattr(settings, 'PARTOS_EPICRISIS_DIR', os.path.join(settings.MEDIA_ROOT, 'epicrisis')))
+EPICRISIS_WORKERS = getattr(settings, 'PARTOS_EPICRISIS_WORKERS', 2)
+
+logger = logging.getLogger(__name__)
+
+_ejecutor = None
+_en_curso = {}
+_lock = threading.Lock()
+
+# Datos de la paciente que imprime el PDF (no tienen fecha de modificación)
+CAMPOS_PACIENTE = (
+    'ficha__numero_ficha',
+    'ficha__paciente__persona__Rut',
+    'ficha__paciente__persona__Nombre',
+    'ficha__paciente__persona__Apellido_Paterno',
+    'ficha__paciente__persona__Apellido_Materno',
+    'ficha__paciente__persona__Fecha_nacimiento',
+)
+
+
+def _obtener_ejecutor():
+    global _ejecutor
+    with _lock:
+        if _ejecutor is None:
+            _ejecutor = ThreadPoolExecutor(
+                max_workers=EPICRISIS_WORKERS,
+                thread_name_prefix='epicrisis',
+            )
+    return _ejecutor
+
+
+# ============================================
+# VERSIÓN Y RUTA EN DISCO
+# ============================================
+
+def version_epicrisis(parto_id):
+    """
+    Marca de versión del documento: la modificación más reciente del
+    parto, de sus RN y de sus documentos, la cantidad de RN y un CRC de
+    los datos de la paciente (Persona y Paciente no registran cuándo se
+    modificaron). Retorna None si el parto no existe.
+    """
+    parto = RegistroParto.objects.filter(pk=parto_id).values(
+        'fecha_modificacion', *CAMPOS_PACIENTE,
+    ).first()
+    if parto is None:
+        return None
+    rn = RegistroRecienNacido.objects.filter(registro_parto_id=parto_id).aggregate(
+        total=Count('id'), ultima=Max('fecha_modificacion'),
+    )
+    docs = DocumentosParto.objects.filter(
+        registro_recien_nacido__registro_parto_id=parto_id
+    ).aggregate(ultima=Max('fecha_modificacion'))
+
+    fechas = [f for f in (parto['fecha_modificacion'], rn['ultima'], docs['ultima']) if f]
+    ultima = max(fechas)
+    paciente = zlib.crc32('|'.join(str(parto[campo]) for campo in CAMPOS_PACIENTE).encode())
+    return f"{int(ultima.timestamp() * 1_000_000):x}-{rn['total']}-{paciente:x}"
+
+
+def ruta_epicrisis(parto_id, version):
+    return os.path.join(EPICRISIS_DIR, f"parto_{parto_id}_{version}.pdf")
+
+
+def ruta_error(ruta):
+    """Marca de generación fallida de la versión cuyo PDF es `ruta`"""
+    return f"{os.path.splitext(ruta)[0]}.error"
+
+
+def _eliminar_versiones_anteriores(parto_id, vigente):
+    for ruta in glob.glob(os.path.join(EPICRISIS_DIR, f"parto_{parto_id}_*.*")):
+        if ruta != vigente:
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+
+
+# ============================================
+# GENERACIÓN DEL PDF
+# ============================================
+
+def _si_no(valor):
+    return 'Sí' if valor else 'No'
+
+
+def _fecha(valor):
+    if not valor:
+        return '-'
+    if timezone.is_aware(valor):
+        valor = timezone.localtime(valor)
+    return valor.strftime('%d/%m/%Y %H:%M')
+
+
+def _tabla(filas, anchos):
+    from reportlab.lib import colors
+    from reportlab.platypus import Table, TableStyle
+
+    tabla = Table(filas, colWidths=anchos)
+    tabla.setStyle(TableStyle([
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#EEF2F7')),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ]))
+    return tabla
+
+
+def escribir_pdf(parto, destino):
+    """Escribe la epicrisis del parto (con RN y documentos ya cargados) en `destino`"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import cm
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+    estilos = getSampleStyleSheet()
+    persona = parto.ficha.paciente.persona
+    contenido = [
+        Paragraph('Epicrisis de Parto', estilos['Title']),
+        Paragraph(f"Registro {parto.numero_registro} — Ficha {parto.ficha.numero_ficha}", estilos['Normal']),
+        Spacer(1, 0.4 * cm),
+        Paragraph('Paciente', estilos['Heading2']),
+        _tabla([
+            ['RUT', persona.Rut],
+            ['Nombre', f"{persona.Nombre} {persona.Apellido_Paterno} {persona.Apellido_Materno}"],
+            ['Fecha de nacimiento', persona.Fecha_nacimiento.strftime('%d/%m/%Y')],
+        ], [5 * cm, 12 * cm]),
+        Paragraph('Parto', estilos['Heading2']),
+        _tabla([
+            ['Admisión', _fecha(parto.fecha_hora_admision)],
+            ['Parto', _fecha(parto.fecha_hora_parto)],
+            ['Tipo de parto', parto.get_tipo_parto_display()],
+            ['Clasificación Robson', parto.get_clasificacion_robson_display() or '-'],
+            ['Edad gestacional', f"{parto.edad_gestacional_semanas or '-'} + {parto.edad_gestacional_dias or 0} días"],
+            ['Estado periné', parto.get_estado_perine_display() or '-'],
+            ['Analgesia', parto.tipo_analgesia_utilizada()],
+            ['Complicaciones', _si_no(parto.tiene_complicaciones())],
+            ['Profesional responsable', parto.profesional_responsable or '-'],
+            ['Observaciones', Paragraph(escape(parto.observaciones or '-'), estilos['Normal'])],
+        ], [5 * cm, 12 * cm]),
+    ]
+
+    for numero, rn in enumerate(parto.recien_nacidos.all(), start=1):
+        try:
+            documentos = rn.documentos.resumen_documentos()
+        except DocumentosParto.DoesNotExist:
+            documentos = 'Sin documentación registrada'
+        contenido += [
+            Paragraph(f'Recién Nacido {numero}', estilos['Heading2']),
+            _tabla([
+                ['Nacimiento', _fecha(rn.fecha_nacimiento)],
+                ['Sexo', rn.get_sexo_display()],
+                ['Peso / Talla', f"{rn.peso} g / {rn.talla} cm"],
+                ['Apgar 1\' / 5\'', f"{rn.apgar_1_minuto} / {rn.apgar_5_minutos}"],
+                ['Apego canguro', _si_no(rn.apego_canguro)],
+                ['Documentos', Paragraph(escape(documentos), estilos['Normal'])],
+            ], [5 * cm, 12 * cm]),
+        ]
+
+    contenido += [
+        Spacer(1, 0.6 * cm),
+        Paragraph(f"Generado el {_fecha(timezone.now())}", estilos['Italic']),
+    ]
+
+    SimpleDocTemplate(
+        destino,
+        pagesize=letter,
+        title=f'Epicrisis {parto.numero_registro}',
+        leftMargin=2 * cm, rightMargin=2 * cm, topMargin=1.5 * cm, bottomMargin=1.5 * cm,
+    ).build(contenido)
+
+
+def generar_epicrisis(parto_id, version):
+    """
+    Genera el PDF de la versión indicada. Retorna la ruta del archivo.
+    No maneja conexiones: se puede llamar de forma síncrona (comando,
+    tests) sin cerrar la conexión del llamador.
+    """
+    ruta = ruta_epicrisis(parto_id, version)
+    try:
+        parto = RegistroParto.objects.select_related(
+            'ficha__paciente__persona',
+        ).prefetch_related(
+            'recien_nacidos__documentos',
+        ).get(pk=parto_id)
+
+        os.makedirs(EPICRISIS_DIR, exist_ok=True)
+        fd, temporal = tempfile.mkstemp(dir=EPICRISIS_DIR, suffix='.tmp')
+        os.close(fd)
+        try:
+            escribir_pdf(parto, temporal)
+            os.replace(temporal, ruta)
+        finally:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+
+        _eliminar_versiones_anteriores(parto_id, ruta)
+        return ruta
+    except Exception as error:
+        logger.exception("Error generando la epicrisis del parto %s", parto_id)
+        _marcar_error(ruta, error)
+        raise
+    finally:
+        with _lock:
+            _en_curso.pop(ruta, None)
+
+
+def _marcar_error(ruta, error):
+    try:
+        os.makedirs(EPICRISIS_DIR, exist_ok=True)
+        with open(ruta_error(ruta), 'w', encoding='utf-8') as marca:
+            marca.write(f"{type(error).__name__}: {error}")
+    except OSError:
+        logger.exception("No se pudo registrar el error de %s", ruta)
+
+
+def _generar_en_segundo_plano(parto_id, version):
+    """Tarea del pool: genera la epicrisis y libera la conexión del hilo"""
+    try:
+        return generar_epicrisis(parto_id, version)
+    finally:
+        # El hilo del pool no pasa por el ciclo de request de Django
+        close_old_connections()
+
+
+# ============================================
+# API PARA LAS VISTAS
+# ============================================
+
+def solicitar_epicrisis(parto_id):
+    """
+    Retorna (estado, ruta):
+    - ('lista', ruta) si el PDF de la versión actual ya está en disco
+    - ('generando', None) si se encoló o ya se estaba generando
+    - ('error', None) si la generación de la versión actual falló
+    - ('no_existe', None) si el parto no existe
+    """
+    version = version_epicrisis(parto_id)
+    if version is None:
+        return 'no_existe', None
+
+    ruta = ruta_epicrisis(parto_id, version)
+    if os.path.exists(ruta):
+        return 'lista', ruta
+    if os.path.exists(ruta_error(ruta)):
+        return 'error', None
+
+    with _lock:
+        if ruta not in _en_curso:
+            _en_curso[ruta] = True
+            encolar = True
+        else:
+            encolar = False
+    if encolar:
+        _obtener_ejecutor().submit(_generar_en_segundo_plano, parto_id, version)
+    return 'generando', None
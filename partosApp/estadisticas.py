@@ -0,0 +1,77 @@
+"""
+Servicio de estadísticas del módulo de Partos
+
+Calcula todos los contadores del menú de partos con una sola pasada de
+agregación condicional por tabla y los guarda en caché por fecha.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from partosApp.models import RegistroParto
+from recienNacidoApp.models import RegistroRecienNacido
+
+
+# Segundos que se mantienen en caché las estadísticas del menú
+ESTADISTICAS_CACHE_TTL = getattr(settings, 'PARTOS_ESTADISTICAS_CACHE_TTL', 60)
+
+TIPOS_CESAREA = ['CESAREA_URGENCIA', 'CESAREA_ELECTIVA']
+
+
+def _clave_cache(fecha):
+    return f"partos:estadisticas_menu:{fecha.isoformat()}"
+
+
+def calcular_estadisticas_menu(fecha):
+    """
+    Calcula los contadores del menú de partos para la fecha indicada.
+    Ejecuta una consulta para RegistroParto y otra para RegistroRecienNacido.
+    """
+    activo = Q(activo=True)
+
+    partos = RegistroParto.objects.aggregate(
+        total_partos=Count('id', filter=activo),
+        partos_hoy=Count('id', filter=activo & Q(fecha_hora_admision__date=fecha)),
+        partos_mes=Count('id', filter=activo & Q(
+            fecha_hora_admision__year=fecha.year,
+            fecha_hora_admision__month=fecha.month,
+        )),
+        partos_eutocicos=Count('id', filter=activo & Q(tipo_parto='EUTOCICO')),
+        cesareas=Count('id', filter=activo & Q(tipo_parto__in=TIPOS_CESAREA)),
+    )
+
+    recien_nacidos = RegistroRecienNacido.objects.aggregate(
+        total_rn=Count('id'),
+        rn_hoy=Count('id', filter=Q(fecha_nacimiento__date=fecha)),
+    )
+
+    return {**partos, **recien_nacidos}
+
+
+def obtener_estadisticas_menu(fecha=None, usar_cache=True):
+    """
+    Retorna los contadores del menú de partos.
+
+    Los resultados se guardan en caché por fecha durante
+    PARTOS_ESTADISTICAS_CACHE_TTL segundos (60 por defecto).
+    """
+    if fecha is None:
+        fecha = timezone.now().date()
+
+    if not usar_cache:
+        return calcular_estadisticas_menu(fecha)
+
+    clave = _clave_cache(fecha)
+    estadisticas = cache.get(clave)
+    if estadisticas is None:
+        estadisticas = calcular_estadisticas_menu(fecha)
+        cache.set(clave, estadisticas, ESTADISTICAS_CACHE_TTL)
+    return estadisticas
+
+
+def invalidar_estadisticas_menu(fecha=None):
+    """Elimina de la caché las estadísticas de la fecha indicada (hoy por defecto)"""
+    if fecha is None:
+        fecha = timezone.now().date()
+    cache.delete(_clave_cache(fecha))
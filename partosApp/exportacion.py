@@ -0,0 +1,162 @@
+"""
+Exportación de partos a Excel (XLSX)
+
+Escribe una fila por recién nacido (o una fila con columnas de RN vacías
+si el parto aún no tiene RN) con los datos de la paciente, del parto, del
+RN y de sus documentos.
+
+- xlsxwriter en modo constant_memory: cada fila se escribe a disco al
+  completarse, la planilla nunca está entera en memoria.
+- Los partos se recorren en bloques por id (WHERE id > x ORDER BY id
+  LIMIT n) y cada bloque se lee con .values().iterator(): no se crean
+  instancias de modelos. Los bloques acotan la memoria también con el
+  conector MySQL, que recibe el resultado completo de cada consulta.
+"""
+import tempfile
+
+import xlsxwriter
+from django.conf import settings
+from django.utils import timezone
+
+from partosApp.models import RegistroParto
+
+
+TAMANO_BLOQUE = getattr(settings, 'PARTOS_EXPORTACION_BLOQUE', 2000)
+
+_RN = 'recien_nacidos__'
+_DOC = 'recien_nacidos__documentos__'
+
+# (encabezado, campo en .values(), formato)
+COLUMNAS = [
+    ('N° Registro', 'numero_registro', None),
+    ('N° Ficha', 'ficha__numero_ficha', None),
+    ('RUT Paciente', 'ficha__paciente__persona__Rut', None),
+    ('Nombre', 'ficha__paciente__persona__Nombre', None),
+    ('Apellido Paterno', 'ficha__paciente__persona__Apellido_Paterno', None),
+    ('Apellido Materno', 'ficha__paciente__persona__Apellido_Materno', None),
+    ('Previsión', 'ficha__paciente__Previcion', None),
+    ('Fecha Admisión', 'fecha_hora_admision', 'fecha_hora'),
+    ('Fecha Parto', 'fecha_hora_parto', 'fecha_hora'),
+    ('Tipo de Parto', 'tipo_parto', 'tipo_parto'),
+    ('Robson', 'clasificacion_robson', None),
+    ('EG Semanas', 'edad_gestacional_semanas', None),
+    ('EG Días', 'edad_gestacional_dias', None),
+    ('Posición Materna', 'posicion_materna_parto', None),
+    ('Estado Periné', 'estado_perine', None),
+    ('Inducción', 'induccion', 'si_no'),
+    ('Anestesia Neuroaxial', 'anestesia_neuroaxial', 'si_no'),
+    ('Transfusión', 'transfusion_sanguinea', 'si_no'),
+    ('Histerectomía', 'histerectomia_obstetrica', 'si_no'),
+    ('Profesional Responsable', 'profesional_responsable', None),
+    ('RN Sexo', f'{_RN}sexo', None),
+    ('RN Peso (g)', f'{_RN}peso', None),
+    ('RN Talla (cm)', f'{_RN}talla', None),
+    ('RN Apgar 1', f'{_RN}apgar_1_minuto', None),
+    ('RN Apgar 5', f'{_RN}apgar_5_minutos', None),
+    ('RN Fecha Nacimiento', f'{_RN}fecha_nacimiento', 'fecha_hora'),
+    ('RN Apego Canguro', f'{_RN}apego_canguro', 'si_no'),
+    ('Folio Válido', f'{_DOC}folio_valido', None),
+    ('Folios Nulos', f'{_DOC}folios_nulos', None),
+    ('Retira Placenta', f'{_DOC}retira_placenta', 'si_no'),
+]
+
+TIPOS_PARTO = dict(RegistroParto.TIPO_PARTO_CHOICES)
+
+
+def filtrar_partos(fecha_desde=None, fecha_hasta=None, tipo_parto=None):
+    """Partos activos a exportar (fechas sobre fecha_hora_admision, inclusive)"""
+    partos = RegistroParto.objects.filter(activo=True)
+    if fecha_desde:
+        partos = partos.filter(fecha_hora_admision__date__gte=fecha_desde)
+    if fecha_hasta:
+        partos = partos.filter(fecha_hora_admision__date__lte=fecha_hasta)
+    if tipo_parto:
+        partos = partos.filter(tipo_parto=tipo_parto)
+    return partos
+
+
+def iterar_filas(partos, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Genera una tupla de valores por fila, en orden de id de parto.
+    Cada bloque de partos se lee en una sola consulta con LEFT JOIN a RN
+    y documentos.
+    """
+    campos = [campo for _titulo, campo, _formato in COLUMNAS]
+    ultimo_id = 0
+
+    while True:
+        ids = list(
+            partos.filter(id__gt=ultimo_id)
+            .order_by('id')
+            .values_list('id', flat=True)[:tamano_bloque]
+        )
+        if not ids:
+            return
+        ultimo_id = ids[-1]
+
+        filas = (
+            RegistroParto.objects
+            .filter(id__in=ids)
+            .order_by('id', f'{_RN}id')
+            .values_list(*campos)
+            .iterator(chunk_size=tamano_bloque)
+        )
+        yield from filas
+
+
+def _formatear(valor, formato):
+    if valor is None:
+        return None
+    if formato == 'fecha_hora':
+        # Excel no guarda zona horaria: se escribe la hora local
+        return timezone.localtime(valor).replace(tzinfo=None) if timezone.is_aware(valor) else valor
+    if formato == 'si_no':
+        return 'Sí' if valor else 'No'
+    if formato == 'tipo_parto':
+        return TIPOS_PARTO.get(valor, valor)
+    return valor
+
+
+def escribir_xlsx(destino, partos, tamano_bloque=TAMANO_BLOQUE, progreso=None):
+    """
+    Escribe la planilla en `destino` (ruta o archivo abierto en modo binario).
+    Retorna la cantidad de filas escritas.
+    """
+    libro = xlsxwriter.Workbook(destino, {'constant_memory': True})
+    hoja = libro.add_worksheet('Partos')
+    negrita = libro.add_format({'bold': True, 'bg_color': '#D9E1F2', 'border': 1})
+    formato_fecha = libro.add_format({'num_format': 'dd/mm/yyyy hh:mm'})
+
+    formatos_columna = [formato for _titulo, _campo, formato in COLUMNAS]
+    for columna, (titulo, _campo, formato) in enumerate(COLUMNAS):
+        hoja.set_column(columna, columna, 20 if formato == 'fecha_hora' else 16)
+    hoja.write_row(0, 0, [titulo for titulo, _campo, _formato in COLUMNAS], negrita)
+    hoja.freeze_panes(1, 0)
+
+    fila_numero = 0
+    for fila in iterar_filas(partos, tamano_bloque):
+        fila_numero += 1
+        for columna, (valor, formato) in enumerate(zip(fila, formatos_columna)):
+            valor = _formatear(valor, formato)
+            if valor is None:
+                continue
+            if formato == 'fecha_hora':
+                hoja.write_datetime(fila_numero, columna, valor, formato_fecha)
+            else:
+                hoja.write(fila_numero, columna, valor)
+        if progreso and fila_numero % tamano_bloque == 0:
+            progreso(fila_numero)
+
+    libro.close()
+    return fila_numero
+
+
+def exportar_a_archivo_temporal(partos, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Escribe la planilla en un archivo temporal y lo retorna abierto al
+    inicio, listo para enviarse con FileResponse (se borra al cerrarse).
+    """
+    archivo = tempfile.TemporaryFile()
+    escribir_xlsx(archivo, partos, tamano_bloque)
+    archivo.seek(0)
+    return archivo
@@ -0,0 +1,25 @@
+# ============================================
+# UBICACIÓN: partosApp/management/commands/actualizar_resumen_partos.py
+# ============================================
+
+from django.core.management.base import BaseCommand
+from partosApp.resumen import actualizar_resumen
+
+
+class Command(BaseCommand):
+    help = 'Actualiza el resumen diario de partos (REM) con los días modificados desde la última ejecución'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--completo',
+            action='store_true',
+            help='Reconstruye el resumen de todos los días'
+        )
+
+    def handle(self, *args, **options):
+        modo = 'completo' if options['completo'] else 'incremental'
+        self.stdout.write(self.style.WARNING(f'\n📊 Actualizando resumen diario de partos ({modo})...'))
+
+        dias, filas = actualizar_resumen(completo=options['completo'])
+
+        self.stdout.write(self.style.SUCCESS(f'\n✅ COMPLETADO: {dias} días recalculados, {filas} filas de resumen'))
@@ -0,0 +1,43 @@
+# ============================================
+# UBICACIÓN: partosApp/management/commands/exportar_partos.py
+# ============================================
+
+from django.core.management.base import BaseCommand, CommandError
+from partosApp.exportacion import TAMANO_BLOQUE, escribir_xlsx, filtrar_partos
+from utilidad.fechas import FechaInvalida, leer_fecha
+
+
+class Command(BaseCommand):
+    help = 'Exporta los partos a un archivo Excel (una fila por recién nacido)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help='Ruta del archivo .xlsx a generar')
+        parser.add_argument('--desde', help='Fecha de admisión inicial (AAAA-MM-DD)')
+        parser.add_argument('--hasta', help='Fecha de admisión final (AAAA-MM-DD)')
+        parser.add_argument('--tipo-parto', help='Solo este tipo de parto (EUTOCICO, CESAREA_URGENCIA, ...)')
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=TAMANO_BLOQUE,
+            help=f'Partos leídos por consulta (por defecto {TAMANO_BLOQUE})'
+        )
+
+    def handle(self, *args, **options):
+        fechas = {}
+        for opcion in ('desde', 'hasta'):
+            try:
+                fechas[opcion] = leer_fecha(options.get(opcion))
+            except FechaInvalida:
+                raise CommandError(f"Fecha inválida en --{opcion}: {options[opcion]}")
+
+        partos = filtrar_partos(fechas['desde'], fechas['hasta'], options.get('tipo_parto'))
+
+        self.stdout.write(self.style.WARNING(f"\n📋 Exportando partos a {options['archivo']}..."))
+        filas = escribir_xlsx(
+            options['archivo'],
+            partos,
+            tamano_bloque=options['lote'],
+            progreso=lambda n: self.stdout.write(f'   {n} filas escritas'),
+        )
+
+        self.stdout.write(self.style.SUCCESS(f'\n✅ COMPLETADO: {filas} filas exportadas'))
@@ -0,0 +1,49 @@
+# ============================================
+# UBICACIÓN: partosApp/management/commands/generar_epicrisis.py
+# ============================================
+
+import os
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from partosApp.epicrisis import generar_epicrisis, ruta_epicrisis, version_epicrisis
+from partosApp.models import RegistroParto
+
+
+class Command(BaseCommand):
+    help = 'Genera por adelantado las epicrisis en PDF (p. ej. antes del cambio de turno)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('ids', nargs='*', type=int, help='Ids de partos (por defecto, los modificados recientemente)')
+        parser.add_argument(
+            '--horas',
+            type=int,
+            default=12,
+            help='Partos modificados en las últimas N horas (por defecto 12)'
+        )
+
+    def handle(self, *args, **options):
+        if options['ids']:
+            ids = options['ids']
+        else:
+            desde = timezone.now() - timedelta(hours=options['horas'])
+            ids = list(
+                RegistroParto.objects.filter(activo=True, fecha_modificacion__gte=desde)
+                .values_list('pk', flat=True)
+            )
+
+        self.stdout.write(self.style.WARNING(f'\n📋 Revisando {len(ids)} epicrisis...'))
+        generadas = al_dia = 0
+        for parto_id in ids:
+            version = version_epicrisis(parto_id)
+            if version is None:
+                self.stdout.write(self.style.WARNING(f'  ⚠️  Parto {parto_id} no existe'))
+                continue
+            if os.path.exists(ruta_epicrisis(parto_id, version)):
+                al_dia += 1
+                continue
+            generar_epicrisis(parto_id, version)
+            generadas += 1
+
+        self.stdout.write(self.style.SUCCESS(f'\n✅ COMPLETADO: {generadas} epicrisis generadas, {al_dia} ya estaban al día'))
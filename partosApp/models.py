@@ -1,9 +1,36 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
+from gestionApp.secuencias import generar_numero
+from utilidad.cambios import SeguimientoCambiosMixin
+from utilidad.expresiones import alguno_verdadero, como_booleano
 
 
-class RegistroParto(models.Model):
+COMPLICACIONES = [
+    'inercia_uterina',
+    'restos_placentarios',
+    'trauma',
+    'alteracion_coagulacion',
+    'histerectomia_obstetrica',
+    'transfusion_sanguinea',
+]
+
+
+class RegistroPartoQuerySet(models.QuerySet):
+    """Banderas clínicas de RegistroParto calculadas en la base de datos"""
+
+    def with_flags(self):
+        """Anota tiene_complicaciones_db"""
+        return self.annotate(
+            tiene_complicaciones_db=como_booleano(alguno_verdadero(COMPLICACIONES)),
+        )
+
+    def con_complicaciones(self):
+        """Partos con alguna complicación (ver tiene_complicaciones)"""
+        return self.filter(alguno_verdadero(COMPLICACIONES))
+
+
+class RegistroParto(SeguimientoCambiosMixin, models.Model):
 
     # ============================================
     # RELACIONES
@@ -450,6 +477,8 @@ class RegistroParto(models.Model):
         verbose_name='Registro Activo'
     )
     
+    objects = RegistroPartoQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-fecha_hora_admision']
         verbose_name = 'Registro de Parto'
@@ -458,6 +487,7 @@ class RegistroParto(models.Model):
             models.Index(fields=['numero_registro']),
             models.Index(fields=['ficha', '-fecha_hora_admision']),
             models.Index(fields=['-fecha_hora_parto']),
+            models.Index(fields=['fecha_modificacion']),
         ]
     
     def __str__(self):
@@ -466,16 +496,28 @@ class RegistroParto(models.Model):
     def save(self, *args, **kwargs):
         """Generar número automático si no existe"""
         if not self.numero_registro:
-            ultimo = RegistroParto.objects.order_by('-id').first()
-            if ultimo:
-                try:
-                    numero = int(ultimo.numero_registro.split('-')[1]) + 1
-                except (IndexError, ValueError):
-                    numero = 1
-            else:
-                numero = 1
-            self.numero_registro = f"PARTO-{numero:06d}"
+            self.numero_registro = generar_numero('registro_parto')
+        anterior = self._admision_anterior(kwargs.get('update_fields'))
         super().save(*args, **kwargs)
+        if anterior is not None:
+            # El día que el parto deja debe recalcularse en el resumen REM
+            DiaPendienteResumenPartos.marcar(anterior)
+    
+    def delete(self, *args, **kwargs):
+        resultado = super().delete(*args, **kwargs)
+        DiaPendienteResumenPartos.marcar(self.fecha_hora_admision)
+        return resultado
+    
+    def _admision_anterior(self, update_fields):
+        """fecha_hora_admision con que se cargó el parto, si este guardado la cambia"""
+        if self._state.adding:
+            return None
+        if update_fields is not None and 'fecha_hora_admision' not in update_fields:
+            return None
+        anterior = getattr(self, '_valores_originales', {}).get('fecha_hora_admision')
+        if anterior is None or anterior == self.fecha_hora_admision:
+            return None
+        return anterior
     
     def duracion_total_parto(self):
         """Calcula duración total del parto en minutos"""
@@ -485,14 +527,7 @@ class RegistroParto(models.Model):
     
     def tiene_complicaciones(self):
         """Verifica si hubo complicaciones"""
-        return (
-            self.inercia_uterina or
-            self.restos_placentarios or
-            self.trauma or
-            self.alteracion_coagulacion or
-            self.histerectomia_obstetrica or
-            self.transfusion_sanguinea
-        )
+        return any(getattr(self, campo) for campo in COMPLICACIONES)
     
     def tipo_analgesia_utilizada(self):
         """Retorna lista de tipos de analgesia utilizados"""
@@ -511,4 +546,79 @@ class RegistroParto(models.Model):
         if self.analgesia_no_farmacologica:
             analgesias.append('No Farmacológica')
         
-        return ', '.join(analgesias) if analgesias else 'Sin analgesia registrada'
\ No newline at end of file
+        return ', '.join(analgesias) if analgesias else 'Sin analgesia registrada'
+
+# ============================================
+# RESUMEN DIARIO DE PARTOS (REM)
+# ============================================
+
+class ResumenDiarioPartos(models.Model):
+    """
+    Cantidad de partos activos por día de admisión y combinación de tipo
+    de parto, Robson, estado del periné y analgesias.
+    Se recalcula por días en partosApp.resumen; las estadísticas de
+    cualquier rango suman estas filas en vez de recorrer RegistroParto.
+    """
+    fecha = models.DateField(verbose_name='Fecha de Admisión')
+    tipo_parto = models.CharField(max_length=20, verbose_name='Tipo de Parto')
+    clasificacion_robson = models.CharField(max_length=30, verbose_name='Clasificación de Robson')
+    estado_perine = models.CharField(max_length=20, verbose_name='Estado del Periné')
+    anestesia_neuroaxial = models.BooleanField(default=False)
+    oxido_nitroso = models.BooleanField(default=False)
+    analgesia_endovenosa = models.BooleanField(default=False)
+    anestesia_general = models.BooleanField(default=False)
+    anestesia_local = models.BooleanField(default=False)
+    analgesia_no_farmacologica = models.BooleanField(default=False)
+    total = models.PositiveIntegerField(default=0, verbose_name='Partos')
+
+    class Meta:
+        verbose_name = 'Resumen Diario de Partos'
+        verbose_name_plural = 'Resúmenes Diarios de Partos'
+        db_table = 'resumen_diario_partos'
+        indexes = [
+            models.Index(fields=['fecha', 'tipo_parto'], name='resumen_partos_fecha_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.fecha} {self.tipo_parto} {self.clasificacion_robson}: {self.total}"
+
+
+class MarcaResumenPartos(models.Model):
+    """
+    Hasta qué fecha_modificacion de RegistroParto está al día el resumen
+    diario. La siguiente actualización solo recalcula los días de los
+    partos modificados después de esta marca.
+    """
+    nombre = models.CharField(max_length=50, unique=True, verbose_name='Nombre')
+    procesado_hasta = models.DateTimeField(null=True, blank=True, verbose_name='Procesado Hasta')
+
+    class Meta:
+        verbose_name = 'Marca del Resumen de Partos'
+        verbose_name_plural = 'Marcas del Resumen de Partos'
+
+    def __str__(self):
+        return f"{self.nombre}: {self.procesado_hasta}"
+
+
+class DiaPendienteResumenPartos(models.Model):
+    """
+    Días que perdieron un parto sin que este quede con esa fecha de
+    admisión (cambio de fecha o borrado físico). La marca de
+    fecha_modificacion no los encuentra; la siguiente actualización del
+    resumen los recalcula y los elimina.
+    """
+    fecha = models.DateField(unique=True, verbose_name='Fecha de Admisión')
+
+    class Meta:
+        verbose_name = 'Día Pendiente del Resumen de Partos'
+        verbose_name_plural = 'Días Pendientes del Resumen de Partos'
+
+    def __str__(self):
+        return str(self.fecha)
+
+    @classmethod
+    def marcar(cls, fecha_hora):
+        """Registra el día (local) de `fecha_hora`; ignora los ya registrados"""
+        if timezone.is_aware(fecha_hora):
+            fecha_hora = timezone.localtime(fecha_hora)
+        cls.objects.bulk_create([cls(fecha=fecha_hora.date())], ignore_conflicts=True)
@@ -0,0 +1,181 @@
+"""
+Resumen diario de partos para el REM (tablas de agregación)
+
+ResumenDiarioPartos guarda, por día de admisión, cuántos partos activos
+hay de cada combinación de tipo de parto, Robson, estado del periné y
+analgesias. Las estadísticas de un mes, trimestre o año suman esas filas
+(unas decenas por día) en vez de agrupar RegistroParto en cada petición.
+
+Actualización incremental: MarcaResumenPartos recuerda la última
+fecha_modificacion procesada; cada actualización busca los partos
+modificados desde entonces, toma sus días de admisión y recalcula solo
+esos días (borrar e insertar en una transacción). La actualización la
+hace solo el comando `actualizar_resumen_partos` (cron, p. ej. cada 5
+minutos); las vistas leen el resumen y muestran la hora de la última
+actualización, nunca lo recalculan dentro de un request.
+
+Los días que pierden un parto sin que la marca los vea (cambio de fecha
+de admisión, borrado físico) quedan en DiaPendienteResumenPartos al
+guardar o eliminar el parto, y la actualización los recalcula también.
+Las escrituras masivas (queryset.update/delete) no pasan por save():
+después de usarlas, `actualizar_resumen_partos --completo` reconstruye
+todo.
+"""
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from partosApp.models import (
+    DiaPendienteResumenPartos,
+    MarcaResumenPartos,
+    RegistroParto,
+    ResumenDiarioPartos,
+)
+
+
+MARCA = 'resumen_diario_partos'
+
+CAMPOS_ANALGESIA = [
+    'anestesia_neuroaxial',
+    'oxido_nitroso',
+    'analgesia_endovenosa',
+    'anestesia_general',
+    'anestesia_local',
+    'analgesia_no_farmacologica',
+]
+
+CLAVES = ['tipo_parto', 'clasificacion_robson', 'estado_perine', *CAMPOS_ANALGESIA]
+
+# Días recalculados por transacción
+DIAS_POR_LOTE = 31
+
+# Se vuelve a mirar este margen antes de la marca: un parto guardado en una
+# transacción que terminó después de la última actualización puede tener
+# una fecha_modificacion anterior a ella
+MARGEN_MARCA = timedelta(minutes=5)
+
+
+# ============================================
+# ACTUALIZACIÓN
+# ============================================
+
+def _por_dia(partos):
+    return partos.order_by().annotate(fecha=TruncDate('fecha_hora_admision'))
+
+
+def dias_modificados(desde=None):
+    """Días de admisión de los partos modificados desde `desde` (todos si es None)"""
+    partos = RegistroParto.objects.all()
+    if desde is not None:
+        partos = partos.filter(fecha_modificacion__gte=desde)
+    return sorted(set(_por_dia(partos).values_list('fecha', flat=True).distinct()))
+
+
+def recalcular_dias(fechas):
+    """Reemplaza las filas del resumen de los días indicados. Retorna las filas escritas."""
+    fechas = list(fechas)
+    escritas = 0
+    for inicio in range(0, len(fechas), DIAS_POR_LOTE):
+        lote = fechas[inicio:inicio + DIAS_POR_LOTE]
+        grupos = (
+            _por_dia(RegistroParto.objects.filter(activo=True, fecha_hora_admision__date__in=lote))
+            .values('fecha', *CLAVES)
+            .annotate(total=Count('id'))
+        )
+        filas = [ResumenDiarioPartos(**grupo) for grupo in grupos]
+        with transaction.atomic():
+            ResumenDiarioPartos.objects.filter(fecha__in=lote).delete()
+            ResumenDiarioPartos.objects.bulk_create(filas, batch_size=1000)
+        escritas += len(filas)
+    return escritas
+
+
+def actualizar_resumen(completo=False):
+    """
+    Recalcula los días tocados desde la última actualización y los días
+    pendientes (o todos con `completo`). Retorna (días recalculados,
+    filas escritas).
+    """
+    with transaction.atomic():
+        # La fila de la marca serializa actualizaciones concurrentes
+        MarcaResumenPartos.objects.get_or_create(nombre=MARCA)
+        marca = MarcaResumenPartos.objects.select_for_update().get(nombre=MARCA)
+        inicio = timezone.now()
+        pendientes = dict(DiaPendienteResumenPartos.objects.values_list('pk', 'fecha'))
+
+        if completo or marca.procesado_hasta is None:
+            ResumenDiarioPartos.objects.all().delete()
+            fechas = dias_modificados()
+        else:
+            fechas = dias_modificados(marca.procesado_hasta - MARGEN_MARCA)
+            fechas = sorted(set(fechas) | set(pendientes.values()))
+
+        filas = recalcular_dias(fechas)
+        # Solo los leídos: un día marcado mientras tanto queda para la próxima
+        DiaPendienteResumenPartos.objects.filter(pk__in=pendientes).delete()
+        marca.procesado_hasta = inicio
+        marca.save(update_fields=['procesado_hasta'])
+    return len(fechas), filas
+
+
+def ultima_actualizacion():
+    """Momento hasta el que el resumen está procesado (None si nunca se generó)"""
+    return (
+        MarcaResumenPartos.objects.filter(nombre=MARCA)
+        .values_list('procesado_hasta', flat=True).first()
+    )
+
+
+# ============================================
+# CONSULTA POR RANGO
+# ============================================
+
+def rango_periodo(periodo, referencia):
+    """
+    (desde, hasta, nombre) del mes, trimestre o año ('mes', 'trimestre',
+    'anio') que contiene la fecha de referencia. Lanza ValueError si el
+    periodo no existe.
+    """
+    if periodo == 'mes':
+        desde = referencia.replace(day=1)
+        siguiente = (desde + timedelta(days=32)).replace(day=1)
+        return desde, siguiente - timedelta(days=1), desde.strftime('%B %Y')
+    if periodo == 'trimestre':
+        numero = (referencia.month - 1) // 3 + 1
+        desde = date(referencia.year, 3 * numero - 2, 1)
+        siguiente = (date(referencia.year, 3 * numero, 1) + timedelta(days=32)).replace(day=1)
+        return desde, siguiente - timedelta(days=1), f"{numero}° trimestre {referencia.year}"
+    if periodo == 'anio':
+        return date(referencia.year, 1, 1), date(referencia.year, 12, 31), str(referencia.year)
+    raise ValueError(f"Periodo desconocido: {periodo}")
+
+
+def _agrupar(filas, campo):
+    return {
+        fila[campo]: fila['cantidad']
+        for fila in filas.values(campo).annotate(cantidad=Sum('total')).order_by(campo)
+    }
+
+
+def estadisticas_rango(desde, hasta):
+    """
+    Totales de partos activos con admisión entre `desde` y `hasta`
+    (inclusive), sumando el resumen diario:
+    total, por_tipo, por_robson, por_perine y analgesia (partos con cada una).
+    """
+    filas = ResumenDiarioPartos.objects.filter(fecha__gte=desde, fecha__lte=hasta)
+
+    totales = filas.aggregate(
+        partos=Sum('total'),
+        **{f'con_{campo}': Sum('total', filter=Q(**{campo: True})) for campo in CAMPOS_ANALGESIA},
+    )
+    return {
+        'total': totales.pop('partos') or 0,
+        'por_tipo': _agrupar(filas, 'tipo_parto'),
+        'por_robson': _agrupar(filas, 'clasificacion_robson'),
+        'por_perine': _agrupar(filas, 'estado_perine'),
+        'analgesia': {campo: totales[f'con_{campo}'] or 0 for campo in CAMPOS_ANALGESIA},
+    }
@@ -0,0 +1,36 @@
+"""
+Señales de partosApp
+
+Invalidan la caché de estadísticas del menú de partos
+(ver partosApp.estadisticas) al guardar o eliminar un parto o un recién
+nacido, para que el menú no muestre contadores atrasados hasta que venza
+PARTOS_ESTADISTICAS_CACHE_TTL.
+
+Las escrituras masivas (bulk_create, queryset.update) no disparan
+señales; después de usarlas se debe llamar a invalidar_estadisticas_menu().
+"""
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from partosApp.estadisticas import invalidar_estadisticas_menu
+
+
+MODELOS_MENU = ('partosApp.RegistroParto', 'recienNacidoApp.RegistroRecienNacido')
+
+
+def invalidar_menu(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # Después del commit: antes, otro request podría volver a cachear
+    # los contadores sin la fila nueva
+    transaction.on_commit(invalidar_estadisticas_menu, using=kwargs.get('using'))
+
+
+def conectar_senales():
+    """Conecta la invalidación de estadísticas del menú"""
+    for etiqueta in MODELOS_MENU:
+        modelo = apps.get_model(etiqueta)
+        uid = f"estadisticas_menu_{modelo._meta.label_lower}"
+        post_save.connect(invalidar_menu, sender=modelo, dispatch_uid=uid)
+        post_delete.connect(invalidar_menu, sender=modelo, dispatch_uid=uid)
@@ -65,6 +65,14 @@ urlpatterns = [
         views.editar_parto, 
         name='editar_parto'),
     
+    path('parto/<int:pk>/epicrisis.pdf', 
+        views.epicrisis_parto, 
+        name='epicrisis'),
+    
+    path('parto/<int:pk>/epicrisis/estado/', 
+        views.epicrisis_estado, 
+        name='epicrisis_estado'),
+    
     # ============================================
     # REGISTRO DE RECIÉN NACIDO
     # ============================================
@@ -98,10 +106,18 @@ urlpatterns = [
         views.estadisticas_partos, 
         name='estadisticas'),
     
+    path('exportar/xlsx/', 
+        views.exportar_partos_xlsx, 
+        name='exportar_xlsx'),
+    
     # ============================================
     # API Y BÚSQUEDAS AJAX
     # ============================================
     path('api/buscar-ficha/', 
         views.api_buscar_ficha, 
         name='api_buscar_ficha'),
+    
+    path('api/indicadores/', 
+        views.api_indicadores, 
+        name='api_indicadores'),
 ]
\ No newline at end of file
@@ -1,23 +1,31 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import JsonResponse, FileResponse, Http404, HttpResponseBadRequest
+from django.urls import reverse
 from django.db.models import Q, Count, Prefetch
 from django.utils import timezone
 from django.core.paginator import Paginator
 
 from partosApp.models import RegistroParto
+from partosApp.estadisticas import obtener_estadisticas_menu
+from partosApp.exportacion import exportar_a_archivo_temporal, filtrar_partos
+from partosApp.epicrisis import solicitar_epicrisis
+from partosApp.resumen import estadisticas_rango, rango_periodo, ultima_actualizacion
+from partosApp.analitica import AGRUPACIONES, obtener_indicadores
+from partosApp.asistente import (
+    BorradorParto, PasoInvalido, TOTAL_PASOS, finalizar, obtener_paso,
+)
 from recienNacidoApp.models import RegistroRecienNacido, DocumentosParto
 from matronaApp.models import FichaObstetrica
 from gestionApp.models import Paciente
+from gestionApp.busqueda import filtro_persona, ordenar_por_relevancia
+from gestionApp.secuencias import es_consulta_numero
+from utilidad.cambios import guardar_formulario
+from utilidad.fechas import FechaInvalida, leer_fecha
+from obstetric_care.metricas import PARTOS_REGISTRADOS, RECIEN_NACIDOS_REGISTRADOS
 
 from partosApp.forms import (
     # Formularios de Parto
-    RegistroPartoBaseForm,
-    TrabajoDePartoForm,
-    InformacionPartoForm,
-    PuerperioForm,
-    AnestesiaAnalgesiaForm,
-    ProfesionalesForm,
     RegistroPartoCompletoForm,
     # Formularios de Recién Nacido
     RegistroRecienNacidoForm,
@@ -35,34 +43,7 @@ from partosApp.forms import (
 def menu_partos(request):
     """Vista principal del módulo de Partos"""
     
-    # Estadísticas generales
-    hoy = timezone.now().date()
-    
-    context = {
-        'total_partos': RegistroParto.objects.filter(activo=True).count(),
-        'partos_hoy': RegistroParto.objects.filter(
-            fecha_hora_admision__date=hoy,
-            activo=True
-        ).count(),
-        'partos_mes': RegistroParto.objects.filter(
-            fecha_hora_admision__year=hoy.year,
-            fecha_hora_admision__month=hoy.month,
-            activo=True
-        ).count(),
-        'total_rn': RegistroRecienNacido.objects.count(),
-        'rn_hoy': RegistroRecienNacido.objects.filter(
-            fecha_nacimiento__date=hoy
-        ).count(),
-        # Estadísticas por tipo de parto
-        'partos_eutocicos': RegistroParto.objects.filter(
-            tipo_parto='EUTOCICO',
-            activo=True
-        ).count(),
-        'cesareas': RegistroParto.objects.filter(
-            tipo_parto__in=['CESAREA_URGENCIA', 'CESAREA_ELECTIVA'],
-            activo=True
-        ).count(),
-    }
+    context = obtener_estadisticas_menu()
     
     return render(request, 'Partos/menu_partos.html', context)
 
@@ -71,6 +52,19 @@ def menu_partos(request):
 # BÚSQUEDA Y SELECCIÓN DE FICHAS
 # ============================================
 
+def _filtro_busqueda(query, prefijo_persona, *campos_numero):
+    """
+    Q de búsqueda por paciente y, solo si la consulta tiene forma de número
+    correlativo (FO-000123, PARTO-...), por prefijo de esos campos.
+    Un icontains sobre el número obligaría a recorrer toda la tabla.
+    """
+    filtro = filtro_persona(query, prefijo=prefijo_persona)
+    if es_consulta_numero(query):
+        for campo in campos_numero:
+            filtro |= Q(**{f'{campo}__istartswith': query})
+    return filtro
+
+
 def seleccionar_ficha_parto(request):
     """
     Buscar y seleccionar ficha obstétrica para registrar parto
@@ -82,10 +76,7 @@ def seleccionar_ficha_parto(request):
         fichas = FichaObstetrica.objects.filter(
             activa=True
         ).filter(
-            Q(numero_ficha__icontains=query) |
-            Q(paciente__persona__Rut__icontains=query) |
-            Q(paciente__persona__Nombre__icontains=query) |
-            Q(paciente__persona__Apellido_Paterno__icontains=query)
+            _filtro_busqueda(query, 'paciente__persona__', 'numero_ficha')
         ).select_related(
             'paciente__persona',
             'matrona_responsable__persona'
@@ -106,199 +97,143 @@ def seleccionar_ficha_parto(request):
 def registrar_parto_paso1(request, ficha_pk):
     """
     PASO 1: Información básica del parto
+    Los pasos se guardan en un borrador en sesión (partosApp.asistente);
+    el parto se crea recién al completar el paso 6.
     """
     ficha = get_object_or_404(
         FichaObstetrica.objects.select_related('paciente__persona'),
         pk=ficha_pk,
         activa=True
     )
+    borrador = BorradorParto(request.session)
+    borrador.iniciar(ficha.pk)
+    paso = obtener_paso(1)
     
     if request.method == 'POST':
-        form = RegistroPartoBaseForm(request.POST)
+        form = paso.formulario(request.POST)
         if form.is_valid():
-            parto = form.save()
-            # Guardar el ID en sesión para los siguientes pasos
-            request.session['parto_actual_id'] = parto.pk
-            messages.success(request, f'✅ Parto {parto.numero_registro} iniciado correctamente.')
+            borrador.guardar_paso(1, form)
+            messages.success(request, f'✅ {paso.mensaje}')
             return redirect('partos:registrar_parto_paso2')
         else:
             messages.error(request, '❌ Por favor corrige los errores en el formulario.')
     else:
-        # Pre-seleccionar la ficha
-        form = RegistroPartoBaseForm(initial={'ficha': ficha})
+        # Pre-seleccionar la ficha (o retomar el borrador)
+        form = paso.formulario(initial=borrador.valores_iniciales(1) or {'ficha': ficha})
     
     context = {
         'form': form,
         'ficha': ficha,
         'paciente': ficha.paciente,
         'paso': 1,
-        'total_pasos': 6,
+        'total_pasos': TOTAL_PASOS,
+        'borrador_actualizado': borrador.actualizado,
     }
     
-    return render(request, 'Partos/Formularios/paso1_base.html', context)
+    return render(request, paso.plantilla, context)
 
 
-def registrar_parto_paso2(request):
+def _url_paso(numero):
+    if numero == 1:
+        return reverse('partos:seleccionar_ficha')
+    return reverse(f'partos:registrar_parto_paso{numero}')
+
+
+def _paso_asistente(request, numero):
     """
-    PASO 2: Trabajo de parto
+    PASOS 2 a 6: valida el paso y lo guarda en el borrador.
+    El paso 6 revalida el borrador completo y crea el parto.
     """
-    parto_id = request.session.get('parto_actual_id')
-    if not parto_id:
+    borrador = BorradorParto(request.session)
+    if not borrador.ficha_id:
         messages.warning(request, '⚠️ Sesión expirada. Inicia nuevamente el registro.')
         return redirect('partos:seleccionar_ficha')
     
-    parto = get_object_or_404(RegistroParto, pk=parto_id)
+    pendiente = borrador.paso_pendiente()
+    if pendiente < numero:
+        messages.warning(request, f'⚠️ Completa primero el paso {pendiente}.')
+        if pendiente == 1:
+            return redirect('partos:registrar_parto_paso1', ficha_pk=borrador.ficha_id)
+        return redirect(_url_paso(pendiente))
+    
+    paso = obtener_paso(numero)
     
     if request.method == 'POST':
-        form = TrabajoDePartoForm(request.POST, instance=parto)
-        if form.is_valid():
-            form.save()
-            messages.success(request, '✅ Información de trabajo de parto guardada.')
-            return redirect('partos:registrar_parto_paso3')
+        if numero == TOTAL_PASOS:
+            try:
+                parto = finalizar(borrador, request.POST)
+            except PasoInvalido as error:
+                if error.numero != numero:
+                    messages.error(request, f'❌ El paso {error.numero} tiene errores, revísalo.')
+                    if error.numero == 1:
+                        return redirect('partos:registrar_parto_paso1', ficha_pk=borrador.ficha_id)
+                    return redirect(_url_paso(error.numero))
+                form = error.formulario
+                messages.error(request, '❌ Por favor corrige los errores.')
+            else:
+                PARTOS_REGISTRADOS.inc(origen='asistente')
+                messages.success(request, f'🎉 Registro de parto {parto.numero_registro} completado exitosamente.')
+                return redirect('partos:detalle_parto', pk=parto.pk)
         else:
-            messages.error(request, '❌ Por favor corrige los errores.')
+            form = paso.formulario(request.POST)
+            if form.is_valid():
+                borrador.guardar_paso(numero, form)
+                messages.success(request, f'✅ {paso.mensaje}')
+                return redirect(_url_paso(numero + 1))
+            else:
+                messages.error(request, '❌ Por favor corrige los errores.')
     else:
-        form = TrabajoDePartoForm(instance=parto)
+        form = paso.formulario(initial=borrador.valores_iniciales(numero))
     
+    ficha = get_object_or_404(
+        FichaObstetrica.objects.select_related('paciente__persona'),
+        pk=borrador.ficha_id,
+    )
     context = {
         'form': form,
-        'parto': parto,
-        'paso': 2,
-        'total_pasos': 6,
+        'ficha': ficha,
+        'paciente': ficha.paciente,
+        'paso': numero,
+        'total_pasos': TOTAL_PASOS,
+        'borrador_actualizado': borrador.actualizado,
     }
     
-    return render(request, 'Partos/Formularios/paso2_trabajo.html', context)
+    return render(request, paso.plantilla, context)
+
+
+def registrar_parto_paso2(request):
+    """
+    PASO 2: Trabajo de parto
+    """
+    return _paso_asistente(request, 2)
 
 
 def registrar_parto_paso3(request):
     """
     PASO 3: Información del parto
     """
-    parto_id = request.session.get('parto_actual_id')
-    if not parto_id:
-        messages.warning(request, '⚠️ Sesión expirada.')
-        return redirect('partos:seleccionar_ficha')
-    
-    parto = get_object_or_404(RegistroParto, pk=parto_id)
-    
-    if request.method == 'POST':
-        form = InformacionPartoForm(request.POST, instance=parto)
-        if form.is_valid():
-            form.save()
-            messages.success(request, '✅ Información del parto guardada.')
-            return redirect('partos:registrar_parto_paso4')
-        else:
-            messages.error(request, '❌ Por favor corrige los errores.')
-    else:
-        form = InformacionPartoForm(instance=parto)
-    
-    context = {
-        'form': form,
-        'parto': parto,
-        'paso': 3,
-        'total_pasos': 6,
-    }
-    
-    return render(request, 'Partos/Formularios/paso3_info.html', context)
+    return _paso_asistente(request, 3)
 
 
 def registrar_parto_paso4(request):
     """
     PASO 4: Puerperio
     """
-    parto_id = request.session.get('parto_actual_id')
-    if not parto_id:
-        messages.warning(request, '⚠️ Sesión expirada.')
-        return redirect('partos:seleccionar_ficha')
-    
-    parto = get_object_or_404(RegistroParto, pk=parto_id)
-    
-    if request.method == 'POST':
-        form = PuerperioForm(request.POST, instance=parto)
-        if form.is_valid():
-            form.save()
-            messages.success(request, '✅ Información de puerperio guardada.')
-            return redirect('partos:registrar_parto_paso5')
-        else:
-            messages.error(request, '❌ Por favor corrige los errores.')
-    else:
-        form = PuerperioForm(instance=parto)
-    
-    context = {
-        'form': form,
-        'parto': parto,
-        'paso': 4,
-        'total_pasos': 6,
-    }
-    
-    return render(request, 'Partos/Formularios/paso4_puerperio.html', context)
+    return _paso_asistente(request, 4)
 
 
 def registrar_parto_paso5(request):
     """
     PASO 5: Anestesia y Analgesia
     """
-    parto_id = request.session.get('parto_actual_id')
-    if not parto_id:
-        messages.warning(request, '⚠️ Sesión expirada.')
-        return redirect('partos:seleccionar_ficha')
-    
-    parto = get_object_or_404(RegistroParto, pk=parto_id)
-    
-    if request.method == 'POST':
-        form = AnestesiaAnalgesiaForm(request.POST, instance=parto)
-        if form.is_valid():
-            form.save()
-            messages.success(request, '✅ Información de anestesia guardada.')
-            return redirect('partos:registrar_parto_paso6')
-        else:
-            messages.error(request, '❌ Por favor corrige los errores.')
-    else:
-        form = AnestesiaAnalgesiaForm(instance=parto)
-    
-    context = {
-        'form': form,
-        'parto': parto,
-        'paso': 5,
-        'total_pasos': 6,
-    }
-    
-    return render(request, 'Partos/Formularios/paso5_anestesia.html', context)
+    return _paso_asistente(request, 5)
 
 
 def registrar_parto_paso6(request):
     """
     PASO 6: Profesionales y finalización
     """
-    parto_id = request.session.get('parto_actual_id')
-    if not parto_id:
-        messages.warning(request, '⚠️ Sesión expirada.')
-        return redirect('partos:seleccionar_ficha')
-    
-    parto = get_object_or_404(RegistroParto, pk=parto_id)
-    
-    if request.method == 'POST':
-        form = ProfesionalesForm(request.POST, instance=parto)
-        if form.is_valid():
-            form.save()
-            # Limpiar sesión
-            if 'parto_actual_id' in request.session:
-                del request.session['parto_actual_id']
-            messages.success(request, f'🎉 Registro de parto {parto.numero_registro} completado exitosamente.')
-            return redirect('partos:detalle_parto', pk=parto.pk)
-        else:
-            messages.error(request, '❌ Por favor corrige los errores.')
-    else:
-        form = ProfesionalesForm(instance=parto)
-    
-    context = {
-        'form': form,
-        'parto': parto,
-        'paso': 6,
-        'total_pasos': 6,
-    }
-    
-    return render(request, 'Partos/Formularios/paso6_profesionales.html', context)
+    return _paso_asistente(request, 6)
 
 
 # ============================================
@@ -320,6 +255,7 @@ def registrar_parto_completo(request, ficha_pk):
         form = RegistroPartoCompletoForm(request.POST)
         if form.is_valid():
             parto = form.save()
+            PARTOS_REGISTRADOS.inc(origen='completo')
             messages.success(request, f'🎉 Parto {parto.numero_registro} registrado exitosamente.')
             return redirect('partos:detalle_parto', pk=parto.pk)
         else:
@@ -355,15 +291,12 @@ def listar_partos(request):
     tipo_parto = request.GET.get('tipo_parto', '')
     fecha_inicio = request.GET.get('fecha_inicio', '')
     fecha_fin = request.GET.get('fecha_fin', '')
+    solo_complicaciones = request.GET.get('complicaciones') == '1'
     
     if busqueda:
-        partos = partos.filter(
-            Q(numero_registro__icontains=busqueda) |
-            Q(ficha__numero_ficha__icontains=busqueda) |
-            Q(ficha__paciente__persona__Rut__icontains=busqueda) |
-            Q(ficha__paciente__persona__Nombre__icontains=busqueda) |
-            Q(ficha__paciente__persona__Apellido_Paterno__icontains=busqueda)
-        )
+        partos = partos.filter(_filtro_busqueda(
+            busqueda, 'ficha__paciente__persona__', 'numero_registro', 'ficha__numero_ficha'
+        ))
     
     if tipo_parto:
         partos = partos.filter(tipo_parto=tipo_parto)
@@ -374,6 +307,9 @@ def listar_partos(request):
     if fecha_fin:
         partos = partos.filter(fecha_hora_admision__lte=fecha_fin)
     
+    if solo_complicaciones:
+        partos = partos.con_complicaciones()
+    
     # Paginación
     paginator = Paginator(partos, 20)  # 20 partos por página
     page_number = request.GET.get('page')
@@ -384,6 +320,7 @@ def listar_partos(request):
         'total_partos': partos.count(),
         'busqueda': busqueda,
         'tipo_parto': tipo_parto,
+        'solo_complicaciones': solo_complicaciones,
     }
     
     return render(request, 'Partos/Data/listar_partos.html', context)
@@ -420,6 +357,51 @@ def detalle_parto(request, pk):
     return render(request, 'Partos/Data/detalle_parto.html', context)
 
 
+def epicrisis_parto(request, pk):
+    """
+    Descarga la epicrisis del parto en PDF
+    Si aún no está generada se encola y se responde 202; el navegador
+    puede reintentar o consultar epicrisis_estado.
+    """
+    estado, ruta = solicitar_epicrisis(pk)
+    
+    if estado == 'no_existe':
+        raise Http404("Parto no encontrado")
+    
+    if estado == 'lista':
+        return FileResponse(open(ruta, 'rb'), content_type='application/pdf', filename=f"epicrisis_parto_{pk}.pdf")
+    
+    if estado == 'error':
+        return JsonResponse({
+            'estado': estado,
+            'mensaje': 'No se pudo generar la epicrisis. Revise el registro del parto.',
+        }, status=500)
+    
+    respuesta = JsonResponse({
+        'estado': estado,
+        'mensaje': 'La epicrisis se está generando, intente nuevamente en unos segundos.',
+        'url_estado': reverse('partos:epicrisis_estado', args=[pk]),
+    }, status=202)
+    respuesta['Retry-After'] = '2'
+    return respuesta
+
+
+def epicrisis_estado(request, pk):
+    """API JSON: estado de la epicrisis del parto ('lista', 'generando' o 'error')"""
+    estado, _ruta = solicitar_epicrisis(pk)
+    
+    if estado == 'no_existe':
+        return JsonResponse({'estado': estado}, status=404)
+    
+    if estado == 'error':
+        return JsonResponse({'estado': estado}, status=500)
+    
+    return JsonResponse({
+        'estado': estado,
+        'url': reverse('partos:epicrisis', args=[pk]),
+    })
+
+
 def editar_parto(request, pk):
     """
     Editar un registro de parto existente
@@ -429,7 +411,7 @@ def editar_parto(request, pk):
     if request.method == 'POST':
         form = RegistroPartoCompletoForm(request.POST, instance=parto)
         if form.is_valid():
-            form.save()
+            guardar_formulario(form)
             messages.success(request, f'✅ Parto {parto.numero_registro} actualizado correctamente.')
             return redirect('partos:detalle_parto', pk=parto.pk)
         else:
@@ -464,6 +446,7 @@ def registrar_recien_nacido(request, parto_pk):
         form = RegistroRecienNacidoForm(request.POST, registro_parto=parto)
         if form.is_valid():
             rn = form.save()
+            RECIEN_NACIDOS_REGISTRADOS.inc(origen='individual')
             messages.success(request, f'✅ Recién nacido registrado exitosamente.')
             return redirect('partos:detalle_rn', pk=rn.pk)
         else:
@@ -507,6 +490,7 @@ def registrar_gemelos(request, parto_pk):
         if form1.is_valid() and form2.is_valid():
             rn1 = form1.save()
             rn2 = form2.save()
+            RECIEN_NACIDOS_REGISTRADOS.inc(2, origen='gemelos')
             messages.success(request, f'✅ Gemelos registrados exitosamente.')
             return redirect('partos:detalle_parto', pk=parto.pk)
         else:
@@ -558,7 +542,7 @@ def editar_recien_nacido(request, pk):
             registro_parto=rn.registro_parto
         )
         if form.is_valid():
-            form.save()
+            guardar_formulario(form)
             messages.success(request, '✅ Información del RN actualizada correctamente.')
             return redirect('partos:detalle_rn', pk=rn.pk)
         else:
@@ -628,42 +612,110 @@ def gestionar_documentos(request, parto_pk):
 def estadisticas_partos(request):
     """
     Vista con estadísticas y gráficos de partos
+    Periodo: ?periodo=mes|trimestre|anio&fecha=AAAA-MM-DD (por defecto el mes actual)
+    o un rango libre con ?desde=AAAA-MM-DD&hasta=AAAA-MM-DD.
+    Los totales salen del resumen diario (partosApp.resumen) y los
+    indicadores de calidad de partosApp.analitica (?agrupar=mes|robson|consultorio).
     """
-    # Obtener rango de fechas
     hoy = timezone.now().date()
-    mes_actual = hoy.replace(day=1)
-    
-    # Estadísticas del mes
-    partos_mes = RegistroParto.objects.filter(
-        fecha_hora_admision__gte=mes_actual,
-        activo=True
-    )
-    
+    periodo = request.GET.get('periodo', 'mes')
+    # Una fecha inválida (mal escrita o inexistente) se ignora
+    fechas = {}
+    for parametro in ('fecha', 'desde', 'hasta'):
+        try:
+            fechas[parametro] = leer_fecha(request.GET.get(parametro))
+        except FechaInvalida:
+            fechas[parametro] = None
+            messages.warning(request, f"⚠️ Se ignoró la fecha inválida en '{parametro}'.")
+    referencia = fechas['fecha'] or hoy
+    desde, hasta = fechas['desde'], fechas['hasta']
+
+    if desde and hasta and desde <= hasta:
+        periodo = 'rango'
+        nombre_periodo = f"{desde.strftime('%d/%m/%Y')} - {hasta.strftime('%d/%m/%Y')}"
+    else:
+        if periodo not in ('mes', 'trimestre', 'anio'):
+            periodo = 'mes'
+        desde, hasta, nombre_periodo = rango_periodo(periodo, referencia)
+
+    # El resumen lo actualiza el comando actualizar_resumen_partos (cron)
+    estadisticas = estadisticas_rango(desde, hasta)
+    por_tipo = estadisticas['por_tipo']
+
     # Por tipo de parto
     stats_tipo = {
-        'eutocico': partos_mes.filter(tipo_parto='EUTOCICO').count(),
-        'distocico': partos_mes.filter(tipo_parto='DISTOCICO').count(),
-        'cesarea_urgencia': partos_mes.filter(tipo_parto='CESAREA_URGENCIA').count(),
-        'cesarea_electiva': partos_mes.filter(tipo_parto='CESAREA_ELECTIVA').count(),
+        'eutocico': por_tipo.get('EUTOCICO', 0),
+        'distocico': por_tipo.get('DISTOCICO', 0),
+        'cesarea_urgencia': por_tipo.get('CESAREA_URGENCIA', 0),
+        'cesarea_electiva': por_tipo.get('CESAREA_ELECTIVA', 0),
     }
-    
-    # Por clasificación de Robson
-    stats_robson = {}
-    for grupo in RegistroParto.objects.filter(
-        fecha_hora_admision__gte=mes_actual
-    ).values('clasificacion_robson').annotate(total=Count('id')):
-        stats_robson[grupo['clasificacion_robson']] = grupo['total']
-    
+
+    agrupar = request.GET.get('agrupar', 'robson')
+    if agrupar not in AGRUPACIONES:
+        agrupar = 'robson'
+
     context = {
-        'partos_mes': partos_mes.count(),
+        'partos_mes': estadisticas['total'],
         'stats_tipo': stats_tipo,
-        'stats_robson': stats_robson,
-        'mes_nombre': mes_actual.strftime('%B %Y'),
+        'stats_robson': estadisticas['por_robson'],
+        'stats_perine': estadisticas['por_perine'],
+        'stats_analgesia': estadisticas['analgesia'],
+        'indicadores': obtener_indicadores(desde, hasta, agrupar),
+        'agrupar': agrupar,
+        'mes_nombre': nombre_periodo,
+        'periodo': periodo,
+        'desde': desde,
+        'hasta': hasta,
+        'resumen_actualizado': ultima_actualizacion(),
     }
     
     return render(request, 'Partos/Data/estadisticas.html', context)
 
 
+def api_indicadores(request):
+    """
+    API JSON con los indicadores de calidad (cesárea, Apgar, peso, duración)
+    Parámetros: ?desde=AAAA-MM-DD&hasta=AAAA-MM-DD&agrupar=mes|robson|consultorio
+    (por defecto, los últimos 12 meses agrupados por mes)
+    """
+    hoy = timezone.now().date()
+    try:
+        desde = leer_fecha(request.GET.get('desde')) or hoy.replace(year=hoy.year - 1, day=1)
+        hasta = leer_fecha(request.GET.get('hasta')) or hoy
+    except FechaInvalida as error:
+        return JsonResponse({'error': str(error)}, status=400)
+    agrupar = request.GET.get('agrupar', 'mes')
+
+    if agrupar not in AGRUPACIONES:
+        return JsonResponse(
+            {'error': f"agrupar debe ser uno de: {', '.join(AGRUPACIONES)}"},
+            status=400,
+        )
+    if desde > hasta:
+        return JsonResponse({'error': 'desde debe ser anterior a hasta'}, status=400)
+
+    return JsonResponse(obtener_indicadores(desde, hasta, agrupar))
+
+
+def exportar_partos_xlsx(request):
+    """
+    Descarga los partos en Excel (una fila por recién nacido)
+    Filtros opcionales: ?fecha_desde=AAAA-MM-DD&fecha_hasta=AAAA-MM-DD&tipo_parto=
+    """
+    try:
+        fecha_desde = leer_fecha(request.GET.get('fecha_desde'))
+        fecha_hasta = leer_fecha(request.GET.get('fecha_hasta'))
+    except FechaInvalida as error:
+        return HttpResponseBadRequest(str(error))
+    tipo_parto = request.GET.get('tipo_parto', '')
+    
+    partos = filtrar_partos(fecha_desde, fecha_hasta, tipo_parto)
+    archivo = exportar_a_archivo_temporal(partos)
+    
+    nombre = f"partos_{timezone.localdate():%Y%m%d}.xlsx"
+    return FileResponse(archivo, as_attachment=True, filename=nombre)
+
+
 # ============================================
 # API Y BÚSQUEDAS AJAX
 # ============================================
@@ -680,12 +732,11 @@ def api_buscar_ficha(request):
     fichas = FichaObstetrica.objects.filter(
         activa=True
     ).filter(
-        Q(numero_ficha__icontains=query) |
-        Q(paciente__persona__Rut__icontains=query) |
-        Q(paciente__persona__Nombre__icontains=query)
+        _filtro_busqueda(query, 'paciente__persona__', 'numero_ficha')
     ).select_related(
         'paciente__persona'
-    )[:10]
+    )
+    fichas = ordenar_por_relevancia(fichas, query, prefijo='paciente__persona__')[:10]
     
     resultados = [{
         'id': f.pk,
@@ -1,13 +1,55 @@
 from django.db import models
+from django.db.models import Case, CharField, Value, When
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
+from utilidad.cambios import SeguimientoCambiosMixin
 
 
 # ============================================
 # ✅ REGISTRO DE RECIÉN NACIDO (ÚNICO LUGAR)
 # ============================================
 
-class RegistroRecienNacido(models.Model):
+# Cortes de clasificacion_peso (OMS, gramos) y estado_apgar (5 minutos)
+PESO_BAJO = 2500
+PESO_MACROSOMICO = 4000
+APGAR_NORMAL = 7
+APGAR_MODERADO = 4
+
+
+class RegistroRecienNacidoQuerySet(models.QuerySet):
+    """Clasificaciones del RN calculadas en la base de datos"""
+
+    def with_flags(self):
+        """Anota estado_apgar_db y clasificacion_peso_db (mismos textos que los métodos)"""
+        return self.annotate(
+            estado_apgar_db=Case(
+                When(apgar_5_minutos__gte=APGAR_NORMAL, then=Value('Normal')),
+                When(apgar_5_minutos__gte=APGAR_MODERADO, then=Value('Asfixia moderada')),
+                default=Value('Asfixia severa'),
+                output_field=CharField(),
+            ),
+            clasificacion_peso_db=Case(
+                When(peso__lt=PESO_BAJO, then=Value('Bajo peso al nacer')),
+                When(peso__lte=PESO_MACROSOMICO, then=Value('Peso normal')),
+                default=Value('Macrosómico'),
+                output_field=CharField(),
+            ),
+        )
+
+    def con_asfixia(self):
+        """RN con Apgar a los 5 minutos menor a 7"""
+        return self.filter(apgar_5_minutos__lt=APGAR_NORMAL)
+
+    def bajo_peso(self):
+        """RN con menos de 2500 g al nacer"""
+        return self.filter(peso__lt=PESO_BAJO)
+
+    def macrosomicos(self):
+        """RN con más de 4000 g al nacer"""
+        return self.filter(peso__gt=PESO_MACROSOMICO)
+
+
+class RegistroRecienNacido(SeguimientoCambiosMixin, models.Model):
     """
     Registro del recién nacido
     Se crea después del parto
@@ -166,6 +208,13 @@ class RegistroRecienNacido(models.Model):
         verbose_name='Fecha de Creación del Registro'
     )
     
+    fecha_modificacion = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Fecha de Última Modificación'
+    )
+    
+    objects = RegistroRecienNacidoQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-fecha_nacimiento']
         verbose_name = 'Registro de Recién Nacido'
@@ -179,18 +228,18 @@ class RegistroRecienNacido(models.Model):
     
     def clasificacion_peso(self):
         """Clasifica el peso del RN según OMS"""
-        if self.peso < 2500:
+        if self.peso < PESO_BAJO:
             return "Bajo peso al nacer"
-        elif 2500 <= self.peso <= 4000:
+        elif self.peso <= PESO_MACROSOMICO:
             return "Peso normal"
         else:
             return "Macrosómico"
     
     def estado_apgar(self):
         """Evalúa el estado según Apgar a los 5 minutos"""
-        if self.apgar_5_minutos >= 7:
+        if self.apgar_5_minutos >= APGAR_NORMAL:
             return "Normal"
-        elif 4 <= self.apgar_5_minutos <= 6:
+        elif self.apgar_5_minutos >= APGAR_MODERADO:
             return "Asfixia moderada"
         else:
             return "Asfixia severa"
@@ -208,7 +257,7 @@ class RegistroRecienNacido(models.Model):
 # ✅ DOCUMENTOS DE PARTO (MOVIDO DESDE partosApp)
 # ============================================
 
-class DocumentosParto(models.Model):
+class DocumentosParto(SeguimientoCambiosMixin, models.Model):
     """
     Documentos y procedimientos post-parto
     Incluye: placenta, registro civil, Ley Dominga
@@ -3,6 +3,7 @@ from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 from gestionApp.models import Tens, Paciente
 from matronaApp.models import FichaObstetrica, MedicamentoFicha
+from utilidad.cambios import SeguimientoCambiosMixin
 
 
 # ============================================
@@ -137,7 +138,7 @@ class RegistroTens(models.Model):
 # MODELO: TRATAMIENTO APLICADO
 # ============================================
 
-class Tratamiento_aplicado(models.Model):
+class Tratamiento_aplicado(SeguimientoCambiosMixin, models.Model):
     """
     Registro de tratamientos/medicamentos aplicados por TENS
     Vinculado a una ficha obstétrica y opcionalmente a un medicamento prescrito
@@ -285,6 +286,8 @@ class Tratamiento_aplicado(models.Model):
             models.Index(fields=['paciente', '-fecha_aplicacion']),
             models.Index(fields=['tens', '-fecha_aplicacion']),
             models.Index(fields=['medicamento_ficha', '-fecha_aplicacion']),
+            models.Index(fields=['-fecha_aplicacion', '-hora_aplicacion']),
+            models.Index(fields=['activo', '-fecha_aplicacion', '-hora_aplicacion']),
         ]
     
     def __str__(self):
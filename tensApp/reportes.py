@@ -0,0 +1,123 @@
+"""
+Reporte paginado de tratamientos aplicados por TENS
+
+Las listas de tratamientos (todos, activos, inactivos) se paginan por
+cursor sobre (-fecha_aplicacion, -hora_aplicacion, id), así la página N
+cuesta lo mismo que la primera aunque la tabla tenga cientos de miles de
+filas. Los filtros se traducen a columnas indexadas:
+
+- ficha  -> índice (ficha, -fecha_aplicacion)
+- tens   -> índice (tens, -fecha_aplicacion)
+- fechas -> índices (-fecha_aplicacion, -hora_aplicacion) y
+            (activo, -fecha_aplicacion, -hora_aplicacion)
+
+El total se cuenta una vez por combinación de filtros y se guarda en
+caché TENS_REPORTE_TOTAL_TTL segundos, por lo que es aproximado.
+"""
+import hashlib
+from dataclasses import dataclass, asdict
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+
+from matronaApp.models import FichaObstetrica
+from tensApp.models import Tratamiento_aplicado
+from utilidad.paginacion import paginar_keyset
+
+
+ORDEN_TRATAMIENTOS = ['-fecha_aplicacion', '-hora_aplicacion', 'id']
+TRATAMIENTOS_POR_PAGINA = 50
+
+TOTAL_CACHE_TTL = getattr(settings, 'TENS_REPORTE_TOTAL_TTL', 300)
+
+
+@dataclass
+class FiltrosTratamientos:
+    """Filtros del reporte; None significa 'sin filtrar'"""
+    activo: bool = None
+    fecha_desde: date = None
+    fecha_hasta: date = None
+    tens_id: int = None
+    numero_ficha: str = None
+
+    @classmethod
+    def desde_request(cls, request, activo=None):
+        """Lee los filtros de ?fecha_desde=&fecha_hasta=&tens=&ficha= (los inválidos se ignoran)"""
+        def _fecha(nombre):
+            try:
+                return date.fromisoformat(request.GET.get(nombre, ''))
+            except ValueError:
+                return None
+
+        tens = request.GET.get('tens', '')
+        return cls(
+            activo=activo,
+            fecha_desde=_fecha('fecha_desde'),
+            fecha_hasta=_fecha('fecha_hasta'),
+            tens_id=int(tens) if tens.isdigit() else None,
+            numero_ficha=request.GET.get('ficha', '').strip().upper() or None,
+        )
+
+    def querystring(self):
+        """Parámetros GET de los filtros (sin cursor), para los enlaces de paginación"""
+        from django.utils.http import urlencode
+
+        parametros = {
+            'fecha_desde': self.fecha_desde.isoformat() if self.fecha_desde else None,
+            'fecha_hasta': self.fecha_hasta.isoformat() if self.fecha_hasta else None,
+            'tens': self.tens_id,
+            'ficha': self.numero_ficha,
+        }
+        return urlencode({k: v for k, v in parametros.items() if v is not None})
+
+
+def filtrar_tratamientos(filtros):
+    """Queryset de tratamientos con los filtros aplicados (sin orden ni joins)"""
+    tratamientos = Tratamiento_aplicado.objects.all()
+
+    if filtros.activo is not None:
+        tratamientos = tratamientos.filter(activo=filtros.activo)
+    if filtros.fecha_desde:
+        tratamientos = tratamientos.filter(fecha_aplicacion__gte=filtros.fecha_desde)
+    if filtros.fecha_hasta:
+        tratamientos = tratamientos.filter(fecha_aplicacion__lte=filtros.fecha_hasta)
+    if filtros.tens_id:
+        tratamientos = tratamientos.filter(tens_id=filtros.tens_id)
+    if filtros.numero_ficha:
+        # Se resuelve el id primero para filtrar por la columna indexada
+        # ficha_id en vez de unir con la tabla de fichas
+        ficha_id = FichaObstetrica.objects.filter(
+            numero_ficha=filtros.numero_ficha
+        ).values_list('pk', flat=True).first()
+        tratamientos = tratamientos.filter(ficha_id=ficha_id) if ficha_id else tratamientos.none()
+
+    return tratamientos
+
+
+def _clave_total(filtros):
+    firma = hashlib.md5(repr(sorted(asdict(filtros).items())).encode()).hexdigest()
+    return f"tens:reporte_tratamientos:total:{firma}"
+
+
+def total_tratamientos(filtros):
+    """Cantidad de tratamientos que cumplen los filtros (en caché, aproximada)"""
+    clave = _clave_total(filtros)
+    total = cache.get(clave)
+    if total is None:
+        total = filtrar_tratamientos(filtros).count()
+        cache.set(clave, total, TOTAL_CACHE_TTL)
+    return total
+
+
+def pagina_tratamientos(filtros, cursor=None, tamano=TRATAMIENTOS_POR_PAGINA):
+    """
+    Página de tratamientos que sigue a `cursor`.
+    Lanza ValueError si el cursor no es válido.
+    """
+    tratamientos = filtrar_tratamientos(filtros).select_related(
+        'ficha',
+        'paciente__persona',
+        'tens__persona',
+    )
+    return paginar_keyset(tratamientos, ORDEN_TRATAMIENTOS, cursor=cursor, tamano=tamano)
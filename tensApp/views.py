@@ -5,6 +5,13 @@ from django.db.models import Q, Count, Prefetch
 from django.utils import timezone
 
 from gestionApp.models import Tens, Persona, Paciente
+from gestionApp.contadores import obtener_contadores
+from gestionApp.busqueda import buscar_pacientes
+from tensApp.reportes import FiltrosTratamientos, pagina_tratamientos, total_tratamientos
+from utilidad.cambios import guardar_formulario
+from utilidad.rut_validator import RutValidator
+from obstetric_care.metricas import (
+    ADMINISTRACIONES_REGISTRADAS, REGISTROS_TENS, TRATAMIENTOS_REGISTRADOS )
 from matronaApp.models import (
     FichaObstetrica, MedicamentoFicha, AdministracionMedicamento, IngresoPaciente )
 from tensApp.forms.administracion_forms import AdministracionMedicamentoForm
@@ -17,6 +24,10 @@ from tensApp.models import Tratamiento_aplicado
 from tensApp.models import Tratamiento_aplicado
 from gestionApp.models import Paciente
 from matronaApp.models import FichaObstetrica,MedicamentoFicha, AdministracionMedicamento
+
+# Pacientes candidatas que retorna api_buscar_paciente sin un RUT exacto
+MAX_CANDIDATOS_API = 10
+
 # ============================================
 # MENÚ PRINCIPAL TENS
 # ============================================
@@ -32,9 +43,11 @@ def menu_tens(request):
         fecha_hora_administracion__date=hoy
     ).count()
     
+    contadores = obtener_contadores('pacientes_activos', 'fichas_activas')
+    
     context = {
-        'total_pacientes': Paciente.objects.filter(activo=True).count(),
-        'total_fichas_activas': FichaObstetrica.objects.filter(activa=True).count(),
+        'total_pacientes': contadores['pacientes_activos'],
+        'total_fichas_activas': contadores['fichas_activas'],
         'administraciones_hoy': administraciones_hoy,
     }
     
@@ -50,14 +63,7 @@ def buscar_paciente_tens(request):
     pacientes = []
     
     if query:
-        pacientes = Paciente.objects.filter(
-            Q(activo=True)
-        ).filter(
-            Q(persona__Rut__icontains=query) |
-            Q(persona__Nombre__icontains=query) |
-            Q(persona__Apellido_Paterno__icontains=query) |
-            Q(persona__Apellido_Materno__icontains=query)
-        ).select_related('persona').annotate(
+        pacientes = buscar_pacientes(query).annotate(
             num_fichas=Count('fichas_obstetricas')
         )
     
@@ -67,36 +73,48 @@ def buscar_paciente_tens(request):
     })
 
 
+def _datos_paciente_api(paciente):
+    persona = paciente.persona
+    return {
+        'id': paciente.pk,
+        'rut': persona.Rut,
+        'nombre_completo': f"{persona.Nombre} {persona.Apellido_Paterno} {persona.Apellido_Materno}",
+        'edad': paciente.edad,
+    }
+
+
 def api_buscar_paciente(request):
-    """API JSON para búsqueda de pacientes"""
+    """
+    API JSON para búsqueda de pacientes.
+    Solo se retorna una paciente (encontrado: True) cuando se entrega un RUT
+    completo y válido que coincide exactamente; cualquier otra consulta
+    retorna las candidatas para que el usuario elija, nunca una al azar.
+    """
     rut = request.GET.get('rut', '').strip()
     
     if not rut:
         return JsonResponse({'encontrado': False, 'mensaje': 'RUT no proporcionado'})
     
-    try:
-        from utilidad.rut_validator import normalizar_rut
-        rut_normalizado = normalizar_rut(rut)
-        
-        paciente = Paciente.objects.select_related('persona').get(
-            persona__Rut=rut_normalizado,
-            activo=True
+    if RutValidator.validar(rut):
+        coincidencias = list(
+            buscar_pacientes(rut).filter(persona__rut_busqueda=RutValidator.limpiar(rut))[:2]
         )
-        
-        return JsonResponse({
-            'encontrado': True,
-            'paciente': {
-                'id': paciente.pk,
-                'rut': paciente.persona.Rut,
-                'nombre_completo': f"{paciente.persona.Nombre} {paciente.persona.Apellido_Paterno} {paciente.persona.Apellido_Materno}",
-                'edad': paciente.Edad,
-            }
-        })
-    except Paciente.DoesNotExist:
+        if len(coincidencias) == 1:
+            return JsonResponse({
+                'encontrado': True,
+                'paciente': _datos_paciente_api(coincidencias[0]),
+            })
         return JsonResponse({
             'encontrado': False,
             'mensaje': 'Paciente no encontrado'
         })
+    
+    candidatos = buscar_pacientes(rut)[:MAX_CANDIDATOS_API]
+    return JsonResponse({
+        'encontrado': False,
+        'mensaje': 'Ingrese el RUT completo con dígito verificador',
+        'candidatos': [_datos_paciente_api(paciente) for paciente in candidatos],
+    })
 
 
 # ============================================
@@ -196,6 +214,7 @@ def registrar_administracion(request, medicamento_pk):
             
             administracion.tens = tens
             administracion.save()
+            ADMINISTRACIONES_REGISTRADAS.inc()
             
             messages.success(
                 request,
@@ -289,6 +308,7 @@ def registrar_tens(request):
                 registro = registro_form.save(commit=False)
                 registro.ficha = ficha
                 registro.save()
+                REGISTROS_TENS.inc()
                 messages.success(request, 'Registro guardado exitosamente')
                 # Limpiar sesión después de guardar para buscar nuevo paciente
                 if 'ficha_id' in request.session:
@@ -350,6 +370,7 @@ def registrar_administracion(request, medicamento_pk):
 
             administracion.tens = tens
             administracion.save()
+            ADMINISTRACIONES_REGISTRADAS.inc()
             messages.success(
                 request,
                 f"✅ Administración de {medicamento_ficha.nombre_medicamento} registrada exitosamente."
@@ -433,6 +454,7 @@ def registrar_tratamiento(request, ficha_pk):
             
             tratamiento.tens = tens
             tratamiento.save()
+            TRATAMIENTOS_REGISTRADOS.inc()
             
             messages.success(
                 request,
@@ -513,7 +535,7 @@ def editar_tratamiento(request, tratamiento_pk):
         )
         
         if form.is_valid():
-            form.save()
+            guardar_formulario(form)
             messages.success(
                 request, 
                 f"✅ Tratamiento actualizado correctamente."
@@ -548,7 +570,7 @@ def eliminar_tratamiento(request, tratamiento_pk):
     ficha_pk = tratamiento.ficha.pk
     
     tratamiento.activo = False
-    tratamiento.save()
+    tratamiento.guardar_cambios()
     
     messages.success(
         request, 
@@ -565,7 +587,7 @@ def restaurar_tratamiento(request, tratamiento_pk):
     ficha_pk = tratamiento.ficha.pk
     
     tratamiento.activo = True
-    tratamiento.save()
+    tratamiento.guardar_cambios()
     
     messages.success(
         request, 
@@ -578,55 +600,44 @@ def restaurar_tratamiento(request, tratamiento_pk):
 # LISTADOS GENERALES DE TRATAMIENTOS (OPCIONAL)
 # ============================================
 
-def listar_todos_tratamientos(request):
+def _reporte_tratamientos(request, titulo, activo=None):
     """
-    Listar todos los tratamientos del sistema (para reportes)
+    Reporte paginado de tratamientos (ver tensApp.reportes)
+    Filtros: ?fecha_desde=&fecha_hasta=&tens=&ficha=  Paginación: ?cursor=
     """
-    tratamientos = Tratamiento_aplicado.objects.select_related(
-        'ficha__paciente__persona',
-        'tens__persona',
-        'ficha'
-    ).order_by('-fecha_aplicacion', '-hora_aplicacion')
+    filtros = FiltrosTratamientos.desde_request(request, activo=activo)
     
-    return render(request, 'tens/formularios/listar_tratamientos.html', {
-        'titulo': 'Todos los Tratamientos Aplicados',
-        'tratamientos': tratamientos,
-        'total_tratamientos': tratamientos.count(),
+    try:
+        pagina = pagina_tratamientos(filtros, cursor=request.GET.get('cursor'))
+    except ValueError:
+        messages.warning(request, "⚠️ El enlace de paginación no es válido. Mostrando la primera página.")
+        pagina = pagina_tratamientos(filtros)
+    
+    return render(request, 'Tens/Formularios/listar_tratamientos.html', {
+        'titulo': titulo,
+        'tratamientos': pagina.items,
+        'siguiente_cursor': pagina.siguiente_cursor,
+        'es_primera_pagina': not request.GET.get('cursor'),
+        'total_tratamientos': total_tratamientos(filtros),
+        'filtros': filtros,
+        'filtros_querystring': filtros.querystring(),
+        'lista_tens': Tens.objects.filter(Activo=True).select_related('persona').order_by('persona__Apellido_Paterno'),
         'fecha_actual': timezone.now(),
     })
 
 
+def listar_todos_tratamientos(request):
+    """
+    Listar todos los tratamientos del sistema (para reportes)
+    """
+    return _reporte_tratamientos(request, 'Todos los Tratamientos Aplicados')
+
+
 def listar_tratamientos_activos(request):
     """Listar solo tratamientos activos"""
-    tratamientos = Tratamiento_aplicado.objects.filter(
-        activo=True
-    ).select_related(
-        'ficha__paciente__persona',
-        'tens__persona',
-        'ficha'
-    ).order_by('-fecha_aplicacion', '-hora_aplicacion')
-    
-    return render(request, 'tens/formularios/listar_tratamientos.html', {
-        'titulo': 'Tratamientos Activos',
-        'tratamientos': tratamientos,
-        'total_tratamientos': tratamientos.count(),
-        'fecha_actual': timezone.now(),
-    })
+    return _reporte_tratamientos(request, 'Tratamientos Activos', activo=True)
 
 
 def listar_tratamientos_inactivos(request):
     """Listar solo tratamientos inactivos/eliminados"""
-    tratamientos = Tratamiento_aplicado.objects.filter(
-        activo=False
-    ).select_related(
-        'ficha__paciente__persona',
-        'tens__persona',
-        'ficha'
-    ).order_by('-fecha_aplicacion', '-hora_aplicacion')
-    
-    return render(request, 'tens/formularios/listar_tratamientos.html', {
-        'titulo': 'Tratamientos Inactivos',
-        'tratamientos': tratamientos,
-        'total_tratamientos': tratamientos.count(),
-        'fecha_actual': timezone.now(),
-    })
\ No newline at end of file
+    return _reporte_tratamientos(request, 'Tratamientos Inactivos', activo=False)
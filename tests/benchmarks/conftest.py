@@ -0,0 +1,66 @@
+import json
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import Count
+
+from gestionApp.dataset import GeneradorDataset
+from gestionApp.models import Paciente
+from matronaApp.models import FichaObstetrica
+from partosApp.models import RegistroParto
+
+
+REFERENCIAS = Path(__file__).with_name('referencias.json')
+
+PACIENTES = 300
+SEMILLA = 20240601
+
+
+def leer_referencias():
+    if REFERENCIAS.exists():
+        return json.loads(REFERENCIAS.read_text(encoding='utf-8'))
+    return {'pacientes': PACIENTES, 'semilla': SEMILLA, 'rutas': {}}
+
+
+@pytest.fixture(scope='module')
+def referencias():
+    return leer_referencias()
+
+
+@pytest.fixture(scope='module')
+def dataset(request, referencias, django_db_setup, django_db_blocker):
+    """
+    Dataset sintético (gestionApp.dataset) generado una vez por módulo
+    dentro de una transacción que se revierte al terminar, para no dejar
+    datos a los demás tests. Retorna los objetos representativos de cada
+    modelo: los que tienen más registros relacionados, donde un N+1 se nota.
+    """
+    pacientes = request.config.getoption('--benchmark-pacientes') or referencias['pacientes']
+    with django_db_blocker.unblock():
+        with transaction.atomic():
+            call_command('cargar_patologias', stdout=StringIO())
+            GeneradorDataset(semilla=referencias['semilla']).generar(pacientes, matronas=5, tens=5)
+            yield {
+                'pacientes': pacientes,
+                Paciente: Paciente.objects.annotate(n=Count('fichas_obstetricas')).order_by('-n', 'pk').first(),
+                FichaObstetrica: FichaObstetrica.objects.annotate(n=Count('registros_tens')).order_by('-n', 'pk').first(),
+                RegistroParto: RegistroParto.objects.annotate(n=Count('recien_nacidos')).order_by('-n', 'pk').first(),
+            }
+            transaction.set_rollback(True)
+
+
+@pytest.fixture(scope='module')
+def resultados(request, referencias):
+    """Resultados de la corrida; con --actualizar-referencias se guardan al final"""
+    medidos = {}
+    yield medidos
+    if request.config.getoption('--actualizar-referencias') and medidos:
+        nuevas = {
+            'pacientes': request.config.getoption('--benchmark-pacientes') or referencias['pacientes'],
+            'semilla': referencias['semilla'],
+            'rutas': dict(sorted({**referencias['rutas'], **medidos}.items())),
+        }
+        REFERENCIAS.write_text(json.dumps(nuevas, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
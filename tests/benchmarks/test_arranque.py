@@ -0,0 +1,81 @@
+"""
+Costo de arranque de un worker según el perfil de configuración
+
+Cada medición es un proceso nuevo que hace lo mismo que un worker de
+gunicorn antes de su primer request: cargar la aplicación WSGI
+(django.setup(), apps, modelos y middleware) y las URLs con sus vistas.
+Se comparan dev (con debug_toolbar y django_extensions) y prod.
+
+    pytest tests/benchmarks/test_arranque.py --benchmark -s
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+from importlib.util import find_spec
+
+import pytest
+from django.conf import settings
+
+
+REPETICIONES = 5
+
+APPS_DEPURACION = ('debug_toolbar', 'django_extensions')
+
+SCRIPT = f'''
+import json, sys, time
+inicio = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
+get_wsgi_application()
+get_resolver().url_patterns
+segundos = time.perf_counter() - inicio
+print(json.dumps({{
+    'segundos': segundos,
+    'modulos': len(sys.modules),
+    'depuracion': sorted({{nombre.split('.')[0] for nombre in sys.modules}} & set({APPS_DEPURACION!r})),
+}}))
+'''
+
+
+def arrancar(entorno):
+    entorno_proceso = {
+        **os.environ,
+        'DJANGO_SETTINGS_MODULE': 'obstetric_care.settings',
+        'OBSTETRIC_CARE_ENTORNO': entorno,
+        'OBSTETRIC_CARE_SECRET_KEY': 'benchmark-arranque',
+    }
+    salida = subprocess.run(
+        [sys.executable, '-c', SCRIPT],
+        cwd=settings.BASE_DIR, env=entorno_proceso,
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def medir(entorno):
+    arrancar(entorno)   # calentamiento: .pyc y caché del sistema de archivos
+    mediciones = [arrancar(entorno) for _ in range(REPETICIONES)]
+    return {
+        'ms': round(statistics.median(m['segundos'] for m in mediciones) * 1000, 1),
+        'modulos': mediciones[0]['modulos'],
+        'depuracion': mediciones[0]['depuracion'],
+    }
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(not find_spec('debug_toolbar'), reason='debug_toolbar no está instalado')
+def test_arranque_prod_sin_apps_de_depuracion():
+    dev = medir('dev')
+    prod = medir('prod')
+
+    print(
+        f"\nArranque de un worker (mediana de {REPETICIONES}): "
+        f"dev {dev['ms']} ms / {dev['modulos']} módulos, "
+        f"prod {prod['ms']} ms / {prod['modulos']} módulos; "
+        f"ahorro {dev['ms'] - prod['ms']:.1f} ms y {dev['modulos'] - prod['modulos']} módulos por worker"
+    )
+    assert dev['depuracion']
+    assert prod['depuracion'] == []
+    assert prod['modulos'] < dev['modulos']
@@ -0,0 +1,188 @@
+"""
+Benchmark de todas las rutas con nombre de gestion, matrona, medico, tens
+y partos sobre el dataset sintético.
+
+Por cada URL se mide, con la caché vacía: cantidad de consultas, tiempo
+total de SQL, latencia y memoria máxima (tracemalloc). Se compara contra
+referencias.json:
+
+- Más consultas que la referencia (más el margen) falla: es la señal de
+  un N+1 o de una consulta nueva en la vista.
+- Un código de respuesta distinto falla.
+- Latencia y memoria sobre el umbral solo generan una advertencia, porque
+  dependen de la máquina.
+
+    pytest tests/benchmarks --benchmark
+    pytest tests/benchmarks --benchmark --actualizar-referencias
+"""
+import time
+import tracemalloc
+import warnings
+from contextlib import ExitStack
+from dataclasses import dataclass
+
+import pytest
+from django.core.cache import cache
+from django.db import connections
+from django.urls import URLResolver, get_resolver, reverse
+
+from gestionApp.exportaciones import EXPORTACIONES
+from gestionApp.models import Paciente, Persona
+from matronaApp.models import FichaObstetrica, IngresoPaciente, MedicamentoFicha
+from medicoApp.models import Patologias
+from partosApp.models import RegistroParto
+from recienNacidoApp.models import RegistroRecienNacido
+from tensApp.models import Tratamiento_aplicado
+
+
+NAMESPACES = ['gestion', 'matrona', 'medico', 'tens', 'partos']
+
+# Rutas que modifican datos con GET
+EXCLUIDAS = ('toggle', 'eliminar', 'desactivar', 'restaurar')
+
+# Consultas extra toleradas: max(referencia * UMBRAL, MARGEN)
+UMBRAL_CONSULTAS = 0.2
+MARGEN_CONSULTAS = 2
+
+# Latencia y memoria: advertencia si superan la referencia en este factor
+UMBRAL_ADVERTENCIA = 2.0
+
+# Parámetro de la URL -> modelo del objeto
+PARAMETROS = {
+    'paciente_pk': Paciente,
+    'ficha_pk': FichaObstetrica,
+    'parto_pk': RegistroParto,
+    'medicamento_pk': MedicamentoFicha,
+    'patologia_pk': Patologias,
+    'tratamiento_pk': Tratamiento_aplicado,
+}
+
+# Para <pk>: primer segmento de la ruta -> modelo
+SEGMENTOS = {
+    'persona': Persona,
+    'paciente': Paciente,
+    'ingreso': IngresoPaciente,
+    'ficha': FichaObstetrica,
+    'patologia': Patologias,
+    'parto': RegistroParto,
+    'rn': RegistroRecienNacido,
+}
+
+
+@dataclass
+class Ruta:
+    nombre: str
+    segmento: str
+    parametros: tuple
+    fijos: tuple = ()
+
+    @property
+    def id(self):
+        return self.nombre + ''.join(f'[{valor}]' for _parametro, valor in self.fijos)
+
+
+def _rutas():
+    rutas = {}
+    for resolver in get_resolver().url_patterns:
+        if not isinstance(resolver, URLResolver) or resolver.namespace not in NAMESPACES:
+            continue
+        for patron in resolver.url_patterns:
+            if not patron.name or any(palabra in patron.name for palabra in EXCLUIDAS):
+                continue
+            parametros = tuple(patron.pattern.converters)
+            ruta = Ruta(
+                nombre=f'{resolver.namespace}:{patron.name}',
+                segmento=str(patron.pattern).split('/')[0],
+                parametros=parametros,
+            )
+            if 'tabla' in parametros:
+                for tabla in sorted(EXPORTACIONES):
+                    variante = Ruta(ruta.nombre, ruta.segmento, parametros, (('tabla', tabla),))
+                    rutas.setdefault(variante.id, variante)
+            else:
+                rutas.setdefault(ruta.id, ruta)
+    return list(rutas.values())
+
+
+RUTAS = _rutas()
+
+
+def _url(ruta, dataset):
+    kwargs = dict(ruta.fijos)
+    for parametro in ruta.parametros:
+        if parametro in kwargs:
+            continue
+        modelo = PARAMETROS.get(parametro) or SEGMENTOS.get(ruta.segmento)
+        objeto = dataset.get(modelo) or modelo.objects.order_by('pk').first()
+        if objeto is None:
+            pytest.skip(f'El dataset no tiene {modelo.__name__}')
+        kwargs[parametro] = objeto.pk
+    return reverse(ruta.nombre, kwargs=kwargs)
+
+
+def _consumir(respuesta):
+    if respuesta.streaming:
+        b''.join(respuesta.streaming_content)
+
+
+def medir(client, url):
+    """Consultas, tiempo SQL, latencia y memoria máxima de un GET"""
+    sql = {'consultas': 0, 'segundos': 0.0}
+
+    def contar(execute, consulta, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(consulta, params, many, context)
+        finally:
+            sql['consultas'] += 1
+            sql['segundos'] += time.perf_counter() - inicio
+
+    _consumir(client.get(url))   # calentamiento: imports y plantillas
+
+    cache.clear()
+    with ExitStack() as pila:
+        for conexion in connections.all():
+            pila.enter_context(conexion.execute_wrapper(contar))
+        inicio = time.perf_counter()
+        respuesta = client.get(url)
+        _consumir(respuesta)
+        latencia = time.perf_counter() - inicio
+
+    cache.clear()
+    tracemalloc.start()
+    try:
+        _consumir(client.get(url))
+        _actual, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'estado': respuesta.status_code,
+        'consultas': sql['consultas'],
+        'sql_ms': round(sql['segundos'] * 1000, 1),
+        'latencia_ms': round(latencia * 1000, 1),
+        'memoria_kb': round(pico / 1024),
+    }
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize('ruta', RUTAS, ids=[ruta.id for ruta in RUTAS])
+def test_rendimiento_url(ruta, dataset, referencias, resultados, client):
+    client.raise_request_exception = False
+    medido = medir(client, _url(ruta, dataset))
+    resultados[ruta.id] = medido
+
+    referencia = referencias['rutas'].get(ruta.id)
+    if referencia is None or dataset['pacientes'] != referencias['pacientes']:
+        pytest.skip(f'Sin referencia comparable: {medido}')
+
+    assert medido['estado'] == referencia['estado'], f"{ruta.id}: respuesta {medido['estado']}, referencia {referencia['estado']}"
+    permitidas = referencia['consultas'] + max(round(referencia['consultas'] * UMBRAL_CONSULTAS), MARGEN_CONSULTAS)
+    assert medido['consultas'] <= permitidas, (
+        f"{ruta.id}: {medido['consultas']} consultas, referencia {referencia['consultas']} "
+        f"(máximo {permitidas}); posible N+1"
+    )
+    for metrica in ('latencia_ms', 'memoria_kb'):
+        if referencia[metrica] and medido[metrica] > referencia[metrica] * UMBRAL_ADVERTENCIA:
+            warnings.warn(f"{ruta.id}: {metrica} {medido[metrica]}, referencia {referencia[metrica]}")
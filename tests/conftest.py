@@ -0,0 +1,90 @@
+import itertools
+from datetime import date
+
+import pytest
+from django.utils import timezone
+
+from gestionApp.models import Matrona, Paciente, Persona
+from matronaApp.models import FichaObstetrica
+from partosApp.models import RegistroParto
+from utilidad.rut_validator import RutValidator
+
+
+_cuerpos = itertools.count(20000001)
+
+
+def _persona(nombre='Ana'):
+    cuerpo = str(next(_cuerpos))
+    return Persona.objects.create(
+        Rut=f"{cuerpo}-{RutValidator.calcular_dv(cuerpo)}",
+        Nombre=nombre,
+        Apellido_Paterno='Silva',
+        Apellido_Materno='Rivas',
+        Sexo='Femenino',
+        Fecha_nacimiento=date(1990, 1, 1),
+    )
+
+
+@pytest.fixture
+def crear_ficha(db):
+    """Crea una ficha obstétrica con su paciente y matrona"""
+    def _crear(**datos):
+        paciente = Paciente.objects.create(
+            persona=_persona(), Estado_civil='SOLTERA', Previcion='FONASA_A'
+        )
+        matrona = Matrona.objects.create(
+            persona=_persona('Marta'),
+            Especialidad='Atención del Parto',
+            Registro_medico=f"M-{paciente.pk}",
+            Años_experiencia=5,
+            Turno='Mañana',
+        )
+        return FichaObstetrica.objects.create(paciente=paciente, matrona_responsable=matrona, **datos)
+    return _crear
+
+
+@pytest.fixture
+def crear_parto(crear_ficha):
+    """Crea un registro de parto (y su ficha) con datos mínimos"""
+    def _crear(ficha=None, **datos):
+        valores = {
+            'fecha_hora_admision': timezone.now(),
+            'edad_gestacional_semanas': 39,
+            'tipo_parto': 'EUTOCICO',
+            'clasificacion_robson': 'Grupo 1',
+            'posicion_materna_parto': 'SEMISENTADA',
+            'estado_perine': 'INDEMNE',
+            'profesional_responsable': 'Matrona de turno',
+        }
+        valores.update(datos)
+        return RegistroParto.objects.create(ficha=ficha or crear_ficha(), **valores)
+    return _crear
+
+
+# ============================================
+# BENCHMARKS (tests/benchmarks)
+# ============================================
+
+def pytest_addoption(parser):
+    grupo = parser.getgroup('benchmark', 'Benchmarks de consultas y latencia por URL')
+    grupo.addoption(
+        '--benchmark', action='store_true', default=False,
+        help='Ejecuta los tests marcados con @pytest.mark.benchmark (se omiten por defecto)',
+    )
+    grupo.addoption(
+        '--actualizar-referencias', action='store_true', default=False,
+        help='Guarda los resultados como nuevas referencias en tests/benchmarks/referencias.json',
+    )
+    grupo.addoption(
+        '--benchmark-pacientes', type=int, default=None,
+        help='Pacientes del dataset sintético (por defecto el de las referencias)',
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--benchmark'):
+        return
+    omitir = pytest.mark.skip(reason='benchmark: ejecutar con --benchmark')
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(omitir)
@@ -0,0 +1,58 @@
+from datetime import date, datetime
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from partosApp.analitica import calcular_indicadores
+from recienNacidoApp.models import RegistroRecienNacido
+
+
+def _admision(mes):
+    return timezone.make_aware(datetime(2025, mes, 15, 12, 0))
+
+
+def _rn(parto, peso, apgar_5):
+    RegistroRecienNacido.objects.create(
+        registro_parto=parto, sexo='FEMENINO', peso=peso, talla=50,
+        apgar_1_minuto=8, apgar_5_minutos=apgar_5, fecha_nacimiento=parto.fecha_hora_admision,
+    )
+
+
+def test_indicadores_por_mes_y_robson(crear_parto):
+    enero = crear_parto(fecha_hora_admision=_admision(1), tiempo_dilatacion=300, tiempo_expulsivo=30)
+    cesarea = crear_parto(
+        fecha_hora_admision=_admision(1),
+        tipo_parto='CESAREA_ELECTIVA',
+        clasificacion_robson='Grupo 2.B',
+    )
+    febrero = crear_parto(fecha_hora_admision=_admision(2), tiempo_dilatacion=200)
+    _rn(enero, 3200, 9)
+    _rn(cesarea, 2300, 5)
+    _rn(febrero, 4300, 3)
+
+    por_mes = calcular_indicadores(date(2025, 1, 1), date(2025, 3, 31), 'mes')
+    assert por_mes['total']['partos'] == 3
+    assert por_mes['total']['tasa_cesarea'] == 33.3
+    assert por_mes['total']['peso']['bajo_peso'] == 1
+    assert por_mes['total']['peso']['macrosomico'] == 1
+    assert por_mes['total']['apgar']['asfixia_severa'] == 1
+
+    enero_grupo, febrero_grupo = por_mes['grupos']
+    assert enero_grupo['grupo'] == 202501
+    assert enero_grupo['tasa_cesarea'] == 50.0
+    assert enero_grupo['duracion_parto'] == {'registradas': 1, 'promedio': 330.0, 'mediana': 330.0, 'p90': 330.0}
+    # Sin tiempo expulsivo la duración no se cuenta (como duracion_total_parto)
+    assert febrero_grupo['duracion_parto']['registradas'] == 0
+
+    por_robson = calcular_indicadores(date(2025, 1, 1), date(2025, 3, 31), 'robson')
+    robson = {grupo['grupo']: grupo for grupo in por_robson['grupos']}
+    assert robson['Grupo 2.B']['cesareas'] == 1
+    assert robson['Grupo 1']['peso']['recien_nacidos'] == 2
+
+
+@pytest.mark.django_db
+def test_api_indicadores_fecha_inexistente(client):
+    respuesta = client.get(reverse('partos:api_indicadores'), {'desde': '2024-02-30'})
+    assert respuesta.status_code == 400
+    assert 'error' in respuesta.json()
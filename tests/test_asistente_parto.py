@@ -0,0 +1,43 @@
+from django.urls import reverse
+
+from obstetric_care.metricas import PARTOS_REGISTRADOS
+from partosApp.asistente import PASOS
+from partosApp.models import RegistroParto
+
+
+def _datos_paso(formulario, parto):
+    """POST de un paso con los valores del parto de referencia"""
+    form = formulario(instance=parto)
+    datos = {}
+    for nombre in form.fields:
+        valor = form[nombre].value()
+        if valor is None or valor is False:
+            continue
+        datos[nombre] = valor.isoformat() if hasattr(valor, 'isoformat') else valor
+    return datos
+
+
+def test_asistente_crea_el_parto_solo_al_final(client, crear_parto):
+    referencia = crear_parto(tiempo_dilatacion=240, anestesia_neuroaxial=True)
+    ficha = referencia.ficha
+    urls = [reverse('partos:registrar_parto_paso1', args=[ficha.pk])] + [
+        reverse(f'partos:registrar_parto_paso{numero}') for numero in range(2, 7)
+    ]
+
+    for numero, (url, paso) in enumerate(zip(urls[:-1], PASOS[:-1]), start=1):
+        respuesta = client.post(url, _datos_paso(paso.formulario, referencia))
+        assert respuesta.url == urls[numero]
+        assert RegistroParto.objects.count() == 1
+        if numero == 1:
+            # No se puede saltar pasos
+            assert client.post(urls[3], {}).url == urls[1]
+
+    registrados = PARTOS_REGISTRADOS.valores.get(('asistente',), 0)
+    respuesta = client.post(urls[-1], _datos_paso(PASOS[-1].formulario, referencia))
+    assert PARTOS_REGISTRADOS.valores[('asistente',)] == registrados + 1
+    parto = RegistroParto.objects.exclude(pk=referencia.pk).get()
+    assert respuesta.url == reverse('partos:detalle_parto', args=[parto.pk])
+    assert parto.numero_registro and parto.numero_registro != referencia.numero_registro
+    assert parto.tiempo_dilatacion == 240
+    assert parto.anestesia_neuroaxial is True
+    assert 'borrador_parto' not in client.session
@@ -0,0 +1,26 @@
+from gestionApp.models import Paciente
+from partosApp.models import RegistroParto
+from recienNacidoApp.models import RegistroRecienNacido
+
+
+def test_banderas_en_sql_coinciden_con_los_metodos(crear_parto):
+    normal = crear_parto()
+    complicado = crear_parto(transfusion_sanguinea=True)
+    Paciente.objects.filter(pk=complicado.ficha.paciente_id).update(Eclampsia=True)
+
+    for peso, apgar in [(2400, 9), (3300, 5), (4100, 2), (4000, 7)]:
+        RegistroRecienNacido.objects.create(
+            registro_parto=normal, sexo='MASCULINO', peso=peso, talla=50,
+            apgar_1_minuto=apgar, apgar_5_minutos=apgar, fecha_nacimiento=normal.fecha_hora_admision,
+        )
+
+    assert list(RegistroParto.objects.con_complicaciones()) == [complicado]
+    partos = RegistroParto.objects.with_flags()
+    assert all(parto.tiene_complicaciones_db == parto.tiene_complicaciones() for parto in partos)
+    assert list(Paciente.objects.criticas().values_list('pk', flat=True)) == [complicado.ficha.paciente_id]
+
+    for rn in RegistroRecienNacido.objects.with_flags():
+        assert rn.estado_apgar_db == rn.estado_apgar()
+        assert rn.clasificacion_peso_db == rn.clasificacion_peso()
+    assert RegistroRecienNacido.objects.con_asfixia().count() == 2
+    assert RegistroRecienNacido.objects.bajo_peso().count() == 1
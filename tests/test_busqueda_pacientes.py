@@ -0,0 +1,92 @@
+import pytest
+from datetime import date
+
+from gestionApp.busqueda import es_consulta_rut, filtro_persona, ordenar_por_relevancia
+from gestionApp.models import Persona
+from utilidad.rut_validator import RutValidator
+
+
+def _persona(cuerpo, nombre):
+    return Persona.objects.create(
+        Rut=f"{cuerpo}-{RutValidator.calcular_dv(cuerpo)}",
+        Nombre=nombre,
+        Apellido_Paterno="Silva",
+        Apellido_Materno="Rivas",
+        Sexo="Femenino",
+        Fecha_nacimiento=date(1990, 1, 1),
+    )
+
+
+def test_es_consulta_rut():
+    assert es_consulta_rut('16.293.109-1')
+    assert es_consulta_rut('16293')
+    assert not es_consulta_rut('Ana')
+    assert not es_consulta_rut('12')
+
+
+@pytest.mark.django_db
+def test_busqueda_por_rut_usa_clave_normalizada():
+    ana = _persona('16293109', 'Ana')
+    _persona('16293200', 'Berta')
+
+    assert ana.rut_busqueda == RutValidator.limpiar(ana.Rut)
+
+    exacta = Persona.objects.filter(filtro_persona(RutValidator.formatear(ana.Rut), prefijo=''))
+    assert list(exacta) == [ana]
+
+    prefijo = Persona.objects.filter(filtro_persona('16.293', prefijo=''))
+    assert prefijo.count() == 2
+
+    por_nombre = Persona.objects.filter(filtro_persona('bert', prefijo=''))
+    assert [p.Nombre for p in por_nombre] == ['Berta']
+
+
+@pytest.mark.django_db
+def test_busqueda_por_tokens_ignora_tildes_y_orden():
+    munoz = _persona('11111111', 'Ana')
+    munoz.Apellido_Paterno = 'Muñoz'
+    munoz.save(update_fields=['Apellido_Paterno'])
+    _persona('22222222', 'Anabel')
+
+    resultado = Persona.objects.filter(filtro_persona('munoz ana', prefijo=''))
+    assert list(resultado) == [munoz]
+
+    ordenadas = ordenar_por_relevancia(
+        Persona.objects.filter(filtro_persona('ana', prefijo='')), 'ana', prefijo=''
+    )
+    assert [p.Nombre for p in ordenadas] == ['Ana', 'Anabel']
+
+
+@pytest.mark.django_db
+def test_api_tens_solo_retorna_paciente_con_rut_exacto(client):
+    from django.urls import reverse
+    from gestionApp.models import Paciente
+
+    ana = Paciente.objects.create(persona=_persona('16293109', 'Ana'), Estado_civil='SOLTERA', Previcion='FONASA_A')
+    Paciente.objects.create(persona=_persona('16293200', 'Anabel'), Estado_civil='SOLTERA', Previcion='FONASA_A')
+    url = reverse('tens:api_buscar_paciente')
+
+    exacta = client.get(url, {'rut': RutValidator.formatear(ana.persona.Rut)}).json()
+    assert exacta['encontrado'] and exacta['paciente']['id'] == ana.pk
+
+    # Un RUT parcial o un nombre nunca elige una paciente por sí solo
+    for consulta in ('16293', 'Ana'):
+        respuesta = client.get(url, {'rut': consulta}).json()
+        assert respuesta['encontrado'] is False
+        assert len(respuesta['candidatos']) == 2
+
+    inexistente = RutValidator.formatear('11111111-' + RutValidator.calcular_dv('11111111'))
+    assert client.get(url, {'rut': inexistente}).json()['encontrado'] is False
+
+
+def test_api_buscar_ficha_por_numero_solo_con_forma_de_numero(client, crear_ficha):
+    from django.urls import reverse
+
+    ficha = crear_ficha()
+    url = reverse('partos:api_buscar_ficha')
+
+    por_numero = client.get(url, {'q': ficha.numero_ficha[:5].lower()}).json()
+    assert [f['id'] for f in por_numero['fichas']] == [ficha.pk]
+
+    # Un fragmento interno del número ya no se busca con LIKE '%...%'
+    assert client.get(url, {'q': ficha.numero_ficha[3:]}).json()['fichas'] == []
@@ -0,0 +1,52 @@
+import pytest
+from django.core.management import call_command
+
+from gestionApp.contadores import obtener_contadores
+from gestionApp.models import Contador
+from medicoApp.models import Patologias
+
+
+def _patologia(**kwargs):
+    datos = {
+        'nombre': 'Preeclampsia',
+        'codigo_cie_10': 'O14',
+        'nivel_de_riesgo': 'Alto',
+        'estado': 'Activo',
+    }
+    datos.update(kwargs)
+    return Patologias.objects.create(**datos)
+
+
+@pytest.mark.django_db
+def test_contadores_se_mantienen_con_senales():
+    """Crear, desactivar y eliminar ajustan los contadores sin recontar."""
+    obtener_contadores('patologias_activas', 'patologias_inactivas', 'patologias_alto_riesgo')
+
+    patologia = _patologia()
+    _patologia(nombre='Anemia', codigo_cie_10='O99.0', nivel_de_riesgo='Bajo')
+    assert obtener_contadores('patologias_activas', 'patologias_alto_riesgo') == {
+        'patologias_activas': 2,
+        'patologias_alto_riesgo': 1,
+    }
+
+    patologia = Patologias.objects.get(pk=patologia.pk)
+    patologia.estado = 'Inactivo'
+    patologia.save()
+    assert obtener_contadores('patologias_activas', 'patologias_inactivas', 'patologias_alto_riesgo') == {
+        'patologias_activas': 1,
+        'patologias_inactivas': 1,
+        'patologias_alto_riesgo': 0,
+    }
+
+    patologia.delete()
+    assert obtener_contadores('patologias_inactivas')['patologias_inactivas'] == 0
+
+
+@pytest.mark.django_db
+def test_recalcular_contadores_corrige_desvios():
+    _patologia()
+    Contador.objects.filter(nombre='patologias_total').update(valor=99)
+
+    call_command('recalcular_contadores', 'patologias_total')
+
+    assert Contador.objects.get(nombre='patologias_total').valor == 1
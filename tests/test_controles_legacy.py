@@ -0,0 +1,83 @@
+from unittest import mock
+
+import pytest
+
+from django.core.cache import caches
+
+from legacyApp import controles
+
+
+def test_controles_previos_se_leen_una_vez_por_rut():
+    """La segunda lectura del mismo RUT no consulta la base legacy."""
+    caches[controles.LEGACY_CACHE_ALIAS].clear()
+    with mock.patch.object(controles, 'consultar_controles_previos', return_value=['ctrl']) as consulta:
+        assert controles.obtener_controles_previos('16.293.109-1') == ['ctrl']
+        assert controles.obtener_controles_previos(' 16293109-1 ') == ['ctrl']
+
+    consulta.assert_called_once_with('16293109-1')
+
+
+def test_invalidar_controles_previos():
+    caches[controles.LEGACY_CACHE_ALIAS].clear()
+    with mock.patch.object(controles, 'consultar_controles_previos', return_value=[]) as consulta:
+        controles.obtener_controles_previos('16293109-1')
+        controles.invalidar_controles_previos('16293109-1')
+        controles.obtener_controles_previos('16293109-1')
+        controles.invalidar_controles_previos()
+        controles.obtener_controles_previos('16293109-1')
+
+    assert consulta.call_count == 3
+
+
+@pytest.mark.django_db
+def test_sincronizacion_incremental_por_marca_de_agua():
+    """Solo se copian los controles legacy con id mayor al último sincronizado."""
+    import datetime
+    from legacyApp.models import ControlPrevioSnapshot
+
+    def fila(id_):
+        return {campo: None for campo in controles.CAMPOS_CONTROL} | {
+            'id': id_, 'paciente_rut': '16.293.109-1', 'fecha_control': datetime.date(2024, 1, id_),
+        }
+
+    legacy = [fila(i) for i in range(1, 6)]
+
+    def lote_legacy(desde, lote):
+        return [f for f in legacy if f['id'] > desde][:lote]
+
+    class QuerysetLegacy:
+        def __init__(self, desde=0):
+            self.desde = desde
+
+        def using(self, alias):
+            return self
+
+        def filter(self, id__gt):
+            return QuerysetLegacy(id__gt)
+
+        def order_by(self, *campos):
+            return self
+
+        def values(self, *campos):
+            return self
+
+        def __getitem__(self, corte):
+            return [dict(f) for f in lote_legacy(self.desde, corte.stop)]
+
+    with mock.patch.object(controles.ControlesPrevios, 'objects', QuerysetLegacy()):
+        assert controles.sincronizar_controles_previos(lote=2) == 5
+        legacy.append(fila(6))
+        assert controles.sincronizar_controles_previos(lote=2) == 1
+
+        # Una resincronización completa que falla a mitad no deja el snapshot vacío
+        def cortar(copiadas, ultimo_id):
+            raise ConnectionError('legacy no responde')
+        with pytest.raises(ConnectionError):
+            controles.sincronizar_controles_previos(lote=2, completo=True, progreso=cortar)
+        assert ControlPrevioSnapshot.objects.count() == 6
+
+        assert controles.sincronizar_controles_previos(lote=2, completo=True) == 6
+
+    assert ControlPrevioSnapshot.objects.count() == 6
+    assert controles.ultima_marca_sincronizada() == 6
+    assert ControlPrevioSnapshot.objects.filter(paciente_rut='16293109-1').count() == 6
@@ -0,0 +1,70 @@
+from unittest import mock
+
+import pytest
+
+from partosApp import epicrisis
+
+
+@pytest.fixture
+def carpeta_epicrisis(tmp_path, monkeypatch):
+    monkeypatch.setattr(epicrisis, 'EPICRISIS_DIR', str(tmp_path))
+    return tmp_path
+
+
+def test_epicrisis_se_reutiliza_hasta_que_cambia_el_parto(crear_parto, carpeta_epicrisis):
+    parto = crear_parto(observaciones='Sin incidentes <ok>')
+
+    with mock.patch.object(epicrisis, '_obtener_ejecutor') as ejecutor:
+        assert epicrisis.solicitar_epicrisis(parto.pk) == ('generando', None)
+        assert epicrisis.solicitar_epicrisis(parto.pk) == ('generando', None)
+    # La segunda solicitud no encola otra generación del mismo documento
+    ejecutor.return_value.submit.assert_called_once()
+
+    ruta = epicrisis.generar_epicrisis(parto.pk, epicrisis.version_epicrisis(parto.pk))
+    with open(ruta, 'rb') as pdf:
+        assert pdf.read(5) == b'%PDF-'
+    assert epicrisis.solicitar_epicrisis(parto.pk) == ('lista', ruta)
+
+    parto.observaciones = 'Editado'
+    parto.save()
+    with mock.patch.object(epicrisis, '_obtener_ejecutor'):
+        assert epicrisis.solicitar_epicrisis(parto.pk)[0] == 'generando'
+
+
+@pytest.mark.django_db
+def test_epicrisis_parto_inexistente(carpeta_epicrisis):
+    assert epicrisis.solicitar_epicrisis(999) == ('no_existe', None)
+
+
+def test_epicrisis_fallida_queda_en_error_sin_reencolar(crear_parto, carpeta_epicrisis, client):
+    from django.urls import reverse
+
+    parto = crear_parto()
+    version = epicrisis.version_epicrisis(parto.pk)
+    with mock.patch.object(epicrisis, 'escribir_pdf', side_effect=ValueError('dato corrupto')):
+        with pytest.raises(ValueError):
+            epicrisis.generar_epicrisis(parto.pk, version)
+
+    with mock.patch.object(epicrisis, '_obtener_ejecutor') as ejecutor:
+        assert epicrisis.solicitar_epicrisis(parto.pk) == ('error', None)
+        estado = client.get(reverse('partos:epicrisis_estado', args=[parto.pk]))
+        descarga = client.get(reverse('partos:epicrisis', args=[parto.pk]))
+    ejecutor.return_value.submit.assert_not_called()
+    assert estado.status_code == 500 and estado.json()['estado'] == 'error'
+    assert descarga.status_code == 500
+
+    # Una nueva versión del parto se vuelve a intentar
+    parto.observaciones = 'Corregido'
+    parto.save()
+    with mock.patch.object(epicrisis, '_obtener_ejecutor'):
+        assert epicrisis.solicitar_epicrisis(parto.pk) == ('generando', None)
+
+
+def test_version_cambia_al_editar_la_paciente(crear_parto):
+    parto = crear_parto()
+    antes = epicrisis.version_epicrisis(parto.pk)
+
+    persona = parto.ficha.paciente.persona
+    persona.Nombre = 'Ana María'
+    persona.save()
+    assert epicrisis.version_epicrisis(parto.pk) != antes
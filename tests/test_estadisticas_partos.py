@@ -0,0 +1,43 @@
+import pytest
+from datetime import date
+from django.core.cache import cache
+
+from partosApp.estadisticas import obtener_estadisticas_menu
+
+
+@pytest.mark.django_db
+def test_estadisticas_menu_una_consulta_por_tabla(django_assert_num_queries):
+    """
+    Los contadores del menú se calculan con una consulta por tabla
+    (RegistroParto y RegistroRecienNacido).
+    """
+    cache.clear()
+    with django_assert_num_queries(2):
+        stats = obtener_estadisticas_menu(fecha=date(2025, 1, 15))
+
+    assert set(stats) == {
+        'total_partos', 'partos_hoy', 'partos_mes', 'partos_eutocicos',
+        'cesareas', 'total_rn', 'rn_hoy',
+    }
+    assert all(valor == 0 for valor in stats.values())
+
+
+@pytest.mark.django_db
+def test_estadisticas_menu_usa_cache(django_assert_num_queries):
+    """Una segunda carga del mismo día no consulta la base de datos."""
+    cache.clear()
+    obtener_estadisticas_menu(fecha=date(2025, 1, 15))
+    with django_assert_num_queries(0):
+        obtener_estadisticas_menu(fecha=date(2025, 1, 15))
+
+
+@pytest.mark.django_db
+def test_nuevo_parto_invalida_cache_del_menu(crear_parto, django_capture_on_commit_callbacks):
+    """Guardar un parto borra la caché del día: el menú lo muestra de inmediato."""
+    cache.clear()
+    assert obtener_estadisticas_menu()['total_partos'] == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        crear_parto()
+
+    assert obtener_estadisticas_menu()['total_partos'] == 1
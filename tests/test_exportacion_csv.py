@@ -0,0 +1,38 @@
+import pytest
+from django.urls import reverse
+
+from gestionApp.exportaciones import EXPORTACIONES
+from gestionApp.models import Contador
+from utilidad.exportacion_csv import filas_csv
+
+
+@pytest.mark.django_db
+def test_filas_csv_recorre_todos_los_bloques():
+    for i in range(5):
+        Contador.objects.create(nombre=f'c{i}', valor=i)
+
+    lineas = list(filas_csv(Contador.objects.all(), [('Nombre', 'nombre'), ('Valor', 'valor')], tamano=2))
+
+    assert lineas[0] == '\ufeffNombre;Valor\r\n'
+    assert lineas[1:] == [f'c{i};{i}\r\n' for i in range(5)]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('tabla', sorted(EXPORTACIONES))
+def test_exportar_csv_por_tabla(client, tabla):
+    respuesta = client.get(reverse('gestion:exportar_csv', args=[tabla]), {'desde': '2024-01-01'})
+
+    assert respuesta.status_code == 200
+    assert respuesta['Content-Disposition'] == f'attachment; filename="{EXPORTACIONES[tabla].nombre_archivo}.csv"'
+    assert b''.join(respuesta.streaming_content).startswith('\ufeff'.encode())
+
+
+@pytest.mark.django_db
+def test_exportar_csv_tabla_desconocida(client):
+    assert client.get(reverse('gestion:exportar_csv', args=['personas'])).status_code == 404
+
+
+@pytest.mark.django_db
+def test_exportar_csv_fecha_inexistente(client):
+    url = reverse('gestion:exportar_csv', args=['fichas_obstetricas'])
+    assert client.get(url, {'hasta': '2024-02-30'}).status_code == 400
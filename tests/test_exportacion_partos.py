@@ -0,0 +1,78 @@
+from datetime import date, datetime
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from openpyxl import load_workbook
+
+from django.utils import timezone
+
+from partosApp.exportacion import COLUMNAS, escribir_xlsx, filtrar_partos
+from recienNacidoApp.models import DocumentosParto, RegistroRecienNacido
+
+
+def _admision(dia):
+    return timezone.make_aware(datetime(2025, 3, dia, 8, 0))
+
+
+def _rn(parto, sexo, peso):
+    return RegistroRecienNacido.objects.create(
+        registro_parto=parto, sexo=sexo, peso=peso, talla=49,
+        apgar_1_minuto=8, apgar_5_minutos=9, fecha_nacimiento=parto.fecha_hora_admision,
+    )
+
+
+@pytest.mark.django_db
+def test_exportacion_xlsx_escribe_encabezados(tmp_path):
+    destino = tmp_path / 'partos.xlsx'
+
+    filas = escribir_xlsx(str(destino), filtrar_partos())
+
+    assert filas == 0
+    hoja = load_workbook(destino, read_only=True)['Partos']
+    encabezados = next(hoja.iter_rows(values_only=True))
+    assert list(encabezados) == [titulo for titulo, _campo, _formato in COLUMNAS]
+
+
+@pytest.mark.django_db
+def test_exportacion_rechaza_fechas_inexistentes(client, tmp_path):
+    respuesta = client.get(reverse('partos:exportar_xlsx'), {'fecha_desde': '2024-02-30'})
+    assert respuesta.status_code == 400
+
+    with pytest.raises(CommandError):
+        call_command('exportar_partos', str(tmp_path / 'partos.xlsx'), desde='2024-02-30')
+
+
+def test_exportacion_una_fila_por_rn_con_documentos(crear_parto, tmp_path):
+    gemelar = crear_parto(fecha_hora_admision=_admision(5), tipo_parto='CESAREA_URGENCIA')
+    primero = _rn(gemelar, 'FEMENINO', 2400)
+    _rn(gemelar, 'MASCULINO', 2550)
+    DocumentosParto.objects.create(
+        registro_recien_nacido=primero, folio_valido='F-100', retira_placenta=True,
+    )
+    sin_rn = crear_parto(fecha_hora_admision=_admision(20))
+    crear_parto(fecha_hora_admision=_admision(28), activo=False)
+
+    destino = tmp_path / 'partos.xlsx'
+    assert escribir_xlsx(str(destino), filtrar_partos(), tamano_bloque=1) == 3
+
+    hoja = load_workbook(destino, read_only=True)['Partos']
+    encabezados, *filas = hoja.iter_rows(values_only=True)
+    columna = {titulo: indice for indice, titulo in enumerate(encabezados)}
+    assert [fila[columna['N° Registro']] for fila in filas] == [
+        gemelar.numero_registro, gemelar.numero_registro, sin_rn.numero_registro,
+    ]
+
+    gemelo_1, gemelo_2, solo_parto = filas
+    assert gemelo_1[columna['Tipo de Parto']] == 'Cesárea de Urgencia'
+    assert gemelo_1[columna['RUT Paciente']] == gemelar.ficha.paciente.persona.Rut
+    assert (gemelo_1[columna['RN Peso (g)']], gemelo_2[columna['RN Peso (g)']]) == (2400, 2550)
+    assert gemelo_1[columna['Folio Válido']] == 'F-100'
+    assert gemelo_1[columna['Retira Placenta']] == 'Sí'
+    assert gemelo_2[columna['Folio Válido']] is None
+    assert solo_parto[columna['RN Sexo']] is None
+    assert solo_parto[columna['Fecha Admisión']] == datetime(2025, 3, 20, 8, 0)
+
+    # Filtro por fecha de admisión (inclusive)
+    marzo_inicio = filtrar_partos(fecha_desde=date(2025, 3, 1), fecha_hasta=date(2025, 3, 5))
+    assert escribir_xlsx(str(tmp_path / 'inicio.xlsx'), marzo_inicio) == 2
@@ -0,0 +1,43 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+
+from gestionApp.busqueda import buscar_pacientes
+from gestionApp.contadores import obtener_contadores
+from gestionApp.dataset import GeneradorDataset
+from gestionApp.models import Paciente, Persona
+from matronaApp.models import FichaObstetrica
+from partosApp.models import RegistroParto
+from recienNacidoApp.models import DocumentosParto, RegistroRecienNacido
+from utilidad.rut_validator import RutValidator
+
+
+def test_generar_dataset(db):
+    call_command('generar_dataset', '--pacientes', '60', '--lote', '25', '--semilla', '3',
+                 '--matronas', '2', '--tens', '2', stdout=StringIO())
+
+    assert Paciente.objects.count() == 60
+    assert all(RutValidator.validar(rut) for rut in Persona.objects.values_list('Rut', flat=True))
+    assert FichaObstetrica.objects.filter(activa=True).count() == 60
+    assert RegistroParto.objects.count() > 0
+    assert not RegistroParto.objects.filter(numero_registro='').exists()
+    assert DocumentosParto.objects.count() == RegistroRecienNacido.objects.count()
+    assert obtener_contadores('pacientes_activos')['pacientes_activos'] == 60
+    nombre = Persona.objects.filter(paciente__isnull=False).values_list('Nombre', flat=True).first()
+    assert buscar_pacientes(nombre).exists()
+
+
+def test_misma_semilla_mismo_dataset(db, monkeypatch):
+    # Camino de MySQL: bulk_create no retorna los id
+    monkeypatch.setattr(type(connection.features), 'can_return_rows_from_bulk_insert', False)
+    totales = GeneradorDataset(semilla=11).generar(10, matronas=1, tens=1)
+    nombres = list(Persona.objects.order_by('pk').values_list('Nombre', 'Apellido_Paterno'))
+    pesos = list(RegistroRecienNacido.objects.order_by('pk').values_list('peso', flat=True))
+
+    RegistroParto.objects.all().delete()
+    FichaObstetrica.objects.all().delete()
+    Persona.objects.all().delete()
+    assert GeneradorDataset(semilla=11).generar(10, matronas=1, tens=1) == totales
+    assert list(Persona.objects.order_by('pk').values_list('Nombre', 'Apellido_Paterno')) == nombres
+    assert list(RegistroRecienNacido.objects.order_by('pk').values_list('peso', flat=True)) == pesos
@@ -0,0 +1,46 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from gestionApp.models import Persona
+from matronaApp.models import FichaObstetrica
+from utilidad.rut_validator import RutValidator
+
+
+def test_guardar_cambios_escribe_solo_lo_modificado(crear_ficha):
+    ficha = FichaObstetrica.objects.get(pk=crear_ficha().pk)
+
+    with CaptureQueriesContext(connection) as consultas:
+        assert ficha.guardar_cambios() == []
+    assert len(consultas) == 0
+
+    ficha.activa = False
+    with CaptureQueriesContext(connection) as consultas:
+        assert ficha.guardar_cambios() == ['activa']
+    tabla = connection.ops.quote_name(FichaObstetrica._meta.db_table)
+    actualizaciones = [q['sql'] for q in consultas if q['sql'].startswith(f'UPDATE {tabla}')]
+    assert len(actualizaciones) == 1
+    assert connection.ops.quote_name('numero_ficha') not in actualizaciones[0]
+    assert FichaObstetrica.objects.get(pk=ficha.pk).activa is False
+
+
+def test_persona_con_update_fields_no_busca_rut_duplicado(crear_ficha):
+    persona = Persona.objects.get(pk=crear_ficha().paciente.persona_id)
+    persona.Nombre = 'Josefa'
+
+    with CaptureQueriesContext(connection) as consultas:
+        assert persona.guardar_cambios() == ['Nombre']
+    # Sin SELECT de unicidad del RUT (full_clean solo valida los campos guardados)
+    rut = connection.ops.quote_name('Rut')
+    assert not [q for q in consultas if q['sql'].startswith('SELECT') and rut in q['sql']]
+    assert Persona.objects.get(pk=persona.pk).Nombre == 'Josefa'
+
+
+def test_guardar_cambios_de_instancia_nueva_retorna_todos_los_campos(crear_ficha):
+    persona = Persona.objects.get(pk=crear_ficha().paciente.persona_id)
+    persona.pk = None
+    persona._state.adding = True
+    persona.Rut = f"11111111-{RutValidator.calcular_dv('11111111')}"
+
+    campos = persona.guardar_cambios()
+    assert campos == [campo.name for campo in Persona._meta.concrete_fields]
+    assert 'Rut' in campos
@@ -0,0 +1,64 @@
+from io import StringIO
+
+from django.core.management import call_command
+from openpyxl import Workbook
+
+from gestionApp.ingesta import ingresar_pacientes
+from gestionApp.models import Paciente
+from utilidad.rut_validator import RutValidator
+
+
+def _rut(cuerpo):
+    return f"{cuerpo}-{RutValidator.calcular_dv(str(cuerpo))}"
+
+
+ENCABEZADOS = ['RUT', 'Nombre', 'Apellido Paterno', 'Apellido Materno', 'Sexo',
+               'Fecha de nacimiento', 'Estado Civil', 'Previsión', 'Consultorio de Origen']
+
+
+def test_importar_csv_con_actualizacion_y_rechazos(db, tmp_path):
+    ingresar_pacientes([{
+        'Rut': _rut(31000001), 'Nombre': 'Ana', 'Apellido_Paterno': 'Soto', 'Apellido_Materno': 'Paz',
+        'Sexo': 'Femenino', 'Fecha_nacimiento': '1990-01-01', 'Estado_civil': 'SOLTERA', 'Previcion': 'FONASA_A',
+    }])
+
+    archivo = tmp_path / 'censo.csv'
+    filas = [
+        ';'.join(ENCABEZADOS),
+        f"{_rut(31000001)};Ana;Soto;Paz;Femenino;01/01/1990;CASADA;ISAPRE;CESFAM Los Volcanes (Chillán)",
+        f"31.000.002-{RutValidator.calcular_dv('31000002')};Bea;Rojas;Luna;femenino;15-06-1994;Soltera;FONASA_B;",
+        '',
+        f"{_rut(31000003)};Carla;Vera;Mora;Femenino;31/02/1990;SOLTERA;FONASA_A;",
+        "31000004-0;Dora;Diaz;Lara;Femenino;01/01/1990;SOLTERA;FONASA_A;",
+    ]
+    archivo.write_text('\n'.join(filas) + '\n', encoding='utf-8-sig')
+
+    salida = StringIO()
+    call_command('importar_pacientes', str(archivo), '--lote', '2', stdout=salida)
+
+    actualizada = Paciente.objects.get(persona__Rut=_rut(31000001))
+    assert (actualizada.Estado_civil, actualizada.Previcion) == ('CASADA', 'ISAPRE')
+    assert actualizada.Consultorio == 'CESFAM_LOS_VOLCANES'
+    nueva = Paciente.objects.get(persona__Rut=_rut(31000002))
+    assert str(nueva.persona.Fecha_nacimiento) == '1994-06-15'
+    assert nueva.Consultorio == 'SIN_ESPECIFICAR'
+    assert Paciente.objects.count() == 2
+
+    rechazos = (tmp_path / 'censo.csv.rechazos.csv').read_text(encoding='utf-8').splitlines()
+    assert [linea.split(',')[0] for linea in rechazos] == ['fila', '5', '6']
+    assert 'Actualizadas: 1' in salida.getvalue()
+
+
+def test_importar_xlsx(db, tmp_path):
+    libro = Workbook()
+    hoja = libro.active
+    hoja.append(ENCABEZADOS)
+    for numero in range(1, 6):
+        hoja.append([_rut(32000000 + numero), 'Eva', 'Lagos', 'Rey', 'Femenino',
+                     '01/03/1992', 'SOLTERA', 'FONASA_C', None])
+    archivo = tmp_path / 'censo.xlsx'
+    libro.save(archivo)
+
+    call_command('importar_pacientes', str(archivo), '--consultorio', 'CESFAM_QUINCHAMALI', stdout=StringIO())
+
+    assert Paciente.objects.filter(Consultorio='CESFAM_QUINCHAMALI').count() == 5
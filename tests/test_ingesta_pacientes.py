@@ -0,0 +1,73 @@
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from gestionApp.busqueda import buscar_pacientes
+from gestionApp.contadores import obtener_contadores
+from gestionApp.ingesta import ingresar_pacientes
+from gestionApp.models import Paciente, Persona
+from utilidad.rut_validator import RutValidator
+
+
+def _registro(cuerpo, **datos):
+    return {
+        'Rut': f"{cuerpo}-{RutValidator.calcular_dv(str(cuerpo))}",
+        'Nombre': 'Ana',
+        'Apellido_Paterno': 'Muñoz',
+        'Apellido_Materno': 'Rivas',
+        'Sexo': 'Femenino',
+        'Fecha_nacimiento': date(1995, 3, 15),
+        'Estado_civil': 'SOLTERA',
+        'Previcion': 'FONASA_A',
+        **datos,
+    }
+
+
+def test_ingesta_por_lotes(db):
+    obtener_contadores('pacientes_activos')
+    ingresar_pacientes([_registro(30000001)])
+
+    registros = [_registro(30000000 + numero) for numero in range(1, 51)]
+    registros.append(_registro(30000002))                        # repetido en la entrada
+    registros.append({**_registro(30000099), 'Rut': '30000099-1'})  # DV incorrecto (es 0)
+    registros.append(_registro(30000098, Previcion='NO_EXISTE'))
+
+    with CaptureQueriesContext(connection) as consultas:
+        resultado = ingresar_pacientes(registros, tamano_lote=25)
+
+    assert resultado.creados == 49
+    assert resultado.existentes == ['30000001-' + RutValidator.calcular_dv('30000001')]
+    assert [posicion for posicion, _rut, _motivo in resultado.rechazados] == [51, 52, 53]
+    # Las consultas dependen de la cantidad de lotes, no de filas
+    assert len(consultas) < 40
+
+    assert Paciente.objects.count() == 50
+    assert Persona.objects.filter(rut_busqueda='30000002' + RutValidator.calcular_dv('30000002')).exists()
+    assert buscar_pacientes('munoz ana').count() == 50
+    assert obtener_contadores('pacientes_activos')['pacientes_activos'] == 50
+
+
+def test_cargar_pacientes(db):
+    call_command('cargar_pacientes', stdout=StringIO())
+    assert Paciente.objects.count() == 4
+
+
+def test_actualizacion_parcial_valida_solo_los_campos_recibidos(db):
+    ingresar_pacientes([_registro(30000001), _registro(30000002), _registro(30000004)])
+    rut = _registro(30000001)['Rut']
+
+    resultado = ingresar_pacientes([
+        {'Rut': rut, 'Previcion': 'ISAPRE'},
+        {**_registro(30000002), 'Apellido_Materno': 'Soto'},
+        {'Rut': _registro(30000003)['Rut'], 'Previcion': 'ISAPRE'},   # nueva: requiere todos los campos
+        {'Rut': _registro(30000004)['Rut'], 'Previcion': 'NO_EXISTE'},      # existente: se valida lo recibido
+    ], actualizar=True)
+
+    assert resultado.actualizados == 2
+    assert [posicion for posicion, _rut, _motivo in resultado.rechazados] == [3, 4]
+    paciente = Paciente.objects.select_related('persona').get(persona__Rut=rut)
+    assert paciente.Previcion == 'ISAPRE'
+    assert paciente.persona.Nombre == 'Ana' and paciente.Estado_civil == 'SOLTERA'
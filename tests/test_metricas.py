@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from obstetric_care.metricas import DURACION_VISTAS, Registro
+
+
+def test_exposicion_de_contadores_e_histogramas():
+    registro = Registro()
+    partos = registro.contador('partos_total', 'Partos', ['origen'])
+    duracion = registro.histograma('duracion_segundos', 'Duración', ['vista'], limites=(0.1, 1))
+
+    partos.inc(origen='asistente')
+    partos.inc(2, origen='asistente')
+    partos.inc(origen='completo')
+    for segundos in (0.05, 0.5, 3):
+        duracion.observar(segundos, vista='partos:listar_partos')
+
+    texto = registro.exponer()
+    assert '# TYPE obstetric_care_partos_total counter' in texto
+    assert 'obstetric_care_partos_total{origen="asistente"} 3' in texto
+    assert 'obstetric_care_partos_total{origen="completo"} 1' in texto
+    assert 'obstetric_care_duracion_segundos_bucket{vista="partos:listar_partos",le="0.1"} 1' in texto
+    assert 'obstetric_care_duracion_segundos_bucket{vista="partos:listar_partos",le="1"} 2' in texto
+    assert 'obstetric_care_duracion_segundos_bucket{vista="partos:listar_partos",le="+Inf"} 3' in texto
+    assert 'obstetric_care_duracion_segundos_count{vista="partos:listar_partos"} 3' in texto
+
+
+def test_agrega_los_archivos_de_todos_los_procesos(tmp_path):
+    registro = Registro(directorio=tmp_path)
+    partos = registro.contador('partos_total', 'Partos', ['origen'])
+    duracion = registro.histograma('duracion_segundos', 'Duración', limites=(1,))
+    partos.inc(origen='asistente')
+    duracion.observar(0.5)
+
+    # Instantánea de otro worker (incluido uno que ya terminó)
+    (tmp_path / 'metricas_1.json').write_text(json.dumps({
+        'obstetric_care_partos_total': [[['asistente'], 4]],
+        'obstetric_care_duracion_segundos': [[[], {'intervalos': [0, 2], 'suma': 7.0}]],
+    }))
+
+    texto = registro.exponer()
+    assert 'obstetric_care_partos_total{origen="asistente"} 5' in texto
+    assert 'obstetric_care_duracion_segundos_bucket{le="1"} 1' in texto
+    assert 'obstetric_care_duracion_segundos_count 3' in texto
+    assert 'obstetric_care_duracion_segundos_sum 7.5' in texto
+
+
+def test_endpoint_requiere_token(client, settings):
+    settings.METRICAS_TOKEN = 'secreto'
+
+    respuesta = client.get('/metricas/', HTTP_AUTHORIZATION='Bearer secreto')
+    assert respuesta.status_code == 200
+    assert respuesta['Content-Type'].startswith('text/plain; version=0.0.4')
+    assert 'obstetric_care_partos_registrados_total' in respuesta.content.decode()
+    assert ('metricas', 'GET') in DURACION_VISTAS.valores
+
+    # Detrás del proxy todo llega desde 127.0.0.1: la IP no basta
+    assert client.get('/metricas/', REMOTE_ADDR='127.0.0.1').status_code == 404
+    assert client.get('/metricas/', HTTP_AUTHORIZATION='Bearer otro').status_code == 404
+
+
+@pytest.mark.django_db
+def test_endpoint_permite_staff(client, django_user_model):
+    staff = django_user_model.objects.create_user('admin', password='x', is_staff=True)
+    client.force_login(staff)
+    assert client.get('/metricas/').status_code == 200
@@ -0,0 +1,39 @@
+import pytest
+
+from gestionApp.models import Contador
+from utilidad.paginacion import paginar_keyset
+
+
+@pytest.mark.django_db
+def test_paginacion_keyset_recorre_todo_sin_repetir():
+    """Con valores repetidos en el primer campo el id desempata sin saltos."""
+    for i in range(7):
+        Contador.objects.create(nombre=f'c{i}', valor=i // 3)
+
+    orden = ['-valor', 'id']
+    vistos = []
+    cursor = None
+    while True:
+        pagina = paginar_keyset(Contador.objects.all(), orden, cursor=cursor, tamano=3)
+        vistos.extend(c.nombre for c in pagina)
+        if not pagina.hay_mas:
+            break
+        cursor = pagina.siguiente_cursor
+
+    esperado = list(Contador.objects.order_by(*orden).values_list('nombre', flat=True))
+    assert vistos == esperado
+
+
+def test_cursor_invalido():
+    with pytest.raises(ValueError):
+        paginar_keyset(Contador.objects.all(), ['-valor', 'id'], cursor='no-es-un-cursor')
+
+
+@pytest.mark.django_db
+def test_listado_fichas_escapa_activa_en_el_script(client):
+    from django.urls import reverse
+
+    respuesta = client.get(reverse('matrona:todas_fichas'), {'activa': "1');alert(1);//"})
+    html = respuesta.content.decode()
+    assert "params.set('activa', '1\\u0027)\\u003Balert(1)\\u003B//')" in html
+    assert "alert(1);//'" not in html
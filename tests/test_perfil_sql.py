@@ -0,0 +1,45 @@
+import json
+import logging
+
+from django.urls import reverse
+
+from obstetric_care.middleware import firma_sql
+
+
+def _registros(caplog, logger):
+    return [json.loads(r.getMessage()) for r in caplog.records if r.name == logger]
+
+
+def test_firma_colapsa_listas_in():
+    assert firma_sql('SELECT 1 WHERE id IN (%s, %s, %s)') == firma_sql('SELECT 1 WHERE id IN (%s)')
+
+
+def test_request_muestreado(client, crear_ficha, settings, caplog):
+    settings.PERFIL_SQL_MUESTREO = 1
+    settings.PERFIL_SQL_REPETIDAS = 1000
+    settings.PERFIL_SQL_UMBRAL_MS = 60000
+    crear_ficha()
+
+    with caplog.at_level(logging.INFO, logger='obstetric_care'):
+        client.get(reverse('matrona:lista_pacientes'))
+
+    registro, = _registros(caplog, 'obstetric_care.sql')
+    assert registro['vista'] == 'matrona:lista_pacientes'
+    assert registro['consultas'] == registro['por_alias']['default']['consultas'] > 0
+    assert _registros(caplog, 'obstetric_care.vistas_lentas') == []
+
+
+def test_consultas_repetidas_y_sin_muestreo(client, crear_ficha, settings, caplog):
+    settings.PERFIL_SQL_MUESTREO = 1
+    settings.PERFIL_SQL_REPETIDAS = 2
+    for _ in range(3):
+        crear_ficha()
+
+    with caplog.at_level(logging.INFO, logger='obstetric_care'):
+        client.get(reverse('gestion:lista_personas'))
+        settings.PERFIL_SQL_MUESTREO = 0
+        client.get(reverse('gestion:lista_personas'))
+
+    lento, = _registros(caplog, 'obstetric_care.vistas_lentas')
+    assert lento['repetidas'] and lento['repetidas'][0]['veces'] >= 2
+    assert len(_registros(caplog, 'obstetric_care.sql')) == 1
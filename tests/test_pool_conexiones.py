@@ -0,0 +1,64 @@
+import pytest
+
+from obstetric_care.db_backends.mysql import pool as modulo_pool
+from obstetric_care.db_backends.mysql.pool import Pool, PoolAgotado
+from obstetric_care.metricas import DB_POOL_AGOTADO, DB_POOL_CONEXIONES
+
+
+class Conexion:
+    """Conexión mínima: el pool solo usa ping() y close()"""
+    def __init__(self, viva=True):
+        self.viva = viva
+        self.cerrada = False
+
+    def ping(self, reconnect=False):
+        if not self.viva:
+            raise ConnectionError
+
+    def close(self):
+        self.cerrada = True
+
+
+def test_reutiliza_las_conexiones_devueltas():
+    pool = Pool('prueba_reuso', max_size=2, timeout=0.1)
+    primera = pool.obtener(Conexion)
+    assert DB_POOL_CONEXIONES.valores[('prueba_reuso', 'en_uso')] == 1
+    pool.devolver(primera)
+    assert DB_POOL_CONEXIONES.valores[('prueba_reuso', 'libre')] == 1
+
+    assert pool.obtener(Conexion) is primera
+
+    # Una conexión con la transacción abierta o errores no vuelve al pool
+    pool.devolver(primera, reutilizable=False)
+    assert primera.cerrada
+    assert pool.obtener(Conexion) is not primera
+
+
+def test_pool_agotado_falla_despues_del_timeout():
+    pool = Pool('prueba_agotado', max_size=1, timeout=0.05)
+    conexion = pool.obtener(Conexion)
+    with pytest.raises(PoolAgotado):
+        pool.obtener(Conexion)
+    assert DB_POOL_AGOTADO.valores[('prueba_agotado',)] == 1
+
+    pool.devolver(conexion)
+    assert pool.obtener(Conexion) is conexion
+
+
+def test_descarta_conexiones_caidas_o_vencidas(monkeypatch):
+    monkeypatch.setattr(modulo_pool, 'REVISAR_DESPUES', -1)
+    pool = Pool('prueba_revision', max_size=2, timeout=0.1, max_idle=60)
+    caida = pool.obtener(Conexion)
+    pool.devolver(caida)
+    caida.viva = False
+
+    nueva = pool.obtener(Conexion)
+    assert nueva is not caida and caida.cerrada
+
+    # Si falla la conexión nueva, el cupo se libera
+    def fallar():
+        raise OSError('sin servidor')
+    with pytest.raises(OSError):
+        pool.obtener(fallar)
+    pool.devolver(nueva)
+    assert pool.obtener(Conexion) is nueva
@@ -0,0 +1,131 @@
+from datetime import date, time, timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from gestionApp.models import Persona, Tens
+from tensApp.models import Tratamiento_aplicado
+from tensApp.reportes import FiltrosTratamientos, pagina_tratamientos, total_tratamientos
+from utilidad.rut_validator import RutValidator
+
+
+def _tens(cuerpo):
+    persona = Persona.objects.create(
+        Rut=f"{cuerpo}-{RutValidator.calcular_dv(cuerpo)}",
+        Nombre='Tomás', Apellido_Paterno='Rojas', Apellido_Materno='Soto',
+        Sexo='Masculino', Fecha_nacimiento=date(1985, 5, 5),
+    )
+    return Tens.objects.create(
+        persona=persona, Nivel='Parto', Años_experiencia=3, Turno='Noche', Certificaciones='SVB',
+    )
+
+
+@pytest.fixture
+def tratamientos(crear_ficha):
+    """60 tratamientos en 20 días: 2 TENS, uno de cada cuatro inactivo"""
+    ficha, otra_ficha = crear_ficha(), crear_ficha()
+    tens = [_tens('17000001'), _tens('17000002')]
+    filas = [
+        Tratamiento_aplicado(
+            ficha=ficha if i % 3 else otra_ficha,
+            paciente=(ficha if i % 3 else otra_ficha).paciente,
+            tens=tens[i % 2],
+            nombre_medicamento=f'Medicamento {i}',
+            fecha_aplicacion=date(2025, 4, 1) + timedelta(days=i // 3),
+            hora_aplicacion=time(8 + i % 3, 0),
+            activo=bool(i % 4),
+        )
+        for i in range(60)
+    ]
+    Tratamiento_aplicado.objects.bulk_create(filas)
+    cache.clear()
+    return {'ficha': ficha, 'tens': tens}
+
+
+def test_filtros_desde_request_ignora_valores_invalidos():
+    request = RequestFactory().get('/', {
+        'fecha_desde': '2024-03-01',
+        'fecha_hasta': 'no-es-fecha',
+        'tens': 'x',
+        'ficha': ' fo-000010 ',
+    })
+    filtros = FiltrosTratamientos.desde_request(request, activo=True)
+
+    assert filtros == FiltrosTratamientos(
+        activo=True,
+        fecha_desde=date(2024, 3, 1),
+        numero_ficha='FO-000010',
+    )
+    assert filtros.querystring() == 'fecha_desde=2024-03-01&ficha=FO-000010'
+
+
+def _recorrer(filtros, tamano):
+    """Todas las páginas: (ids en orden, consultas por página)"""
+    ids, consultas, cursor = [], [], None
+    while True:
+        with CaptureQueriesContext(connection) as capturadas:
+            pagina = pagina_tratamientos(filtros, cursor=cursor, tamano=tamano)
+            ids += [t.pk for t in pagina]
+            assert all(t.tens.persona.Nombre and t.ficha.numero_ficha for t in pagina)
+        consultas.append(len(capturadas))
+        if not pagina.hay_mas:
+            return ids, consultas
+        cursor = pagina.siguiente_cursor
+
+
+def test_paginas_cubren_el_orden_completo_sin_repetir(tratamientos):
+    esperado = list(
+        Tratamiento_aplicado.objects.order_by('-fecha_aplicacion', '-hora_aplicacion', 'id')
+        .values_list('pk', flat=True)
+    )
+    ids, consultas = _recorrer(FiltrosTratamientos(), tamano=10)
+
+    assert ids == esperado
+    assert len(consultas) == 6
+    # La última página cuesta lo mismo que la primera (sin OFFSET ni N+1)
+    assert len(set(consultas)) == 1
+
+
+def test_filtros_aplicados_a_pagina_y_total(tratamientos):
+    tens = tratamientos['tens'][0]
+    filtros = FiltrosTratamientos(
+        activo=True,
+        fecha_desde=date(2025, 4, 3),
+        fecha_hasta=date(2025, 4, 8),
+        tens_id=tens.pk,
+        numero_ficha=tratamientos['ficha'].numero_ficha,
+    )
+    esperado = Tratamiento_aplicado.objects.filter(
+        activo=True, tens=tens, ficha=tratamientos['ficha'],
+        fecha_aplicacion__range=(date(2025, 4, 3), date(2025, 4, 8)),
+    )
+
+    ids, _consultas = _recorrer(filtros, tamano=2)
+    assert sorted(ids) == sorted(esperado.values_list('pk', flat=True))
+    assert total_tratamientos(filtros) == esperado.count() > 0
+    assert total_tratamientos(FiltrosTratamientos(numero_ficha='FO-999999')) == 0
+
+
+def test_vista_reporte_pagina_con_cursor(client, tratamientos):
+    url = reverse('tens:listar_tratamientos')
+
+    primera = client.get(url)
+    assert primera.status_code == 200
+    assert primera.context['total_tratamientos'] == 60
+    assert len(primera.context['tratamientos']) == 50
+
+    segunda = client.get(url, {'cursor': primera.context['siguiente_cursor']})
+    assert len(segunda.context['tratamientos']) == 10
+    assert segunda.context['siguiente_cursor'] is None
+    assert not segunda.context['es_primera_pagina']
+
+    activos = client.get(reverse('tens:listar_tratamientos_activos'))
+    assert activos.context['total_tratamientos'] == 45
+
+    invalido = client.get(url, {'cursor': 'no-es-un-cursor'})
+    assert invalido.status_code == 200
+    assert [t.pk for t in invalido.context['tratamientos']] == [t.pk for t in primera.context['tratamientos']]
@@ -0,0 +1,51 @@
+from datetime import date, datetime, timedelta
+
+from django.utils import timezone
+
+from partosApp import resumen
+
+
+def _admision(dia):
+    return timezone.make_aware(datetime(2025, 1, dia, 12, 0))
+
+
+def test_resumen_incremental_y_suma_por_rango(crear_parto, monkeypatch):
+    monkeypatch.setattr(resumen, 'MARGEN_MARCA', timedelta(0))
+    crear_parto(fecha_hora_admision=_admision(10))
+    crear_parto(fecha_hora_admision=_admision(10), anestesia_neuroaxial=True)
+    cesarea = crear_parto(
+        fecha_hora_admision=_admision(20),
+        tipo_parto='CESAREA_URGENCIA',
+        clasificacion_robson='Grupo 2.B',
+    )
+
+    assert resumen.actualizar_resumen() == (2, 3)
+    enero = resumen.estadisticas_rango(date(2025, 1, 1), date(2025, 1, 31))
+    assert enero['total'] == 3
+    assert enero['por_tipo'] == {'CESAREA_URGENCIA': 1, 'EUTOCICO': 2}
+    assert enero['por_robson'] == {'Grupo 1': 2, 'Grupo 2.B': 1}
+    assert enero['analgesia']['anestesia_neuroaxial'] == 1
+
+    # Solo se recalcula el día del parto modificado
+    cesarea.activo = False
+    cesarea.save()
+    assert resumen.actualizar_resumen() == (1, 0)
+    desde, hasta, _nombre = resumen.rango_periodo('trimestre', date(2025, 2, 14))
+    assert (desde, hasta) == (date(2025, 1, 1), date(2025, 3, 31))
+    assert resumen.estadisticas_rango(desde, hasta)['por_tipo'] == {'EUTOCICO': 2}
+
+
+def test_cambio_de_fecha_recalcula_tambien_el_dia_anterior(crear_parto, monkeypatch):
+    monkeypatch.setattr(resumen, 'MARGEN_MARCA', timedelta(0))
+    parto = crear_parto(fecha_hora_admision=_admision(10))
+    resumen.actualizar_resumen()
+
+    parto = type(parto).objects.get(pk=parto.pk)
+    parto.fecha_hora_admision = _admision(20)
+    parto.guardar_cambios()
+
+    assert resumen.actualizar_resumen() == (2, 1)
+    assert resumen.estadisticas_rango(date(2025, 1, 10), date(2025, 1, 10))['total'] == 0
+    assert resumen.estadisticas_rango(date(2025, 1, 20), date(2025, 1, 20))['total'] == 1
+    # El día pendiente se consume: la siguiente actualización no lo repite
+    assert resumen.actualizar_resumen() == (0, 0)
@@ -0,0 +1,26 @@
+import pytest
+
+from gestionApp.models import Secuencia
+from gestionApp.secuencias import generar_numero, reservar_numeros
+
+
+@pytest.mark.django_db
+def test_generar_numero_es_correlativo():
+    assert generar_numero('registro_parto') == 'PARTO-000001'
+    assert generar_numero('registro_parto') == 'PARTO-000002'
+    assert generar_numero('ficha_parto') == 'FP-000001'
+
+
+@pytest.mark.django_db
+def test_reservar_numeros_en_bloque():
+    Secuencia.objects.create(nombre='ficha_obstetrica', ultimo_valor=41)
+
+    numeros = reservar_numeros('ficha_obstetrica', 3)
+
+    assert numeros == ['FO-000042', 'FO-000043', 'FO-000044']
+    assert generar_numero('ficha_obstetrica') == 'FO-000045'
+
+
+def test_secuencia_desconocida():
+    with pytest.raises(KeyError):
+        generar_numero('no_existe')
@@ -0,0 +1,88 @@
+"""
+Guardado de solo los campos modificados
+
+SeguimientoCambiosMixin recuerda los valores con que se cargó una
+instancia desde la base de datos. guardar_cambios() compara contra ellos
+y guarda con save(update_fields=[...]): el UPDATE escribe solo las
+columnas cambiadas (más las auto_now, como fecha_modificacion) y, si no
+cambió nada, no se ejecuta ninguna consulta.
+
+Las señales siguen funcionando: post_save recibe update_fields y los
+contadores (gestionApp.signals) ya ignoran los guardados que no tocan sus
+campos. Los modelos cuyo save() llama a full_clean() pueden usar
+campos_sin_validar() para validar solo los campos que se guardan.
+"""
+
+
+class SeguimientoCambiosMixin:
+    """Mixin para modelos: detecta qué campos cambiaron desde que se cargaron"""
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        instancia._registrar_valores_originales()
+        return instancia
+
+    def _registrar_valores_originales(self):
+        diferidos = self.get_deferred_fields()
+        self._valores_originales = {
+            campo.attname: getattr(self, campo.attname)
+            for campo in self._meta.concrete_fields
+            if campo.attname not in diferidos
+        }
+
+    def campos_modificados(self):
+        """Nombres de los campos cuyo valor cambió (todos si la instancia es nueva)"""
+        originales = getattr(self, '_valores_originales', None)
+        if self._state.adding or originales is None:
+            return [campo.name for campo in self._meta.concrete_fields]
+        return [
+            campo.name
+            for campo in self._meta.concrete_fields
+            if campo.attname in originales
+            and getattr(self, campo.attname) != originales[campo.attname]
+        ]
+
+    def guardar_cambios(self):
+        """
+        Guarda solo los campos modificados (INSERT completo si la instancia
+        es nueva). Retorna la lista de campos guardados.
+        """
+        if self._state.adding or getattr(self, '_valores_originales', None) is None:
+            self.save()
+            return [campo.name for campo in self._meta.concrete_fields]
+
+        campos = self.campos_modificados()
+        if not campos:
+            return []
+        automaticos = [
+            campo.name for campo in self._meta.concrete_fields
+            if getattr(campo, 'auto_now', False)
+        ]
+        self.save(update_fields=[*campos, *automaticos])
+        return campos
+
+    def campos_sin_validar(self, update_fields):
+        """
+        Para full_clean(exclude=...): los campos que no se guardan. None si
+        se guarda la fila completa.
+        """
+        if update_fields is None:
+            return None
+        return [campo.name for campo in self._meta.concrete_fields if campo.name not in set(update_fields)]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._registrar_valores_originales()
+
+
+def guardar_formulario(formulario):
+    """
+    Equivalente a formulario.save() para un ModelForm de edición, pero
+    escribiendo solo los campos que el formulario cambió.
+    Retorna la instancia.
+    """
+    instancia = formulario.save(commit=False)
+    instancia.guardar_cambios()
+    formulario.save_m2m()
+    return instancia
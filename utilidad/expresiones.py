@@ -0,0 +1,22 @@
+"""
+Expresiones SQL para las banderas clínicas de los modelos
+
+Los métodos como Paciente.tiene_condiciones_criticas() se evalúan en
+Python sobre una instancia; los QuerySets de cada modelo exponen la misma
+regla como expresión para filtrar, ordenar y contar en la base de datos.
+Ambos usan la misma lista de campos, definida junto al modelo.
+"""
+from functools import reduce
+from operator import or_
+
+from django.db.models import BooleanField, ExpressionWrapper, Q
+
+
+def alguno_verdadero(campos, prefijo=''):
+    """Q que se cumple si al menos uno de los campos booleanos es verdadero"""
+    return reduce(or_, (Q(**{f'{prefijo}{campo}': True}) for campo in campos))
+
+
+def como_booleano(condicion):
+    """Q como columna booleana, para usar en annotate()"""
+    return ExpressionWrapper(condicion, output_field=BooleanField())
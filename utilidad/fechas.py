@@ -0,0 +1,26 @@
+"""
+Fechas recibidas en parámetros GET y opciones de comandos (AAAA-MM-DD)
+
+parse_date() retorna None para un texto mal formado, pero lanza
+ValueError si el formato es correcto y la fecha no existe (2024-02-30).
+leer_fecha() trata ambos casos igual, como FechaInvalida.
+"""
+from django.utils.dateparse import parse_date
+
+
+class FechaInvalida(ValueError):
+    """El texto no es una fecha AAAA-MM-DD existente"""
+
+
+def leer_fecha(valor):
+    """date del texto, None si está vacío; FechaInvalida si no es una fecha válida"""
+    valor = (valor or '').strip()
+    if not valor:
+        return None
+    try:
+        fecha = parse_date(valor)
+    except ValueError:
+        fecha = None
+    if fecha is None:
+        raise FechaInvalida(f"Fecha inválida: {valor} (use AAAA-MM-DD)")
+    return fecha
@@ -0,0 +1,117 @@
+"""
+Paginación por cursor (keyset) para listados grandes
+
+En vez de OFFSET, cada página continúa desde la última fila de la anterior:
+
+    WHERE (fecha_creacion < x) OR (fecha_creacion = x AND id > y)
+    ORDER BY fecha_creacion DESC, id ASC
+    LIMIT n
+
+El costo de una página no crece con la cantidad de páginas anteriores y
+la consulta usa el índice del primer campo del orden. El cursor es un
+texto opaco (base64 de los valores de la última fila) que el cliente
+devuelve para pedir la página siguiente.
+"""
+import base64
+import json
+from dataclasses import dataclass, field
+
+from django.db.models import Q
+
+
+@dataclass
+class PaginaKeyset:
+    """Una página de resultados y el cursor para pedir la siguiente"""
+    items: list = field(default_factory=list)
+    siguiente_cursor: str = None
+
+    @property
+    def hay_mas(self):
+        return self.siguiente_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def _campos(orden):
+    """[('fecha_creacion', True), ('id', False)] para ['-fecha_creacion', 'id']"""
+    return [(campo.lstrip('-'), campo.startswith('-')) for campo in orden]
+
+
+def _valor(instancia, campo):
+    valor = instancia
+    for parte in campo.split('__'):
+        valor = getattr(valor, parte)
+    return valor
+
+
+def codificar_cursor(instancia, orden):
+    """Cursor con los valores de los campos de orden de la instancia"""
+    valores = [_valor(instancia, campo) for campo, _desc in _campos(orden)]
+    texto = json.dumps(
+        [v.isoformat() if hasattr(v, 'isoformat') else v for v in valores]
+    )
+    return base64.urlsafe_b64encode(texto.encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor, queryset, orden):
+    """
+    Valores del cursor convertidos al tipo de cada campo.
+    Lanza ValueError si el cursor no es válido.
+    """
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Cursor inválido") from e
+
+    campos = _campos(orden)
+    if not isinstance(valores, list) or len(valores) != len(campos):
+        raise ValueError("Cursor inválido")
+
+    convertidos = []
+    for (campo, _desc), valor in zip(campos, valores):
+        modelo_campo = queryset.model._meta.get_field(campo.split('__')[0])
+        try:
+            convertidos.append(modelo_campo.to_python(valor))
+        except Exception as e:
+            raise ValueError("Cursor inválido") from e
+    return convertidos
+
+
+def filtro_despues_de(orden, valores):
+    """
+    Q que selecciona las filas posteriores a `valores` según `orden`:
+    (a > x) OR (a = x AND b > y) OR ... respetando ASC/DESC de cada campo.
+    """
+    campos = _campos(orden)
+    filtro = Q()
+    for i, (campo, desc) in enumerate(campos):
+        iguales = {c: v for (c, _d), v in zip(campos[:i], valores[:i])}
+        operador = 'lt' if desc else 'gt'
+        filtro |= Q(**iguales, **{f'{campo}__{operador}': valores[i]})
+    return filtro
+
+
+def paginar_keyset(queryset, orden, cursor=None, tamano=25):
+    """
+    Retorna la PaginaKeyset que sigue a `cursor` (la primera si es None).
+
+    `orden` debe terminar en un campo único (normalmente 'id' o '-id')
+    para que el cursor identifique una sola fila.
+    """
+    queryset = queryset.order_by(*orden)
+    if cursor:
+        valores = decodificar_cursor(cursor, queryset, orden)
+        queryset = queryset.filter(filtro_despues_de(orden, valores))
+
+    # Se pide una fila extra para saber si hay una página siguiente
+    items = list(queryset[:tamano + 1])
+    siguiente = None
+    if len(items) > tamano:
+        items = items[:tamano]
+        siguiente = codificar_cursor(items[-1], orden)
+    return PaginaKeyset(items=items, siguiente_cursor=siguiente)
@@ -251,11 +251,15 @@ def validar_rut(value: str) -> str:
 # GENERADOR DE RUT ALEATORIO (ÚTIL PARA TESTING)
 # ============================================
 
-def generar_rut_aleatorio() -> str:
+def generar_rut_aleatorio(rng=None) -> str:
     """
     Genera un RUT chileno válido aleatorio.
     Útil para pruebas y testing.
     
+    Args:
+        rng: Generador random.Random para resultados reproducibles
+             (por defecto el módulo random)
+    
     Returns:
         RUT válido formateado
         
@@ -266,8 +270,10 @@ def generar_rut_aleatorio() -> str:
     """
     import random
     
+    rng = rng or random
+    
     # Generar cuerpo aleatorio (entre 1.000.000 y 99.999.999)
-    cuerpo = random.randint(1000000, 99999999)
+    cuerpo = rng.randint(1000000, 99999999)
     dv = RutValidator.calcular_dv(str(cuerpo))
     
     return RutValidator.formatear(f"{cuerpo}{dv}")